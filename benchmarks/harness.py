@@ -0,0 +1,241 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+from inspect_ai.model import ChatMessageUser, Model, ModelOutput, get_model
+from inspect_ai.model._model import active_model_context_var
+from inspect_ai.scorer import Score, Scorer, Target
+from inspect_ai.solver import TaskState
+
+from benchmarks.mock_grader import configure_mock_grader, mock_grader_stats, reset_mock_grader
+
+SCORERS = ("fact_scorer", "fact_comparator_scorer", "prompt_scorer")
+
+MOCK_GRADER = "mockgrader/model"
+
+
+@dataclass
+class BenchmarkResult:
+    """
+    Throughput and latency of one scorer at one concurrency level.
+    """
+    scorer: str
+    """The scorer benchmarked."""
+
+    concurrency: int
+    """Samples scored at once, which is also the grader's connection limit."""
+
+    samples: int
+    """Samples scored."""
+
+    errors: int
+    """Samples whose scorer raised an error."""
+
+    seconds: float
+    """Wall-clock time for all samples."""
+
+    samples_per_second: float
+    """Samples scored per second."""
+
+    p50: float
+    """Median per-sample latency in seconds, over samples scored without error."""
+
+    p95: float
+    """95th percentile per-sample latency in seconds."""
+
+    p99: float
+    """99th percentile per-sample latency in seconds."""
+
+    grader_calls_per_sample: float
+    """Grader calls made per sample, including retries and repairs."""
+
+
+def synthetic_samples(count: int, facts: int = 4, shared: int = 3) -> list[tuple[TaskState, Target]]:
+    """
+    Build samples whose target and answer share a known number of facts.
+
+    Each sample's facts mention the sample number, so no two samples send
+    the grader identical requests.
+
+    Args:
+        count (int): The number of samples.
+        facts (int): Facts in each target, one per sentence.
+        shared (int): How many of the target's facts the answer repeats; the
+            answer also has one fact of its own.
+
+    Returns:
+        list[tuple[TaskState, Target]]: The sample states and targets.
+    """
+    samples = []
+    for i in range(count):
+        target_facts = [f"Item {i} has property {j}." for j in range(facts)]
+        answer_facts = target_facts[:shared] + [f"Item {i} was made in year {2000 + i}."]
+        state = TaskState(
+            model=MOCK_GRADER,
+            sample_id=i,
+            epoch=1,
+            input=f"Describe item {i}.",
+            messages=[ChatMessageUser(content=f"Describe item {i}.")],
+        )
+        state.output = ModelOutput.from_content(model=MOCK_GRADER, content=" ".join(answer_facts))
+        samples.append((state, Target(" ".join(target_facts))))
+    return samples
+
+
+def build_scorer(name: str, concurrency: int, **options: Any) -> Scorer:
+    """
+    Create a scorer graded by the mock grader.
+
+    Args:
+        name (str): One of SCORERS.
+        concurrency (int): The grader's connection limit.
+        **options: Options passed to the scorer.
+
+    Returns:
+        Scorer: The scorer.
+    """
+    configure_mock_grader(max_connections=concurrency)
+    if name == "fact_scorer":
+        from inspect_ai_scorers._fact_scorer import fact_scorer
+        return fact_scorer(get_model(MOCK_GRADER), **options)
+    if name == "prompt_scorer":
+        from inspect_ai_scorers.prompt_evaluator import prompt_scorer
+        return prompt_scorer(get_model(MOCK_GRADER), **options)
+    if name == "fact_comparator_scorer":
+        from inspect_ai_scorers.fact_comparator import fact_comparator_scorer
+        return with_active_model(fact_comparator_scorer(**options), get_model(MOCK_GRADER))
+    raise ValueError(f"Unknown scorer '{name}', expected one of {', '.join(SCORERS)}")
+
+
+def with_active_model(scorer: Scorer, model: Model) -> Scorer:
+    """
+    Make a model the active inspect model while a scorer runs, as it is
+    during an eval.
+
+    The LangChain bridge grades with the active model. Without one,
+    `get_model()` builds a new model from INSPECT_EVAL_MODEL on every call.
+
+    Args:
+        scorer (Scorer): The scorer.
+        model (Model): The model to activate.
+
+    Returns:
+        Scorer: The scorer, run with `model` active.
+    """
+    async def score(state: TaskState, target: Target) -> Score:
+        token = active_model_context_var.set(model)
+        try:
+            return await scorer(state, target)
+        finally:
+            active_model_context_var.reset(token)
+
+    return score
+
+
+async def run_benchmark(name: str, scorer: Scorer, samples: list[tuple[TaskState, Target]], concurrency: int) -> BenchmarkResult:
+    """
+    Score samples with at most `concurrency` in flight and time them.
+
+    Args:
+        name (str): The scorer's name, for the result.
+        scorer (Scorer): The scorer.
+        samples (list[tuple[TaskState, Target]]): The samples.
+        concurrency (int): The number of samples scored at once.
+
+    Returns:
+        BenchmarkResult: Throughput, latency percentiles and grader calls.
+    """
+    slots = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    errors = 0
+
+    async def score(state: TaskState, target: Target) -> None:
+        nonlocal errors
+        async with slots:
+            sample_start = time.perf_counter()
+            try:
+                await scorer(state, target)
+            except Exception:
+                errors += 1
+                return
+            latencies.append(time.perf_counter() - sample_start)
+
+    calls = mock_grader_stats()["calls"]
+    start = time.perf_counter()
+    await asyncio.gather(*(score(state, target) for state, target in samples))
+    seconds = time.perf_counter() - start
+    calls = mock_grader_stats()["calls"] - calls
+
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) if latencies else (float("nan"),) * 3
+    return BenchmarkResult(
+        scorer=name,
+        concurrency=concurrency,
+        samples=len(samples),
+        errors=errors,
+        seconds=seconds,
+        samples_per_second=len(samples) / seconds if seconds > 0 else float("inf"),
+        p50=float(p50),
+        p95=float(p95),
+        p99=float(p99),
+        grader_calls_per_sample=calls / len(samples) if samples else 0.0,
+    )
+
+
+def benchmark_scorers(
+    scorers: tuple[str, ...] = SCORERS,
+    concurrency: tuple[int, ...] = (1, 4, 16),
+    samples: int = 100,
+    scorer_options: dict[str, dict[str, Any]] | None = None,
+    **grader_settings: Any,
+) -> list[BenchmarkResult]:
+    """
+    Benchmark scorers against the mock grader at several concurrency levels.
+
+    The grader is reset and reseeded before each run, so runs with the same
+    settings draw the same latencies and failures.
+
+    Args:
+        scorers (tuple[str, ...]): The scorers to benchmark, from SCORERS.
+        concurrency (tuple[int, ...]): The concurrency levels to run each scorer at.
+        samples (int): Samples per run.
+        scorer_options (dict | None): Options for each scorer by name.
+        **grader_settings: MockGraderSettings for the grader, e.g. latency=0.05
+            or error_rate=0.01.
+
+    Returns:
+        list[BenchmarkResult]: One result per scorer and concurrency level.
+    """
+    async def run_all() -> list[BenchmarkResult]:
+        results = []
+        for name in scorers:
+            for level in concurrency:
+                reset_mock_grader()
+                configure_mock_grader(**grader_settings)
+                scorer = build_scorer(name, level, **(scorer_options or {}).get(name, {}))
+                results.append(await run_benchmark(name, scorer, synthetic_samples(samples), level))
+        return results
+
+    # one event loop for every run, as inspect's connection semaphores outlive a loop
+    return asyncio.run(run_all())
+
+
+def format_results(results: list[BenchmarkResult]) -> str:
+    """
+    Format benchmark results as a table.
+
+    Args:
+        results (list[BenchmarkResult]): The results.
+
+    Returns:
+        str: One row per result, with latencies in milliseconds.
+    """
+    header = f"{'scorer':<24}{'conc':>6}{'samples/s':>12}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'calls/sample':>14}{'errors':>8}"
+    rows = [
+        f"{result.scorer:<24}{result.concurrency:>6}{result.samples_per_second:>12.1f}"
+        f"{result.p50 * 1000:>10.1f}{result.p95 * 1000:>10.1f}{result.p99 * 1000:>10.1f}"
+        f"{result.grader_calls_per_sample:>14.2f}{result.errors:>8}"
+        for result in results
+    ]
+    return "\n".join([header, *rows])
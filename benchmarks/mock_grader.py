@@ -0,0 +1,277 @@
+import asyncio
+import json
+import math
+import random
+import re
+from collections import Counter
+from dataclasses import dataclass, field, fields, replace
+from typing import Any, Literal
+
+from inspect_ai.model import ChatMessage, ChatMessageUser, GenerateConfig, Logprob, Logprobs, ModelAPI, ModelOutput, ModelUsage, TopLogprob, modelapi
+from inspect_ai.tool import ToolChoice, ToolInfo
+
+from inspect_ai_scorers._chunking import count_tokens
+from inspect_ai_scorers._facts import format_facts, parse_facts
+
+_TAG = r"<{tag}>\s*(.*?)\s*</{tag}>"
+_SAMPLE = re.compile(r'<sample id="([^"]+)">(.*?)</sample>', re.DOTALL)
+_FACT_ID = re.compile(r"^\s*([CA]\d+):\s*(.+?)\s*$", re.MULTILINE)
+_SENTENCE = re.compile(r"(?<=[.!?])\s+")
+_VERDICT = re.compile(r"Answer:\s*(.*?)\s*Target:\s*(.*)", re.DOTALL)
+_NORMALIZE = re.compile(r"[^\w\s]+")
+
+
+class MockGraderError(RuntimeError):
+    """An error injected by the mock grader at its configured error rate."""
+
+
+@dataclass
+class MockGraderSettings:
+    """
+    How the mock grader answers and how long it takes.
+    """
+    latency: float = 0.0
+    """Mean seconds per call."""
+
+    latency_distribution: Literal["constant", "uniform", "exponential", "lognormal"] = "constant"
+    """The distribution call latencies are drawn from, with mean `latency`."""
+
+    latency_spread: float = 0.5
+    """Half-width of the uniform distribution as a fraction of the mean, or sigma of the lognormal."""
+
+    error_rate: float = 0.0
+    """Fraction of calls that raise MockGraderError."""
+
+    malformed_rate: float = 0.0
+    """Fraction of compare calls answered with truncated JSON, to exercise the repair turn."""
+
+    max_connections: int = 10
+    """Concurrent calls allowed by inspect's connection limit."""
+
+    seed: int | None = 0
+    """Seed for latencies and injected failures, or None for a fresh one."""
+
+    responses: dict[str, str] = field(default_factory=dict)
+    """Canned completions by a substring of the prompt, checked before the templated answers."""
+
+    verdict_confidence: float = 0.9
+    """Probability given to the chosen verdict's first token when logprobs are requested."""
+
+
+_settings = MockGraderSettings()
+_rng = random.Random(_settings.seed)
+_stats: Counter = Counter()
+
+
+def configure_mock_grader(**settings: Any) -> MockGraderSettings:
+    """
+    Set the mock grader's default settings and reseed it.
+
+    Models created with `get_model("mockgrader/...")` start from these
+    defaults and can override them with model args. Scorers that resolve the
+    grader from INSPECT_EVAL_MODEL can't pass model args, so this is how they
+    are configured.
+
+    Args:
+        **settings: MockGraderSettings fields to change.
+
+    Returns:
+        MockGraderSettings: The new defaults.
+    """
+    global _settings, _rng
+    _settings = replace(_settings, **settings)
+    _rng = random.Random(_settings.seed)
+    return _settings
+
+
+def reset_mock_grader() -> None:
+    """
+    Restore the default settings and clear the call counters.
+    """
+    global _settings, _rng
+    _settings = MockGraderSettings()
+    _rng = random.Random(_settings.seed)
+    _stats.clear()
+
+
+def mock_grader_stats() -> dict[str, int]:
+    """
+    Read the mock grader's call counters.
+
+    Returns:
+        dict: Total calls, injected errors and malformed responses, and calls
+            by kind ("facts", "compare", "match", "batch", "verdict", "explain",
+            "other").
+    """
+    return {"calls": 0, "errors": 0, "malformed": 0, **_stats}
+
+
+def _normalize(text: str) -> str:
+    return " ".join(_NORMALIZE.sub(" ", text.lower()).split())
+
+
+def _between(tag: str, text: str) -> str:
+    match = re.search(_TAG.format(tag=tag), text, re.DOTALL)
+    return match.group(1) if match else ""
+
+
+def _extract_facts(prompt: str) -> str:
+    # each sentence of the text is one fact
+    text = _between("text", prompt)
+    return format_facts([sentence for sentence in _SENTENCE.split(text) if sentence.strip()])
+
+
+def _compare(prompt: str) -> str:
+    context = parse_facts(_between("context", prompt))
+    answer = parse_facts(_between("answer", prompt))
+    context_keys = {_normalize(fact) for fact in context}
+    answer_keys = {_normalize(fact) for fact in answer}
+    return json.dumps({
+        "facts_in_both": [fact for fact in answer if _normalize(fact) in context_keys],
+        "facts_only_in_answer": [fact for fact in answer if _normalize(fact) not in context_keys],
+        "facts_only_in_context": [fact for fact in context if _normalize(fact) not in answer_keys],
+    })
+
+
+def _match_ids(text: str) -> list[list[str]]:
+    context = {_normalize(fact): fact_id for fact_id, fact in _FACT_ID.findall(_between("context", text))}
+    return [
+        [context[_normalize(fact)], fact_id]
+        for fact_id, fact in _FACT_ID.findall(_between("answer", text))
+        if _normalize(fact) in context
+    ]
+
+
+def _verdict(prompt: str) -> str:
+    # PASS when every word of the answer appears in the target
+    match = _VERDICT.search(prompt)
+    if match is None:
+        return "FAIL"
+    answer, target = (set(_normalize(part).split()) for part in match.groups())
+    return "PASS" if answer and answer <= target else "FAIL"
+
+
+def _explain(prompt: str) -> str:
+    # name the answer's words that the target doesn't have
+    match = _VERDICT.search(prompt)
+    if match is None:
+        return "The answer doesn't address the target."
+    answer, target = (_normalize(part).split() for part in match.groups())
+    missing = [word for word in answer if word not in set(target)]
+    return f"The answer has words the target doesn't: {', '.join(missing)}." if missing else "The answer is empty."
+
+
+def _verdict_logprobs(completion: str, confidence: float) -> Logprobs:
+    # the first token's distribution over the two verdicts
+    chosen, other = ("PASS", "FAIL") if completion.startswith("PASS") else ("FAIL", "PASS")
+    top = [
+        TopLogprob(token=chosen, logprob=math.log(confidence)),
+        TopLogprob(token=other, logprob=math.log(max(1.0 - confidence, 1e-9))),
+    ]
+    return Logprobs(content=[Logprob(token=chosen, logprob=top[0].logprob, top_logprobs=top)])
+
+
+def _respond(prompt: str) -> tuple[str, str]:
+    if "<sample id=" in prompt:
+        return "batch", json.dumps({sample_id: _match_ids(body) for sample_id, body in _SAMPLE.findall(prompt)})
+    if "<text>" in prompt:
+        return "facts", _extract_facts(prompt)
+    if '"matches"' in prompt:
+        return "match", json.dumps({"matches": _match_ids(prompt)})
+    if "facts_in_both" in prompt:
+        return "compare", _compare(prompt)
+    if prompt.lstrip().startswith("Explain"):
+        return "explain", _explain(prompt)
+    if "PASS" in prompt and "FAIL" in prompt:
+        return "verdict", _verdict(prompt)
+    return "other", ""
+
+
+class MockGrader(ModelAPI):
+    """
+    A local stand-in for a grader model, for benchmarks and tests.
+
+    Fact extraction prompts are answered with one fact per sentence of the
+    text, compare prompts (text, ID and batched) by matching facts that are
+    equal ignoring case and punctuation, and PASS/FAIL prompts with PASS when
+    every word of the answer appears in the target, with first-token logprobs
+    when they are requested. Calls sleep for a latency
+    drawn from the configured distribution and fail at the configured rate.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        base_url: str | None = None,
+        api_key: str | None = None,
+        config: GenerateConfig = GenerateConfig(),
+        **model_args: Any,
+    ) -> None:
+        super().__init__(model_name, base_url, api_key, [], config)
+        names = {setting.name for setting in fields(MockGraderSettings)}
+        self.settings = replace(_settings, **{key: value for key, value in model_args.items() if key in names})
+
+    def max_connections(self) -> int:
+        return self.settings.max_connections
+
+    def connection_key(self) -> str:
+        # inspect keeps one semaphore per key for the life of the process, so
+        # each limit needs its own, as does each event loop it's used from
+        return f"mockgrader-{self.settings.max_connections}-{id(asyncio.get_running_loop())}"
+
+    async def generate(
+        self,
+        input: list[ChatMessage],
+        tools: list[ToolInfo],
+        tool_choice: ToolChoice,
+        config: GenerateConfig,
+    ) -> ModelOutput:
+        settings = self.settings
+        _stats["calls"] += 1
+        await asyncio.sleep(self._latency())
+
+        if settings.error_rate and _rng.random() < settings.error_rate:
+            _stats["errors"] += 1
+            raise MockGraderError("Injected mock grader error")
+
+        # repair turns are answered from the original prompt
+        prompts = [message.text for message in input if isinstance(message, ChatMessageUser)]
+        prompt = prompts[0] if prompts else ""
+        kind, completion = _respond(prompt)
+        for substring, response in settings.responses.items():
+            if substring in prompt:
+                completion = response
+                break
+        _stats[kind] += 1
+
+        if kind in ("compare", "match", "batch") and len(prompts) == 1 and settings.malformed_rate and _rng.random() < settings.malformed_rate:
+            _stats["malformed"] += 1
+            completion = completion[: len(completion) // 2]
+
+        output = ModelOutput.from_content(model=self.model_name, content=completion)
+        if kind == "verdict" and config.logprobs:
+            output.choices[0].logprobs = _verdict_logprobs(completion, settings.verdict_confidence)
+        input_tokens = sum(count_tokens(message.text) for message in input)
+        output_tokens = count_tokens(completion)
+        output.usage = ModelUsage(input_tokens=input_tokens, output_tokens=output_tokens, total_tokens=input_tokens + output_tokens)
+        return output
+
+    def _latency(self) -> float:
+        settings = self.settings
+        mean = settings.latency
+        if mean <= 0 or settings.latency_distribution == "constant":
+            return max(0.0, mean)
+        if settings.latency_distribution == "uniform":
+            spread = mean * settings.latency_spread
+            return _rng.uniform(mean - spread, mean + spread)
+        if settings.latency_distribution == "exponential":
+            return _rng.expovariate(1.0 / mean)
+        if settings.latency_distribution == "lognormal":
+            sigma = settings.latency_spread
+            return _rng.lognormvariate(math.log(mean) - sigma * sigma / 2, sigma)
+        raise ValueError(f"Unknown latency_distribution '{settings.latency_distribution}'")
+
+
+@modelapi(name="mockgrader")
+def mockgrader() -> type[ModelAPI]:
+    return MockGrader
@@ -0,0 +1,42 @@
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.harness import SCORERS, benchmark_scorers, format_results
+
+# Set up argument parsing
+parser = argparse.ArgumentParser(description="Benchmark scorer throughput against a local mock grader.")
+parser.add_argument('--scorers', type=str, nargs='+', default=list(SCORERS), choices=SCORERS, help='The scorers to benchmark.')
+parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16], help='The concurrency levels to run each scorer at.')
+parser.add_argument('--samples', type=int, default=100, help='Samples scored per run.')
+parser.add_argument('--latency', type=float, default=0.05, help='Mean grader latency in seconds.')
+parser.add_argument('--latency_distribution', type=str, default='lognormal', choices=['constant', 'uniform', 'exponential', 'lognormal'], help='The distribution grader latencies are drawn from.')
+parser.add_argument('--latency_spread', type=float, default=0.5, help='Uniform half-width as a fraction of the mean, or lognormal sigma.')
+parser.add_argument('--error_rate', type=float, default=0.0, help='Fraction of grader calls that fail.')
+parser.add_argument('--malformed_rate', type=float, default=0.0, help='Fraction of compare responses that are truncated JSON.')
+parser.add_argument('--compare_mode', type=str, default='text', choices=['text', 'ids'], help='The compare mode for fact_scorer and fact_comparator_scorer.')
+parser.add_argument('--seed', type=int, default=0, help='Seed for grader latencies and failures.')
+args = parser.parse_args()
+
+
+def main():
+    fact_options = {"compare_mode": args.compare_mode}
+    results = benchmark_scorers(
+        scorers=tuple(args.scorers),
+        concurrency=tuple(args.concurrency),
+        samples=args.samples,
+        scorer_options={"fact_scorer": fact_options, "fact_comparator_scorer": fact_options},
+        latency=args.latency,
+        latency_distribution=args.latency_distribution,
+        latency_spread=args.latency_spread,
+        error_rate=args.error_rate,
+        malformed_rate=args.malformed_rate,
+        seed=args.seed,
+    )
+    print(format_results(results))
+
+
+if __name__ == "__main__":
+    main()
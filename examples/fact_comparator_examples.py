@@ -7,10 +7,12 @@ from datetime import datetime
 # Set up argument parsing
 parser = argparse.ArgumentParser(description="Run FactComparator examples.")
 parser.add_argument('--model', type=str, default='openai/gpt-4', help='The model name to use for evaluation.')
+parser.add_argument('--cassette', type=str, default=None, help='A file to record model calls to and replay them from.')
+parser.add_argument('--cassette_mode', type=str, default='lenient', choices=['record', 'replay', 'lenient'], help='"replay" fails on calls that were not recorded, "lenient" makes and records them.')
 args = parser.parse_args()
 
-# Set environment variable for model name
-os.environ['INSPECT_MODEL_NAME'] = args.model
+# Set environment variable for model name (InspectChatModel reads it)
+os.environ['INSPECT_EVAL_MODEL'] = args.model
 
 # Create logs directory if it doesn't exist
 if not os.path.exists('logs'):
@@ -20,9 +22,12 @@ if not os.path.exists('logs'):
 log_filename = f"logs/fact_comparator_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
 logging.basicConfig(filename=log_filename, level=logging.INFO, format='%(message)s')
 
+from inspect_ai_scorers._cassette import Cassette
 from inspect_ai_scorers.code_from_inspect_ai import InspectChatModel
 from inspect_ai_scorers.fact_comparator import FactComparator
 
+cassette = Cassette(args.cassette, args.cassette_mode) if args.cassette else None
+
 cases = {
     'case1': {
         'input': 'The Sun is a medium-sized star. It\'s about 4.6 billion years old.',
@@ -109,7 +114,7 @@ async def evaluate_case(case):
     answer_text = case['input']
     true_metrics = case['true_metrics']
 
-    model_comparator = FactComparator(InspectChatModel())
+    model_comparator = FactComparator(InspectChatModel(), cassette=cassette)
     
     try:
         result = await model_comparator(context_text, answer_text)
@@ -183,5 +188,9 @@ def main():
     print(summary_report)
     logging.info(summary_report)
 
+    if cassette is not None:
+        cassette.close()
+        print(f"Cassette: {cassette.stats()}")
+
 if __name__ == "__main__":
     main()
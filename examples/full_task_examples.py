@@ -6,7 +6,7 @@ from inspect_ai_scorers.prompt_evaluator import prompt_scorer
 
 
 @task
-def prompt_evaluator_eval():
+def prompt_evaluator_eval(grader: str = "openai/gpt-4", cascade_model: str | None = None):
     samples = [
         Sample(
             input="Teleport with the Cacodemon, then teleport with the Bunny. Return with the Cacodemon, teleport with the Scientist, and finally teleport with the Cacodemon.",
@@ -21,11 +21,11 @@ def prompt_evaluator_eval():
             system_message(SYSTEM_MESSAGE),
             generate(),
         ],
-        scorer=prompt_scorer("openai/gpt-4")
+        scorer=prompt_scorer(grader, cascade_model=cascade_model)
     )
 
 @task
-def fact_comparator_eval():
+def fact_comparator_eval(grader: str = "openai/gpt-4", cascade_model: str | None = None):
     samples = [
         Sample(
             input="How old is the sun?",
@@ -44,5 +44,5 @@ def fact_comparator_eval():
             system_message(SYSTEM_MESSAGE),
             generate(),
         ],
-        scorer=fact_scorer("openai/gpt-4"),
+        scorer=fact_scorer(grader, cascade_model=cascade_model),
     )
\ No newline at end of file
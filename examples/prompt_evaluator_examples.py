@@ -4,18 +4,23 @@ import os
 import logging
 from datetime import datetime
 
-from inspect_ai_scorers.prompt_evaluator import PromptEvaluator
-from inspect_ai_scorers.code_from_inspect_ai import InspectChatModel
+from inspect_ai.model import ChatMessageUser, ModelOutput
+from inspect_ai.scorer import Target
+from inspect_ai.solver import TaskState
+
+from inspect_ai_scorers._cascade import cascade_summary
+from inspect_ai_scorers._cassette import Cassette
+from inspect_ai_scorers.prompt_evaluator import prompt_scorer
 
 
 # Set up argument parsing
 parser = argparse.ArgumentParser(description="Run Prompt Evaluator examples.")
 parser.add_argument('--model', type=str, default='openai/gpt-4', help='The model name to use for evaluation.')
+parser.add_argument('--cassette', type=str, default=None, help='A file to record grader calls to and replay them from.')
+parser.add_argument('--cassette_mode', type=str, default='lenient', choices=['record', 'replay', 'lenient'], help='"replay" fails on calls that were not recorded, "lenient" makes and records them.')
+parser.add_argument('--cascade_model', type=str, default=None, help='A cheaper grader to try first, escalating to --model when it is unsure.')
 args = parser.parse_args()
 
-# Set environment variable for model name
-os.environ['INSPECT_MODEL_NAME'] = args.model
-
 # Logging configuration
 if not os.path.exists('logs'):
     os.makedirs('logs')
@@ -23,8 +28,9 @@ if not os.path.exists('logs'):
 log_filename = f"logs/prompt_evaluator_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
 logging.basicConfig(filename=log_filename, level=logging.INFO, format='%(message)s')
 
-model = InspectChatModel()
-evaluator = PromptEvaluator(model)
+cassette = Cassette(args.cassette, args.cassette_mode) if args.cassette else None
+evaluator = prompt_scorer(args.model, cassette=cassette, cascade_model=args.cascade_model)
+scores = []
 
 test_cases = [
     {
@@ -89,13 +95,26 @@ test_cases = [
     }
 ]
 
+def task_state(input_text):
+    state = TaskState(
+        model=args.model,
+        sample_id=0,
+        epoch=1,
+        input="",
+        messages=[ChatMessageUser(content="")],
+    )
+    state.output = ModelOutput.from_content(model=args.model, content=input_text)
+    return state
+
 async def evaluate_example(example):
     input_text = example['input_text']
     target_text = example['target_text']
     expected_score = example['expected_score']
 
     try:
-        actual_score = await evaluator(input_text, target_text)
+        score = await evaluator(task_state(input_text), Target(target_text))
+        scores.append(score)
+        actual_score = 1 if score.value == "C" else 0
         model_result = "PASS" if actual_score == 1 else "FAIL"
         test_passed = actual_score == expected_score
         return test_passed, model_result, expected_score
@@ -113,7 +132,7 @@ def main():
     summary = {"pass": 0, "fail": 0}
 
     print("\nPerformance Report:")
-    logging.info(f"Detailed Performance Report for PromptEvaluator:")
+    logging.info(f"Detailed Performance Report for prompt_scorer:")
     for i, (example, (test_passed, model_result, expected)) in enumerate(zip(test_cases, results), 1):
         test_result = 'PASS' if test_passed else 'FAIL'
         summary[test_result.lower()] += 1
@@ -140,5 +159,19 @@ def main():
     print(summary_report)
     logging.info(summary_report)
 
+    if args.cascade_model is not None:
+        cascade = cascade_summary(scores)
+        cascade_report = (
+            "\nCascade:\n"
+            f"  Escalation Rate: {cascade['escalation_rate']:.0%} {cascade['reasons']}\n"
+            f"  Cost: ${cascade['cost']:.4f} (${cascade['baseline_cost']:.4f} without the cascade, {cascade['cost_savings']:.0%} saved)\n"
+        )
+        print(cascade_report)
+        logging.info(cascade_report)
+
+    if cassette is not None:
+        cassette.close()
+        print(f"Cassette: {cassette.stats()}")
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,36 @@
+import importlib
+
+# Exports are resolved on first access, so importing one scorer doesn't load
+# the others' dependencies (the fact comparator's LangChain bridge is slow to
+# import and an optional extra).
+_EXPORTS = {
+    "fact_scorer": "inspect_ai_scorers._fact_scorer",
+    "prompt_scorer": "inspect_ai_scorers.prompt_evaluator",
+    "fact_comparator_scorer": "inspect_ai_scorers.fact_comparator",
+    "FactComparator": "inspect_ai_scorers.fact_comparator",
+    "build_fact_index": "inspect_ai_scorers._fact_index",
+    "build_fact_index_async": "inspect_ai_scorers._fact_index",
+    "FactCache": "inspect_ai_scorers._cache",
+    "Cassette": "inspect_ai_scorers._cassette",
+    "ScoreCheckpoint": "inspect_ai_scorers._checkpoint",
+    "cascade_summary": "inspect_ai_scorers._cascade",
+    "ScoreTracer": "inspect_ai_scorers._tracing",
+    "score_stage_summary": "inspect_ai_scorers._tracing",
+    "start_metrics_server": "inspect_ai_scorers._metrics",
+    "rescore_log": "inspect_ai_scorers._rescore",
+    "rescore_logs": "inspect_ai_scorers._rescore",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,259 @@
+import math
+from typing import Any
+
+import numpy as np
+from inspect_ai.scorer import Score, metric
+
+SCORE_KEYS = ("groundedness", "thoroughness")
+FACT_COUNT_KEYS = ("in_both", "only_in_answer", "only_in_context")
+
+
+def fact_counts(comparison_result: dict) -> dict[str, int]:
+    """
+    Count the facts in a comparison result, for score metadata.
+
+    Args:
+        comparison_result (dict): The comparison with the three fact lists.
+
+    Returns:
+        dict[str, int]: The number of facts in both, only in the answer and only in the context.
+    """
+    return {
+        "in_both": len(comparison_result["facts_in_both"]),
+        "only_in_answer": len(comparison_result["facts_only_in_answer"]),
+        "only_in_context": len(comparison_result["facts_only_in_context"]),
+    }
+
+
+def _score_value(score: Score, key: str | None) -> float | None:
+    # metrics registered per key receive the key's value directly
+    if isinstance(score.value, dict):
+        value = score.value.get(key)
+    else:
+        value = score.value
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return float(value)
+
+
+def _score_fact_counts(score: Score) -> tuple[int, int, int] | None:
+    counts = (score.metadata or {}).get("fact_counts")
+    if not isinstance(counts, dict):
+        return None
+    return tuple(int(counts.get(key, 0)) for key in FACT_COUNT_KEYS)
+
+
+def score_values(scores: list[Score], key: str | None) -> np.ndarray:
+    """
+    Collect one score key's numeric values, skipping scores that don't have one.
+
+    Args:
+        scores (list[Score]): The scores.
+        key (str | None): The score key, e.g. "groundedness", or None for scalar scores.
+
+    Returns:
+        np.ndarray: The values.
+    """
+    values = [_score_value(score, key) for score in scores]
+    return np.fromiter((value for value in values if value is not None), dtype=float)
+
+
+def micro_average(totals: np.ndarray | tuple, key: str) -> float:
+    """
+    Compute a metric from fact counts pooled across samples.
+
+    Args:
+        totals: Pooled (in_both, only_in_answer, only_in_context) fact counts.
+        key (str): "groundedness" or "thoroughness".
+
+    Returns:
+        float: The micro-averaged percentage, or 0 if there are no facts.
+    """
+    in_both, only_in_answer, only_in_context = (float(total) for total in totals)
+    denominator = in_both + (only_in_answer if key == "groundedness" else only_in_context)
+    return (in_both / denominator) * 100 if denominator > 0 else 0.0
+
+
+def pooled_fact_counts(scores: list[Score]) -> np.ndarray:
+    """
+    Sum the fact counts recorded in score metadata.
+
+    Args:
+        scores (list[Score]): The scores.
+
+    Returns:
+        np.ndarray: The (in_both, only_in_answer, only_in_context) totals.
+    """
+    counts = [count for count in map(_score_fact_counts, scores) if count is not None]
+    if not counts:
+        return np.zeros(len(FACT_COUNT_KEYS), dtype=np.int64)
+    return np.asarray(counts, dtype=np.int64).sum(axis=0)
+
+
+class RunningStat:
+    """
+    Welford's online mean and variance for one series of values.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, value: float) -> None:
+        """
+        Add a value.
+
+        Args:
+            value (float): The value.
+        """
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    def merge(self, other: "RunningStat") -> None:
+        """
+        Fold in another series, e.g. one aggregated by a different worker.
+
+        Args:
+            other (RunningStat): The series to merge.
+        """
+        if other.count == 0:
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self._m2 += other._m2 + delta * delta * self.count * other.count / count
+        self.count = count
+
+    @property
+    def variance(self) -> float:
+        """The sample variance, or 0 with fewer than two values."""
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stderr(self) -> float:
+        """The standard error of the mean."""
+        return math.sqrt(self.variance / self.count) if self.count > 1 else 0.0
+
+    def summary(self) -> dict[str, float]:
+        """The count, mean, variance and standard error as a dict."""
+        return {"count": self.count, "mean": self.mean, "variance": self.variance, "stderr": self.stderr}
+
+
+class ScoreAggregator:
+    """
+    Aggregate groundedness and thoroughness incrementally as scores complete.
+
+    Scores can be added one at a time and the aggregate read with
+    `snapshot()` at any point, without keeping the scores. Per-sample means
+    (macro averages) use Welford's algorithm; micro averages pool the fact
+    counts recorded in score metadata, so samples with more facts weigh more.
+    Scores without a value for a key are left out of that key's mean rather
+    than counted as zero.
+    """
+
+    def __init__(self, keys: tuple[str, ...] = SCORE_KEYS):
+        """
+        Initialize the aggregator.
+
+        Args:
+            keys (tuple[str, ...]): The score keys to aggregate.
+        """
+        self.keys = keys
+        self.stats = {key: RunningStat() for key in keys}
+        self.fact_totals = np.zeros(len(FACT_COUNT_KEYS), dtype=np.int64)
+        self.samples = 0
+
+    def add(self, score: Score) -> None:
+        """
+        Add a completed score.
+
+        Args:
+            score (Score): The score.
+        """
+        self.samples += 1
+        for key in self.keys:
+            value = _score_value(score, key)
+            if value is not None:
+                self.stats[key].add(value)
+        counts = _score_fact_counts(score)
+        if counts is not None:
+            self.fact_totals += counts
+
+    def merge(self, other: "ScoreAggregator") -> None:
+        """
+        Fold in another aggregator's scores.
+
+        Args:
+            other (ScoreAggregator): The aggregator to merge.
+        """
+        self.samples += other.samples
+        for key in self.keys:
+            self.stats[key].merge(other.stats[key])
+        self.fact_totals += other.fact_totals
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        Read the aggregate so far.
+
+        Returns:
+            dict: The number of samples, each key's count, mean, variance and
+                standard error, and the micro-averaged value of each key.
+        """
+        snapshot: dict[str, Any] = {"samples": self.samples}
+        for key in self.keys:
+            snapshot[key] = self.stats[key].summary()
+            snapshot[f"micro_{key}"] = micro_average(self.fact_totals, key)
+        return snapshot
+
+    @classmethod
+    def from_scores(cls, scores: list[Score], keys: tuple[str, ...] = SCORE_KEYS) -> "ScoreAggregator":
+        """
+        Aggregate a complete list of scores at once, vectorized with NumPy.
+
+        Args:
+            scores (list[Score]): The scores.
+            keys (tuple[str, ...]): The score keys to aggregate.
+
+        Returns:
+            ScoreAggregator: An aggregator that further scores can be added to.
+        """
+        aggregator = cls(keys)
+        aggregator.samples = len(scores)
+        for key in keys:
+            values = score_values(scores, key)
+            stat = aggregator.stats[key]
+            stat.count = int(values.size)
+            if values.size:
+                stat.mean = float(values.mean())
+                stat._m2 = float(np.square(values - stat.mean).sum())
+        aggregator.fact_totals = pooled_fact_counts(scores)
+        return aggregator
+
+
+@metric
+def micro_thoroughness():
+    """
+    Metric function to calculate thoroughness from the fact counts pooled across samples.
+
+    Returns:
+        function: The metric function.
+    """
+    def metric(scores: list[Score]) -> float:
+        return micro_average(pooled_fact_counts(scores), "thoroughness")
+    return metric
+
+
+@metric
+def micro_groundedness():
+    """
+    Metric function to calculate groundedness from the fact counts pooled across samples.
+
+    Returns:
+        function: The metric function.
+    """
+    def metric(scores: list[Score]) -> float:
+        return micro_average(pooled_fact_counts(scores), "groundedness")
+    return metric
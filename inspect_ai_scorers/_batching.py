@@ -0,0 +1,144 @@
+import asyncio
+from typing import Any, Awaitable, Callable
+
+
+class AdaptiveBatcher:
+    """
+    Collect concurrent requests from separate samples into batched calls.
+
+    Callers `submit()` one item each. Items are flushed as one batch once
+    `batch_size` of them are waiting, or after `flush_timeout` seconds so
+    stragglers don't stall. `run_batch` returns one result per item, or None
+    for items it could not resolve; those (and every item of a batch that
+    raises) are retried one at a time with `run_one`.
+
+    The batch size adapts: it grows by one after each fully resolved batch and
+    halves after a batch that needed any fallback. Once it has shrunk to one,
+    every `regrow_after` successful single calls probe a batch of two again,
+    so a burst of errors doesn't disable batching for the rest of the run.
+    """
+
+    def __init__(
+        self,
+        run_batch: Callable[[list[Any]], Awaitable[list[Any | None]]],
+        run_one: Callable[[Any], Awaitable[Any]],
+        max_batch_size: int = 8,
+        flush_timeout: float = 0.5,
+        regrow_after: int = 8,
+    ):
+        """
+        Initialize the batcher.
+
+        Args:
+            run_batch (Callable): Async callable resolving a list of items in one call.
+            run_one (Callable): Async callable resolving a single item.
+            max_batch_size (int): The largest batch to send.
+            flush_timeout (float): Seconds to wait for a batch to fill before sending it anyway.
+            regrow_after (int): Successful single calls after which a batch size of one grows to two.
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        if regrow_after < 1:
+            raise ValueError("regrow_after must be at least 1")
+
+        self.run_batch = run_batch
+        self.run_one = run_one
+        self.max_batch_size = max_batch_size
+        self.flush_timeout = flush_timeout
+        self.regrow_after = regrow_after
+        self.batch_size = max_batch_size
+
+        # counters for monitoring
+        self.batches = 0
+        self.fallbacks = 0
+
+        self._pending: list[tuple[Any, asyncio.Future]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+        self._singles = 0
+
+    async def submit(self, item: Any) -> Any:
+        """
+        Submit an item and wait for its result.
+
+        Args:
+            item: The item to resolve.
+
+        Returns:
+            The item's result.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+
+        if len(self._pending) >= self.batch_size:
+            self._flush(partial=False)
+        elif self._timer is None:
+            self._timer = loop.call_later(self.flush_timeout, self._flush, True)
+
+        return await future
+
+    def _flush(self, partial: bool) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        while len(self._pending) >= self.batch_size or (partial and self._pending):
+            batch = self._pending[:self.batch_size]
+            del self._pending[:self.batch_size]
+            task = asyncio.ensure_future(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+        # whatever is left waits for more items or the timeout
+        if self._pending:
+            self._timer = asyncio.get_running_loop().call_later(self.flush_timeout, self._flush, True)
+
+    async def _run(self, batch: list[tuple[Any, asyncio.Future]]) -> None:
+        items = [item for item, _ in batch]
+
+        results: list[Any | None]
+        if len(items) == 1:
+            results = [None]
+        else:
+            self.batches += 1
+            try:
+                results = list(await self.run_batch(items))
+                if len(results) != len(items):
+                    results = [None] * len(items)
+            except Exception:
+                results = [None] * len(items)
+
+            if any(result is None for result in results):
+                self.batch_size = max(1, self.batch_size // 2)
+                self._singles = 0
+            else:
+                self.batch_size = min(self.max_batch_size, self.batch_size + 1)
+
+        async def resolve(item: Any, future: asyncio.Future, result: Any | None) -> None:
+            if future.done():
+                return
+            if result is None:
+                if len(items) > 1:
+                    self.fallbacks += 1
+                try:
+                    result = await self.run_one(item)
+                except Exception as ex:
+                    if not future.done():
+                        future.set_exception(ex)
+                    return
+                if len(items) == 1:
+                    self._regrow()
+            if not future.done():
+                future.set_result(result)
+
+        await asyncio.gather(*(resolve(item, future, result) for (item, future), result in zip(batch, results)))
+
+    def _regrow(self) -> None:
+        # single calls only count once batching has backed off to them
+        if self.batch_size > 1 or self.max_batch_size == 1:
+            return
+        self._singles += 1
+        if self._singles >= self.regrow_after:
+            self._singles = 0
+            self.batch_size = 2
@@ -0,0 +1,333 @@
+from dataclasses import dataclass
+from statistics import NormalDist
+from typing import Literal
+
+import numpy as np
+from inspect_ai.log import EvalLog, read_eval_log
+from inspect_ai.scorer import Metric, Score, metric
+
+from inspect_ai_scorers._aggregate import score_values
+
+# upper bound on the number of multinomial counts or resampled indices held
+# in memory at once
+_CHUNK_DRAWS = 1 << 23
+
+# a multinomial count costs about as much as this many resampled indices, so
+# counting over the distinct values only pays when there are few of them
+_COUNT_COST = 16
+
+_NORMAL = NormalDist()
+
+
+def bootstrap_means(values: np.ndarray, resamples: int = 10000, seed: int | None = 0) -> np.ndarray:
+    """
+    Draw bootstrap resamples of the mean of `values`.
+
+    A resample of n values only matters through how often it picks each
+    distinct value. When there are few distinct values, as for percentages
+    of small fact counts, each resample is drawn as a multinomial count
+    vector over them, so 100k samples resample as quickly as 100. Otherwise,
+    e.g. for continuous values, resamples are drawn as n indices at a time in
+    chunks, so the cost never exceeds n x resamples draws.
+
+    Args:
+        values (np.ndarray): The sample values.
+        resamples (int): The number of bootstrap resamples.
+        seed (int | None): The random seed, or None for a fresh one.
+
+    Returns:
+        np.ndarray: The mean of each resample.
+    """
+    values = np.asarray(values, dtype=float)
+    rng = np.random.default_rng(seed)
+    distinct, counts = np.unique(values, return_counts=True)
+    probabilities = counts / values.size
+
+    means = np.empty(resamples)
+    if distinct.size * _COUNT_COST <= values.size:
+        chunk = max(1, _CHUNK_DRAWS // distinct.size)
+        for start in range(0, resamples, chunk):
+            stop = min(resamples, start + chunk)
+            draws = rng.multinomial(values.size, probabilities, size=stop - start)
+            means[start:stop] = draws @ distinct / values.size
+        return means
+
+    chunk = max(1, _CHUNK_DRAWS // values.size)
+    for start in range(0, resamples, chunk):
+        stop = min(resamples, start + chunk)
+        indices = rng.integers(0, values.size, size=(stop - start, values.size))
+        means[start:stop] = np.take(values, indices).mean(axis=1)
+    return means
+
+
+def _jackknife_acceleration(values: np.ndarray) -> float:
+    # leaving out any copy of a distinct value gives the same mean, so the
+    # jackknife only needs one estimate per distinct value, weighted by count
+    distinct, counts = np.unique(values, return_counts=True)
+    n = values.size
+    if n < 2:
+        return 0.0
+    leave_one_out = (values.sum() - distinct) / (n - 1)
+    deviation = np.average(leave_one_out, weights=counts) - leave_one_out
+    denominator = 6.0 * np.sum(counts * deviation ** 2) ** 1.5
+    return float(np.sum(counts * deviation ** 3) / denominator) if denominator > 0 else 0.0
+
+
+def bootstrap_ci(
+    values: np.ndarray,
+    confidence: float = 0.95,
+    resamples: int = 10000,
+    method: Literal["percentile", "bca"] = "bca",
+    seed: int | None = 0,
+) -> tuple[float, float]:
+    """
+    Compute a bootstrap confidence interval for the mean.
+
+    Args:
+        values (np.ndarray): The sample values.
+        confidence (float): The confidence level.
+        resamples (int): The number of bootstrap resamples.
+        method (str): "percentile", or "bca" to correct the percentiles for
+            bias and skew, which matters for percentages bunched near 0 or 100.
+        seed (int | None): The random seed, or None for a fresh one.
+
+    Returns:
+        tuple[float, float]: The lower and upper bounds, or NaN for no values.
+    """
+    if method not in ("percentile", "bca"):
+        raise ValueError(f"Unknown method '{method}', expected 'percentile' or 'bca'")
+
+    values = np.asarray(values, dtype=float)
+    if values.size == 0:
+        return float("nan"), float("nan")
+    if np.all(values == values[0]):
+        return float(values[0]), float(values[0])
+
+    return _interval(values, bootstrap_means(values, resamples, seed), confidence, method)
+
+
+def _interval(values: np.ndarray, means: np.ndarray, confidence: float, method: str) -> tuple[float, float]:
+    resamples = means.size
+    alpha = (1.0 - confidence) / 2.0
+    quantiles = np.array([alpha, 1.0 - alpha])
+
+    if method == "bca":
+        below = (np.count_nonzero(means < values.mean()) + 0.5 * np.count_nonzero(means == values.mean())) / resamples
+        # with every resample on one side the bias correction is infinite
+        if 0.0 < below < 1.0:
+            bias = _NORMAL.inv_cdf(below)
+            acceleration = _jackknife_acceleration(values)
+            z = np.array([_NORMAL.inv_cdf(q) for q in quantiles])
+            adjusted = bias + (bias + z) / (1.0 - acceleration * (bias + z))
+            quantiles = np.array([_NORMAL.cdf(float(q)) for q in adjusted])
+
+    lower, upper = np.quantile(means, quantiles)
+    return float(lower), float(upper)
+
+
+class BootstrapInterval:
+    """
+    The bootstrap confidence interval of the scores a metric was last given,
+    shared by a ci_lower and ci_upper pair (see `ci_bounds`) so the pair
+    resamples once.
+
+    inspect hands every metric of a score the same list of scores, so the
+    interval is reused while the list is the same object. The list is held
+    until the next one replaces it, so its id can't be reused meanwhile.
+    """
+
+    def __init__(self, confidence: float = 0.95, resamples: int = 10000, method: Literal["percentile", "bca"] = "bca", seed: int | None = 0):
+        """
+        Initialize the interval.
+
+        Args:
+            confidence (float): The confidence level.
+            resamples (int): The number of bootstrap resamples.
+            method (str): "percentile" or "bca".
+            seed (int | None): The random seed.
+        """
+        self.confidence = confidence
+        self.resamples = resamples
+        self.method = method
+        self.seed = seed
+        self._scores: list[Score] | None = None
+        self._interval = (float("nan"), float("nan"))
+
+    def __call__(self, scores: list[Score]) -> tuple[float, float]:
+        """
+        Compute the interval for the scores, or reuse it for the same list.
+
+        Args:
+            scores (list[Score]): The scores.
+
+        Returns:
+            tuple[float, float]: The lower and upper bounds.
+        """
+        if scores is not self._scores:
+            self._interval = bootstrap_ci(score_values(scores, None), self.confidence, self.resamples, self.method, self.seed)
+            self._scores = scores
+        return self._interval
+
+
+@metric
+def ci_lower(confidence: float = 0.95, resamples: int = 10000, method: Literal["percentile", "bca"] = "bca", seed: int | None = 0, interval: BootstrapInterval | None = None):
+    """
+    Metric function to calculate the lower bound of a bootstrap confidence interval for the mean.
+
+    Args:
+        confidence (float): The confidence level.
+        resamples (int): The number of bootstrap resamples.
+        method (str): "percentile" or "bca".
+        seed (int | None): The random seed; the default keeps results reproducible.
+        interval (BootstrapInterval | None): An interval shared with a
+            ci_upper, which then sets the other options; see `ci_bounds`.
+
+    Returns:
+        function: The metric function.
+    """
+    interval = interval or BootstrapInterval(confidence, resamples, method, seed)
+
+    def metric(scores: list[Score]) -> float:
+        return interval(scores)[0]
+    return metric
+
+
+@metric
+def ci_upper(confidence: float = 0.95, resamples: int = 10000, method: Literal["percentile", "bca"] = "bca", seed: int | None = 0, interval: BootstrapInterval | None = None):
+    """
+    Metric function to calculate the upper bound of a bootstrap confidence interval for the mean.
+
+    Args:
+        confidence (float): The confidence level.
+        resamples (int): The number of bootstrap resamples.
+        method (str): "percentile" or "bca".
+        seed (int | None): The random seed; the default keeps results reproducible.
+        interval (BootstrapInterval | None): An interval shared with a
+            ci_lower, which then sets the other options; see `ci_bounds`.
+
+    Returns:
+        function: The metric function.
+    """
+    interval = interval or BootstrapInterval(confidence, resamples, method, seed)
+
+    def metric(scores: list[Score]) -> float:
+        return interval(scores)[1]
+    return metric
+
+
+def ci_bounds(confidence: float = 0.95, resamples: int = 10000, method: Literal["percentile", "bca"] = "bca", seed: int | None = 0) -> list[Metric]:
+    """
+    Create ci_lower and ci_upper metrics that share one bootstrap per metric pass.
+
+    Args:
+        confidence (float): The confidence level.
+        resamples (int): The number of bootstrap resamples.
+        method (str): "percentile" or "bca".
+        seed (int | None): The random seed; the default keeps results reproducible.
+
+    Returns:
+        list[Metric]: The ci_lower and ci_upper metrics.
+    """
+    interval = BootstrapInterval(confidence, resamples, method, seed)
+    return [ci_lower(interval=interval), ci_upper(interval=interval)]
+
+
+@dataclass
+class PairedBootstrapResult:
+    """
+    The outcome of a paired bootstrap comparison between two eval logs.
+    """
+    mean_difference: float
+    """Mean of the second log's values minus the first's, over paired samples."""
+
+    ci_lower: float
+    """Lower bound of the confidence interval for the mean difference."""
+
+    ci_upper: float
+    """Upper bound of the confidence interval for the mean difference."""
+
+    p_value: float
+    """Two-sided bootstrap p-value for a mean difference of zero."""
+
+    samples: int
+    """Number of paired samples."""
+
+
+def _log_values(log: EvalLog, scorer: str | None, key: str) -> dict[tuple, float]:
+    values = {}
+    for sample in log.samples or []:
+        if not sample.scores:
+            continue
+        if scorer is None:
+            if len(sample.scores) != 1:
+                raise ValueError(f"Log has scores from {', '.join(sample.scores)}; pass the scorer to compare")
+            score = next(iter(sample.scores.values()))
+        elif scorer in sample.scores:
+            score = sample.scores[scorer]
+        else:
+            continue
+        value = score_values([score], key)
+        if value.size:
+            values[(str(sample.id), sample.epoch)] = float(value[0])
+    return values
+
+
+def paired_bootstrap(
+    log_a: str | EvalLog,
+    log_b: str | EvalLog,
+    key: str = "groundedness",
+    scorer: str | None = None,
+    confidence: float = 0.95,
+    resamples: int = 10000,
+    method: Literal["percentile", "bca"] = "bca",
+    seed: int | None = 0,
+) -> PairedBootstrapResult:
+    """
+    Compare a score between two eval logs of the same dataset with a paired bootstrap.
+
+    Samples are paired by sample id and epoch, and the per-sample differences
+    are resampled, so sample difficulty cancels out of the comparison.
+
+    Args:
+        log_a (str | EvalLog): The baseline log, or a path to it.
+        log_b (str | EvalLog): The log to compare, or a path to it.
+        key (str): The score key, e.g. "groundedness".
+        scorer (str | None): The scorer whose scores to compare; may be
+            omitted when the logs have a single scorer.
+        confidence (float): The confidence level.
+        resamples (int): The number of bootstrap resamples.
+        method (str): "percentile" or "bca".
+        seed (int | None): The random seed, or None for a fresh one.
+
+    Returns:
+        PairedBootstrapResult: The mean difference (b - a), its interval and p-value.
+    """
+    if isinstance(log_a, str):
+        log_a = read_eval_log(log_a)
+    if isinstance(log_b, str):
+        log_b = read_eval_log(log_b)
+
+    values_a = _log_values(log_a, scorer, key)
+    values_b = _log_values(log_b, scorer, key)
+    paired = sorted(values_a.keys() & values_b.keys())
+    if not paired:
+        raise ValueError(f"The logs have no samples with a '{key}' score in common")
+
+    differences = np.array([values_b[sample] - values_a[sample] for sample in paired])
+    if method not in ("percentile", "bca"):
+        raise ValueError(f"Unknown method '{method}', expected 'percentile' or 'bca'")
+
+    # the interval and the p-value come from the same resamples
+    means = bootstrap_means(differences, resamples, seed)
+    if np.all(differences == differences[0]):
+        lower = upper = float(differences[0])
+    else:
+        lower, upper = _interval(differences, means, confidence, method)
+    tail = min(np.count_nonzero(means <= 0), np.count_nonzero(means >= 0)) / resamples
+    return PairedBootstrapResult(
+        mean_difference=float(differences.mean()),
+        ci_lower=lower,
+        ci_upper=upper,
+        p_value=min(1.0, 2.0 * tail),
+        samples=len(paired),
+    )
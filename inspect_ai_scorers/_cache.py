@@ -0,0 +1,299 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from platformdirs import user_cache_dir
+
+from inspect_ai_scorers._tracing import record_cache_hit
+
+
+def cache_key(prompt_template: str, model_name: str, config: dict | None, text: str) -> str:
+    """
+    Build a content-addressed key for a fact extraction request.
+
+    Args:
+        prompt_template (str): The unformatted extraction prompt.
+        model_name (str): The name of the model doing the extraction.
+        config (dict | None): The generate config used for the request.
+        text (str): The text facts are extracted from.
+
+    Returns:
+        str: A hex digest identifying the request.
+    """
+    payload = json.dumps(
+        [prompt_template, model_name, config or {}, text],
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class FactCache:
+    """
+    A two-tier cache for fact extraction results.
+
+    Lookups check an in-process LRU first and then an on-disk SQLite store, so
+    the same target text is only sent to the fact model once across epochs,
+    candidate models and reruns. Both tiers evict by size and expire entries
+    older than `ttl` seconds.
+
+    Memory hits don't touch the disk; their access times are written with the
+    next store, before anything is evicted, so hot entries stay on disk. The
+    async `aget` and `aset` run the disk tier on a worker thread.
+    """
+
+    def __init__(self, path: str | None = None, max_entries: int = 4096, max_disk_bytes: int = 256 * 1024 * 1024, ttl: float | None = 30 * 24 * 60 * 60):
+        """
+        Initialize the cache.
+
+        Args:
+            path (str | None): The SQLite file to use, or ":memory:" to skip the disk tier.
+                Defaults to `fact_cache.sqlite` in the user cache directory.
+            max_entries (int): The maximum number of entries held in the in-process LRU.
+            max_disk_bytes (int): The maximum total size of values held on disk.
+            ttl (float | None): Seconds after which an entry expires, or None to keep entries forever.
+        """
+        if path is None:
+            path = os.path.join(user_cache_dir("inspect_ai_scorers"), "fact_cache.sqlite")
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        self.path = path
+        self.max_entries = max_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+        self._memory: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self._touched: dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS facts ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+            "created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS facts_accessed ON facts (accessed)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS facts_created ON facts (created)")
+        (self._disk_bytes,) = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM facts").fetchone()
+
+    def _expired(self, created: float, now: float) -> bool:
+        return self.ttl is not None and now - created > self.ttl
+
+    def get(self, key: str) -> str | None:
+        """
+        Look up a cached extraction result.
+
+        Args:
+            key (str): The key from `cache_key`.
+
+        Returns:
+            str | None: The cached result, or None on a miss.
+        """
+        now = time.time()
+        value = self._memory_get(key, now)
+        if value is not None:
+            return value
+        return self._disk_get(key, now)
+
+    async def aget(self, key: str) -> str | None:
+        """
+        Look up a cached extraction result without blocking the event loop
+        on the disk tier.
+
+        Args:
+            key (str): The key from `cache_key`.
+
+        Returns:
+            str | None: The cached result, or None on a miss.
+        """
+        now = time.time()
+        value = self._memory_get(key, now)
+        if value is not None:
+            return value
+        return await asyncio.to_thread(self._disk_get, key, now)
+
+    def set(self, key: str, value: str) -> None:
+        """
+        Store an extraction result in both tiers.
+
+        Args:
+            key (str): The key from `cache_key`.
+            value (str): The extraction result.
+        """
+        now = time.time()
+        with self._lock:
+            self._remember(key, value, now)
+        self._disk_set(key, value, now)
+
+    async def aset(self, key: str, value: str) -> None:
+        """
+        Store an extraction result in both tiers, writing the disk tier on a
+        worker thread.
+
+        Args:
+            key (str): The key from `cache_key`.
+            value (str): The extraction result.
+        """
+        now = time.time()
+        with self._lock:
+            self._remember(key, value, now)
+        await asyncio.to_thread(self._disk_set, key, value, now)
+
+    def _memory_get(self, key: str, now: float) -> str | None:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            value, created = entry
+            if self._expired(created, now):
+                del self._memory[key]
+                return None
+            self._memory.move_to_end(key)
+            self._touched[key] = now
+            self.hits += 1
+            return value
+
+    def _disk_get(self, key: str, now: float) -> str | None:
+        with self._db_lock:
+            row = self._db.execute("SELECT value, size, created FROM facts WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                value, size, created = row
+                if not self._expired(created, now):
+                    self._db.execute("UPDATE facts SET accessed = ? WHERE key = ?", (now, key))
+                    with self._lock:
+                        self._remember(key, value, created)
+                        self.hits += 1
+                    return value
+                self._db.execute("DELETE FROM facts WHERE key = ?", (key,))
+                self._disk_bytes -= size
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def _disk_set(self, key: str, value: str, now: float) -> None:
+        size = len(value.encode("utf-8"))
+        with self._db_lock:
+            row = self._db.execute("SELECT size FROM facts WHERE key = ?", (key,)).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO facts (key, value, size, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, value, size, now, now),
+            )
+            self._disk_bytes += size - (row[0] if row else 0)
+            self._write_touched()
+            self._evict_disk(now)
+
+    def _write_touched(self) -> None:
+        with self._lock:
+            touched, self._touched = self._touched, {}
+        if touched:
+            self._db.executemany("UPDATE facts SET accessed = ? WHERE key = ?", [(accessed, key) for key, accessed in touched.items()])
+
+    def _remember(self, key: str, value: str, created: float) -> None:
+        self._memory[key] = (value, created)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _evict_disk(self, now: float) -> None:
+        if self.ttl is not None:
+            (expired,) = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM facts WHERE created < ?", (now - self.ttl,)).fetchone()
+            if expired:
+                self._db.execute("DELETE FROM facts WHERE created < ?", (now - self.ttl,))
+                self._disk_bytes -= expired
+
+        if self._disk_bytes <= self.max_disk_bytes:
+            return
+
+        # drop least recently used entries until we are back under budget
+        excess = self._disk_bytes - self.max_disk_bytes
+        freed = 0
+        doomed = []
+        for key, size in self._db.execute("SELECT key, size FROM facts ORDER BY accessed ASC"):
+            doomed.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        self._db.executemany("DELETE FROM facts WHERE key = ?", doomed)
+        self._disk_bytes -= freed
+
+    def clear(self) -> None:
+        """
+        Remove every entry from both tiers and reset the hit/miss counts.
+        """
+        with self._db_lock, self._lock:
+            self._memory.clear()
+            self._touched.clear()
+            self._db.execute("DELETE FROM facts")
+            self._disk_bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def close(self) -> None:
+        """
+        Close the on-disk store, first saving the access times of memory hits.
+        """
+        with self._db_lock:
+            self._write_touched()
+            self._db.close()
+
+
+def resolve_cache(cache: "bool | str | FactCache | None") -> FactCache | None:
+    """
+    Resolve a scorer's cache option into a FactCache.
+
+    Args:
+        cache (bool | str | FactCache | None): True for the default cache, a path
+            for a cache stored at that path, a FactCache to use as is, or
+            None/False to disable caching.
+
+    Returns:
+        FactCache | None: The cache to use, if any.
+    """
+    if cache is None or cache is False:
+        return None
+    if cache is True:
+        return FactCache()
+    if isinstance(cache, str):
+        return FactCache(path=cache)
+    return cache
+
+
+async def cached_extraction(cache: FactCache | None, key: str | None, extract, stats: dict[str, int] | None = None) -> str:
+    """
+    Return a cached extraction result, or run the extraction and cache it.
+
+    Args:
+        cache (FactCache | None): The cache to consult, or None to always extract.
+        key (str | None): The key from `cache_key`.
+        extract (Callable): Async callable producing the extraction result on a miss.
+        stats (dict | None): Per-sample "hits"/"misses" counts to update.
+
+    Returns:
+        str: The extraction result.
+    """
+    if cache is None:
+        return await extract()
+
+    value = await cache.aget(key)
+    if value is not None:
+        if stats is not None:
+            stats["hits"] += 1
+        record_cache_hit()
+        return value
+
+    if stats is not None:
+        stats["misses"] += 1
+    value = await extract()
+    await cache.aset(key, value)
+    return value
@@ -0,0 +1,154 @@
+import asyncio
+from collections import Counter
+from typing import Awaitable, Callable, Iterable, TypeVar
+
+from inspect_ai.model import GenerateConfig
+from inspect_ai.scorer import Score, metric
+
+from inspect_ai_scorers._parsing import ComparisonParseError
+from inspect_ai_scorers._tracing import stage_span
+
+T = TypeVar("T")
+
+# list prices in dollars per million (input, output) tokens, used when
+# `cascade_summary` isn't given any
+CHEAP_PRICE = (0.15, 0.60)        # openai/gpt-4o-mini
+EXPENSIVE_PRICE = (30.0, 60.0)    # openai/gpt-4
+
+
+def seeded(config: GenerateConfig | None, sample: int) -> GenerateConfig | None:
+    """
+    Give repeated samples of a request a different seed, so they aren't
+    coalesced into one call or replayed from a single cassette entry.
+
+    Args:
+        config (GenerateConfig | None): The request's config.
+        sample (int): The sample number; sample 0 keeps the config as is.
+
+    Returns:
+        GenerateConfig | None: The config for the sample.
+    """
+    if not sample:
+        return config
+    return (config or GenerateConfig()).merge(GenerateConfig(seed=sample))
+
+
+async def cheap_tier(calls: list[Callable[[], Awaitable[T]]], uncertainty: Callable[[list[T]], str | None]) -> tuple[list[T], str | None, int]:
+    """
+    Run a cascade's cheap grader calls and decide whether to escalate.
+
+    The calls run concurrently in a "cascade" span. A response that can't be
+    parsed is a reason to escalate, as is whatever `uncertainty` finds. Once
+    one call fails the rest are cancelled, as the sample escalates anyway.
+
+    Args:
+        calls (list[Callable]): The cheap grader calls, one per sample.
+        uncertainty (Callable): Given the results, returns why they can't be
+            trusted, or None.
+
+    Returns:
+        tuple: The results, empty after a parse failure; the reason to
+            escalate, or None to use the first result; and the number of
+            calls that finished rather than being cancelled.
+    """
+    with stage_span("cascade"):
+        tasks = [asyncio.ensure_future(call()) for call in calls]
+        try:
+            results = list(await asyncio.gather(*tasks))
+        except ComparisonParseError:
+            results = None
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    finished = sum(not task.cancelled() for task in tasks)
+    if results is None:
+        return [], "parse_failure", finished
+    return results, uncertainty(results), finished
+
+
+def _tier_usage(stages: Iterable[dict]) -> dict[str, float]:
+    usage = dict.fromkeys(("calls", "input_tokens", "output_tokens", "seconds"), 0)
+    for stage in stages:
+        for key in usage:
+            usage[key] += (stage or {}).get(key, 0)
+    return usage
+
+
+def _cost(usage: dict[str, float], price: tuple[float, float]) -> float:
+    return (usage["input_tokens"] * price[0] + usage["output_tokens"] * price[1]) / 1e6
+
+
+def cascade_summary(scores: Iterable[Score], cheap_price: tuple[float, float] = CHEAP_PRICE, expensive_price: tuple[float, float] = EXPENSIVE_PRICE) -> dict:
+    """
+    Report how a cascade's escalations went and what it saved, e.g. for the
+    scores in an eval log.
+
+    The savings are against grading every sample with the expensive grader
+    alone. Escalated samples were, so their cost and wall time are measured.
+    For the rest, each cheap call's tokens stand in for an expensive call's,
+    and the wall time is the mean of the escalated samples.
+
+    Args:
+        scores: The scores of a scorer run with `cascade_model`.
+        cheap_price (tuple[float, float]): The cheap grader's dollars per
+            million input and output tokens.
+        expensive_price (tuple[float, float]): The expensive grader's.
+
+    Returns:
+        dict: The samples and escalations, the escalation rate, the
+            escalations by reason, each tier's calls, tokens and seconds, the
+            cost and mean grading seconds per sample, their estimates without
+            the cascade and the fraction saved. The latency figures are None
+            when no sample was escalated.
+    """
+    samples = [score.metadata for score in scores if (score.metadata or {}).get("cascade")]
+    escalated = [metadata for metadata in samples if metadata["cascade"]["escalated"]]
+    cheap = _tier_usage(metadata.get("stages", {}).get("cascade") for metadata in samples)
+    expensive = _tier_usage(metadata.get("stages", {}).get("escalation") for metadata in escalated)
+
+    # samples the cheap grader settled, as if they had gone to the expensive one
+    calls_per_sample = expensive["calls"] / len(escalated) if escalated and expensive["calls"] else 1.0
+    baseline = dict(expensive)
+    for metadata in samples:
+        if metadata["cascade"]["escalated"]:
+            continue
+        stage = metadata.get("stages", {}).get("cascade") or {}
+        per_call = calls_per_sample / (stage.get("calls") or 1)
+        baseline["input_tokens"] += stage.get("input_tokens", 0) * per_call
+        baseline["output_tokens"] += stage.get("output_tokens", 0) * per_call
+
+    cost = _cost(cheap, cheap_price) + _cost(expensive, expensive_price)
+    baseline_cost = _cost(baseline, expensive_price)
+    mean_seconds = (cheap["seconds"] + expensive["seconds"]) / len(samples) if samples else 0.0
+    baseline_seconds = expensive["seconds"] / len(escalated) if escalated else None
+    return {
+        "samples": len(samples),
+        "escalated": len(escalated),
+        "escalation_rate": len(escalated) / len(samples) if samples else 0.0,
+        "reasons": dict(Counter(metadata["cascade"]["reason"] for metadata in escalated)),
+        "cheap": cheap,
+        "expensive": expensive,
+        "cost": cost,
+        "baseline_cost": baseline_cost,
+        "cost_savings": 1 - cost / baseline_cost if baseline_cost else 0.0,
+        "mean_seconds": mean_seconds,
+        "baseline_mean_seconds": baseline_seconds,
+        "latency_savings": 1 - mean_seconds / baseline_seconds if baseline_seconds else None,
+    }
+
+
+@metric
+def escalation_rate():
+    """
+    Metric function for the share of samples a cascade escalated to its
+    expensive grader.
+
+    Returns:
+        function: The metric function.
+    """
+    def metric(scores: list[Score]) -> float:
+        cascades = [(score.metadata or {}).get("cascade") for score in scores]
+        escalated = [cascade["escalated"] for cascade in cascades if cascade]
+        return sum(escalated) / len(escalated) if escalated else 0.0
+    return metric
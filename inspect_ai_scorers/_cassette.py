@@ -0,0 +1,171 @@
+import atexit
+import json
+import os
+from typing import Any, Awaitable, Callable, Literal
+
+from inspect_ai.model import ChatMessage, GenerateConfig, Model, ModelOutput
+
+from inspect_ai_scorers._singleflight import inspect_request, request_key, request_payload
+
+CassetteMode = Literal["record", "replay", "lenient"]
+
+
+class CassetteMissError(LookupError):
+    """Raised in strict replay when a request was never recorded."""
+
+
+class Cassette:
+    """
+    Record grader requests and responses to a file and replay them.
+
+    Entries are lines in an append-only JSONL file, keyed by the request
+    hash used for request coalescing (model, generate config and input). In
+    "record" mode every request goes to the model and is appended. "replay"
+    serves every request from the file and raises CassetteMissError for one
+    that isn't there, so nothing reaches the model. "lenient" replays what
+    it can and sends the rest to the model, appending those responses so the
+    next run replays them too.
+    """
+
+    def __init__(self, path: str, mode: CassetteMode = "replay"):
+        """
+        Initialize the cassette, loading any entries already recorded.
+
+        Args:
+            path (str): The cassette file, conventionally ending in ".jsonl".
+            mode (str): "record", "replay" or "lenient".
+        """
+        if mode not in ("record", "replay", "lenient"):
+            raise ValueError(f"Unknown cassette mode '{mode}', expected 'record', 'replay' or 'lenient'")
+        if mode == "replay" and not os.path.exists(path):
+            raise FileNotFoundError(f"No cassette at {path} to replay; record one first")
+
+        self.path = path
+        self.mode = mode
+        self._entries: dict[str, Any] = {}
+        self._file = None
+
+        # counters for monitoring
+        self.hits = 0
+        self.misses = 0
+        self.recorded = 0
+
+        if os.path.exists(path):
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __enter__(self) -> "Cassette":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    async def play(self, key: str, request: Any, call: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Serve a response from the cassette, or make the call and record it.
+
+        Args:
+            key (str): The request key (see `request_key`).
+            request: The JSON-serializable request, stored alongside the response.
+            call (Callable): Async call returning the JSON-serializable response.
+
+        Returns:
+            The recorded or live response.
+        """
+        if self.mode != "record" and key in self._entries:
+            self.hits += 1
+            return self._entries[key]
+
+        if self.mode == "replay":
+            raise CassetteMissError(f"Request {key[:12]} is not in the cassette at {self.path}; record it or replay leniently")
+
+        self.misses += 1
+        response = await call()
+        self._append(key, request, response)
+        return response
+
+    async def generate(self, model: Model, input: str | list[ChatMessage], config: GenerateConfig | None, call: Callable[[], Awaitable[ModelOutput]]) -> ModelOutput:
+        """
+        Make an inspect model call through the cassette.
+
+        Args:
+            model (Model): The model being called.
+            input (str | list[ChatMessage]): The prompt or messages.
+            config (GenerateConfig | None): Generate config overrides for the call.
+            call (Callable): Async callable making the live request.
+
+        Returns:
+            ModelOutput: The recorded or live output.
+        """
+        request = inspect_request(model, input, config)
+
+        async def live() -> dict:
+            return (await call()).model_dump(mode="json", exclude_none=True)
+
+        response = await self.play(request_key(*request), request_payload(*request), live)
+        return ModelOutput.model_validate(response)
+
+    def stats(self) -> dict[str, int]:
+        """
+        Read the cassette's counters for monitoring.
+
+        Returns:
+            dict: Entries in the cassette, requests replayed, requests sent to
+                the model and responses appended.
+        """
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses, "recorded": self.recorded}
+
+    def close(self) -> None:
+        """
+        Close the file responses are appended to this session.
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            atexit.unregister(self.close)
+
+    def _load(self) -> None:
+        with open(self.path, encoding="utf-8", errors="replace") as file:
+            for line in file:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # a session that died mid-write leaves a partial line;
+                    # the entries around it are still read
+                    continue
+                self._entries[entry["key"]] = entry["response"]
+
+    def _append(self, key: str, request: Any, response: Any) -> None:
+        self._entries[key] = response
+        if self._file is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._file = open(self.path, "a+b")
+            # end a partial line left by a session that died, so the first
+            # entry appended now isn't lost with it
+            if self._file.tell() > 0:
+                self._file.seek(-1, os.SEEK_END)
+                if self._file.read(1) != b"\n":
+                    self._file.write(b"\n")
+            atexit.register(self.close)
+        self._file.write((json.dumps({"key": key, "request": request, "response": response}, sort_keys=True, default=str) + "\n").encode("utf-8"))
+        # a sync flush makes each entry readable even if the session dies
+        self._file.flush()
+        self.recorded += 1
+
+
+def resolve_cassette(cassette: "str | Cassette | None") -> Cassette | None:
+    """
+    Resolve a scorer's cassette option into a Cassette.
+
+    Args:
+        cassette (str | Cassette | None): A path to replay strictly, a
+            Cassette to use as is, or None to call the model directly.
+
+    Returns:
+        Cassette | None: The cassette to use, if any.
+    """
+    if isinstance(cassette, str):
+        return Cassette(cassette)
+    return cassette
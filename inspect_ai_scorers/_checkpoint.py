@@ -0,0 +1,309 @@
+import asyncio
+import atexit
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any
+
+from inspect_ai.scorer import Score
+
+
+def content_hash(*parts: Any) -> str:
+    """
+    Hash what a sample's score depends on, so a checkpointed score is only
+    reused for the same scorer settings, target and answer.
+
+    Args:
+        *parts: JSON-serializable values, e.g. the scorer, grader model,
+            target text and answer text.
+
+    Returns:
+        str: A hex digest.
+    """
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ScoreCheckpoint:
+    """
+    A crash-safe record of finished scores, for resuming a long scoring run.
+
+    Each finished Score, with the fact lists it was computed from, is written
+    to a SQLite file keyed by sample id, epoch and a content hash of the
+    scorer settings, target and answer. When a run is restarted with the same
+    checkpoint, samples already scored are served from it instead of calling
+    the grader, and samples whose target or answer changed are scored again.
+
+    Writes are buffered and committed in batches, every `batch_size` scores
+    or `flush_interval` seconds, whichever comes first. The database is in
+    WAL mode with full sync, so each commit costs one fsync. Commits run on a
+    writer thread, and lookups use their own connection, which WAL lets read
+    while a commit is in progress, so neither waits for the fsync. Scores
+    being committed are still served from memory. Scorers look up with
+    `aget`, which runs the read on a worker thread. A crash loses at most the
+    scores not yet committed.
+    """
+
+    def __init__(self, path: str, batch_size: int = 64, flush_interval: float = 2.0):
+        """
+        Initialize the checkpoint, creating the file if needed.
+
+        Args:
+            path (str): The SQLite file.
+            batch_size (int): Buffered scores that trigger a commit.
+            flush_interval (float): Seconds after which buffered scores are committed.
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        # counters for monitoring
+        self.restored = 0
+        self.written = 0
+        self.commits = 0
+
+        self._pending: dict[str, tuple] = {}
+        self._committing: dict[str, tuple] = {}
+        self._writes: list[Future] = []
+        self._last_flush = time.monotonic()
+        # _lock guards the buffers and counters, _db_lock the writer's
+        # connection and _read_lock the readers'
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._read_lock = threading.Lock()
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="score-checkpoint")
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=FULL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS scores ("
+            "key TEXT PRIMARY KEY, sample_id TEXT, epoch INTEGER, content_hash TEXT NOT NULL, "
+            "score TEXT NOT NULL, facts TEXT, created REAL NOT NULL)"
+        )
+        self._reader = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        atexit.register(self.close)
+
+    def __len__(self) -> int:
+        with self._lock:
+            buffered = set(self._pending) | set(self._committing)
+        with self._read_lock:
+            (count,) = self._reader.execute("SELECT COUNT(*) FROM scores").fetchone()
+            return count + sum(1 for key in buffered if not self._stored(key))
+
+    def __enter__(self) -> "ScoreCheckpoint":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @staticmethod
+    def _key(sample_id: str | int | None, epoch: int | None, content: str) -> str:
+        return json.dumps([sample_id, epoch, content])
+
+    def _stored(self, key: str) -> bool:
+        return self._reader.execute("SELECT 1 FROM scores WHERE key = ?", (key,)).fetchone() is not None
+
+    def get(self, sample_id: str | int | None, epoch: int | None, content: str) -> Score | None:
+        """
+        Look up a checkpointed score.
+
+        Args:
+            sample_id (str | int | None): The sample.
+            epoch (int | None): The sample's epoch.
+            content (str): The sample's `content_hash`.
+
+        Returns:
+            Score | None: The score, or None if the sample hasn't been scored
+                with this content.
+        """
+        key = self._key(sample_id, epoch, content)
+        row = self._buffered(key)
+        score = row[4] if row is not None else self._select("score", key)
+        if score is None:
+            return None
+        with self._lock:
+            self.restored += 1
+        return Score.model_validate_json(score)
+
+    async def aget(self, sample_id: str | int | None, epoch: int | None, content: str) -> Score | None:
+        """
+        Look up a checkpointed score without blocking the event loop on the database.
+
+        Args:
+            sample_id (str | int | None): The sample.
+            epoch (int | None): The sample's epoch.
+            content (str): The sample's `content_hash`.
+
+        Returns:
+            Score | None: The score, or None if the sample hasn't been scored
+                with this content.
+        """
+        return await asyncio.to_thread(self.get, sample_id, epoch, content)
+
+    def facts(self, sample_id: str | int | None, epoch: int | None, content: str) -> dict | None:
+        """
+        Read the intermediate fact lists checkpointed with a score.
+
+        Args:
+            sample_id (str | int | None): The sample.
+            epoch (int | None): The sample's epoch.
+            content (str): The sample's `content_hash`.
+
+        Returns:
+            dict | None: The fact lists, or None if none were recorded.
+        """
+        key = self._key(sample_id, epoch, content)
+        row = self._buffered(key)
+        facts = row[5] if row is not None else self._select("facts", key)
+        return json.loads(facts) if facts is not None else None
+
+    def _buffered(self, key: str) -> tuple | None:
+        # a row leaves the commit buffer only once it's committed, so a key
+        # that isn't buffered is in the database if it was ever written
+        with self._lock:
+            return self._pending.get(key) or self._committing.get(key)
+
+    def _select(self, column: str, key: str) -> str | None:
+        with self._read_lock:
+            row = self._reader.execute(f"SELECT {column} FROM scores WHERE key = ?", (key,)).fetchone()
+        return row[0] if row is not None else None
+
+    def put(self, sample_id: str | int | None, epoch: int | None, content: str, score: Score, facts: dict | None = None) -> None:
+        """
+        Buffer a finished score, committing the buffer if it's full or old.
+
+        Args:
+            sample_id (str | int | None): The sample.
+            epoch (int | None): The sample's epoch.
+            content (str): The sample's `content_hash`.
+            score (Score): The score.
+            facts (dict | None): Intermediate fact lists to keep with it.
+        """
+        key = self._key(sample_id, epoch, content)
+        row = (
+            key,
+            None if sample_id is None else str(sample_id),
+            epoch,
+            content,
+            score.model_dump_json(),
+            None if facts is None else json.dumps(facts, ensure_ascii=False, default=str),
+            time.time(),
+        )
+        with self._lock:
+            self._pending[key] = row
+            self.written += 1
+            if len(self._pending) >= self.batch_size or time.monotonic() - self._last_flush >= self.flush_interval:
+                self._start_commit()
+        self._raise_failed_writes()
+
+    def flush(self) -> None:
+        """
+        Commit the buffered scores, waiting for the commit to finish.
+        """
+        with self._lock:
+            self._start_commit()
+        self.wait()
+
+    def wait(self) -> None:
+        """
+        Wait for the commits already started to finish.
+
+        Raises:
+            sqlite3.Error: If a commit failed.
+        """
+        with self._lock:
+            writes = list(self._writes)
+        for write in writes:
+            write.result()
+        self._raise_failed_writes()
+
+    def _raise_failed_writes(self) -> None:
+        with self._lock:
+            done = [write for write in self._writes if write.done()]
+            self._writes = [write for write in self._writes if not write.done()]
+        for write in done:
+            write.result()
+
+    def _start_commit(self) -> None:
+        # called with _lock held; the rows stay readable until they're committed
+        self._last_flush = time.monotonic()
+        if not self._pending:
+            return
+        rows = self._pending
+        self._pending = {}
+        self._committing.update(rows)
+        self._writes.append(self._writer.submit(self._commit, rows))
+
+    def _commit(self, rows: dict[str, tuple]) -> None:
+        try:
+            with self._db_lock:
+                self._db.execute("BEGIN")
+                try:
+                    self._db.executemany("INSERT OR REPLACE INTO scores VALUES (?, ?, ?, ?, ?, ?, ?)", list(rows.values()))
+                    self._db.execute("COMMIT")
+                except BaseException:
+                    self._db.execute("ROLLBACK")
+                    raise
+        except BaseException:
+            # keep the rows buffered so the next commit retries them
+            with self._lock:
+                for key, row in rows.items():
+                    if self._committing.get(key) is row:
+                        del self._committing[key]
+                        self._pending.setdefault(key, row)
+            raise
+        with self._lock:
+            for key, row in rows.items():
+                if self._committing.get(key) is row:
+                    del self._committing[key]
+            self.commits += 1
+
+    def stats(self) -> dict[str, int]:
+        """
+        Read the checkpoint's counters for monitoring.
+
+        Returns:
+            dict: Scores served from the checkpoint, scores written, commits
+                made and scores buffered but not yet committed.
+        """
+        with self._lock:
+            pending = len(self._pending) + len(self._committing)
+            return {"restored": self.restored, "written": self.written, "commits": self.commits, "pending": pending}
+
+    def close(self) -> None:
+        """
+        Commit the buffered scores and close the file. Closing twice is harmless.
+        """
+        if self._db is None:
+            return
+        try:
+            self.flush()
+        finally:
+            self._writer.shutdown(wait=True)
+            with self._db_lock:
+                self._db.close()
+                self._db = None
+            with self._read_lock:
+                self._reader.close()
+            atexit.unregister(self.close)
+
+
+def resolve_checkpoint(checkpoint: "str | ScoreCheckpoint | None") -> ScoreCheckpoint | None:
+    """
+    Resolve a scorer's checkpoint option into a ScoreCheckpoint.
+
+    Args:
+        checkpoint (str | ScoreCheckpoint | None): A path for a checkpoint
+            stored there, a ScoreCheckpoint to use as is, or None.
+
+    Returns:
+        ScoreCheckpoint | None: The checkpoint to use, if any.
+    """
+    if isinstance(checkpoint, str):
+        return ScoreCheckpoint(checkpoint)
+    return checkpoint
@@ -0,0 +1,166 @@
+import asyncio
+import re
+from functools import lru_cache
+from typing import Awaitable, Callable
+
+from inspect_ai_scorers._facts import format_facts, parse_facts
+
+_PARAGRAPH = re.compile(r"\n\s*\n")
+_SENTENCE = re.compile(r"(?<=[.!?])[\"')\]]*\s+(?=[\"'(\[]?[A-Z0-9])")
+_TOKEN = re.compile(r"\w+|[^\w\s]")
+_FACT_NORMALIZE = re.compile(r"[^\w\s]+")
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    return tiktoken.get_encoding("cl100k_base")
+
+
+def count_tokens(text: str) -> int:
+    """
+    Count the tokens in a text with a local tokenizer.
+
+    Uses tiktoken's cl100k_base encoding when tiktoken is installed, and
+    otherwise counts words and punctuation marks, which tracks BPE token
+    counts closely enough for chunk budgets.
+
+    Args:
+        text (str): The text.
+
+    Returns:
+        int: The number of tokens.
+    """
+    encoding = _encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return len(_TOKEN.findall(text))
+
+
+def _units(text: str) -> list[tuple[str, str]]:
+    # (separator before the unit, sentence) pairs, keeping paragraph breaks
+    units = []
+    for p, paragraph in enumerate(_PARAGRAPH.split(text.strip())):
+        for s, sentence in enumerate(_SENTENCE.split(paragraph.strip())):
+            if sentence.strip():
+                separator = "" if not units else ("\n\n" if s == 0 and p > 0 else " ")
+                units.append((separator, sentence.strip()))
+    return units
+
+
+def _split_long(sentence: str, max_tokens: int) -> list[str]:
+    # a sentence over the budget on its own is split between words
+    pieces = []
+    words: list[str] = []
+    tokens = 0
+    for word in sentence.split():
+        word_tokens = count_tokens(word)
+        if words and tokens + word_tokens > max_tokens:
+            pieces.append(" ".join(words))
+            words = []
+            tokens = 0
+        words.append(word)
+        tokens += word_tokens
+    if words:
+        pieces.append(" ".join(words))
+    return pieces
+
+
+def split_text(text: str, max_tokens: int = 1000, overlap: int = 0) -> list[str]:
+    """
+    Split a text into chunks at paragraph and sentence boundaries.
+
+    Sentences are packed into chunks of at most `max_tokens` tokens. Each
+    chunk after the first repeats trailing sentences of the previous chunk,
+    up to `overlap` tokens, so facts spanning a boundary keep their context.
+
+    Args:
+        text (str): The text to split.
+        max_tokens (int): The token budget per chunk.
+        overlap (int): The token budget for sentences repeated from the previous chunk.
+
+    Returns:
+        list[str]: The chunks, in order. A text within the budget is one chunk.
+    """
+    if max_tokens < 1:
+        raise ValueError("max_tokens must be at least 1")
+    if overlap >= max_tokens:
+        raise ValueError("overlap must be smaller than max_tokens")
+    if count_tokens(text) <= max_tokens:
+        return [text]
+
+    units = []
+    for separator, sentence in _units(text):
+        for i, piece in enumerate(_split_long(sentence, max_tokens)):
+            units.append((separator if i == 0 else " ", piece, count_tokens(piece)))
+
+    chunks = []
+    current: list[tuple[str, str, int]] = []
+    current_tokens = 0
+    for unit in units:
+        if current and current_tokens + unit[2] > max_tokens:
+            chunks.append(current)
+            # carry trailing sentences into the next chunk, within the overlap budget
+            carried: list[tuple[str, str, int]] = []
+            carried_tokens = 0
+            for previous in reversed(current):
+                if carried_tokens + previous[2] > overlap or carried_tokens + previous[2] + unit[2] > max_tokens:
+                    break
+                carried.insert(0, previous)
+                carried_tokens += previous[2]
+            current, current_tokens = carried, carried_tokens
+        current.append(unit)
+        current_tokens += unit[2]
+    if current:
+        chunks.append(current)
+
+    return ["".join((separator if i else "") + sentence for i, (separator, sentence, _) in enumerate(chunk)) for chunk in chunks]
+
+
+def merge_facts(fact_lists: list[list[str]]) -> list[str]:
+    """
+    Merge per-chunk fact lists, dropping duplicates.
+
+    Facts are compared ignoring case, punctuation and whitespace, which
+    catches the repeats produced by chunk overlap. The first wording wins.
+
+    Args:
+        fact_lists (list[list[str]]): The facts of each chunk, in chunk order.
+
+    Returns:
+        list[str]: The merged facts.
+    """
+    seen = set()
+    merged = []
+    for facts in fact_lists:
+        for fact in facts:
+            key = " ".join(_FACT_NORMALIZE.sub(" ", fact.lower()).split())
+            if key not in seen:
+                seen.add(key)
+                merged.append(fact)
+    return merged
+
+
+async def extract_chunked(text: str, extract: Callable[[str], Awaitable[str]], max_tokens: int, overlap: int = 0) -> str:
+    """
+    Extract facts from a long text chunk by chunk and merge them.
+
+    Args:
+        text (str): The text.
+        extract (Callable): Async callable returning the fact completion for a text.
+        max_tokens (int): The token budget per chunk.
+        overlap (int): The token budget for sentences repeated between chunks.
+
+    Returns:
+        str: The merged facts in the extraction format. A text that fits in
+            one chunk is extracted as is.
+    """
+    chunks = split_text(text, max_tokens, overlap)
+    if len(chunks) == 1:
+        return await extract(text)
+
+    completions = await asyncio.gather(*(extract(chunk) for chunk in chunks))
+    return format_facts(merge_facts([parse_facts(completion) for completion in completions]))
@@ -0,0 +1,250 @@
+import asyncio
+import atexit
+import hashlib
+import mmap
+import os
+import struct
+from typing import Iterable
+
+from inspect_ai.dataset import Sample
+from inspect_ai.model import Model, get_model
+
+from inspect_ai_scorers._facts import parse_facts
+
+# File layout: a fixed header, an open-addressed table of fixed-size slots keyed
+# by sample id, then the fact lists themselves as newline-joined UTF-8 blobs.
+_MAGIC = b"FACTIDX2"
+_HEADER = struct.Struct("<8sII16s16s")   # magic, slot count, entry count, prompt digest, model digest
+_SLOT = struct.Struct("<Q16sQI4x")    # sample id hash, target digest, blob offset, blob length
+
+
+def _id_hash(sample_id: str | int) -> int:
+    value = int.from_bytes(hashlib.blake2b(str(sample_id).encode("utf-8"), digest_size=8).digest(), "little")
+    # zero marks an empty slot
+    return value or 1
+
+
+def target_digest(text: str) -> bytes:
+    """
+    Hash a target text for staleness checks.
+
+    Args:
+        text (str): The target text.
+
+    Returns:
+        bytes: A 16 byte digest of the text.
+    """
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+def prompt_digest(prompt: str) -> bytes:
+    """
+    Hash the extraction prompt an index was built with.
+
+    Args:
+        prompt (str): The unformatted extraction prompt.
+
+    Returns:
+        bytes: A 16 byte digest of the prompt.
+    """
+    return hashlib.blake2b(prompt.encode("utf-8"), digest_size=16).digest()
+
+
+def model_digest(model: str) -> bytes:
+    """
+    Hash the name of the fact model an index was built with.
+
+    Args:
+        model (str): The model, e.g. "openai/gpt-4".
+
+    Returns:
+        bytes: A 16 byte digest of the name.
+    """
+    return hashlib.blake2b(model.encode("utf-8"), digest_size=16).digest()
+
+
+def write_fact_index(path: str, entries: Iterable[tuple[str | int, str, list[str]]], prompt: str, model: str) -> None:
+    """
+    Write a fact index file.
+
+    Args:
+        path (str): The file to write.
+        entries (Iterable): (sample id, target text, facts) for each sample.
+        prompt (str): The extraction prompt the facts were produced with.
+        model (str): The model that extracted the facts.
+    """
+    entries = list(entries)
+    slot_count = 1
+    while slot_count < 2 * len(entries):
+        slot_count *= 2
+
+    slots = [None] * slot_count
+    blob = bytearray()
+    for sample_id, target_text, facts in entries:
+        id_hash = _id_hash(sample_id)
+        data = "\n".join(facts).encode("utf-8")
+        slot = id_hash & (slot_count - 1)
+        while slots[slot] is not None and slots[slot][0] != id_hash:
+            slot = (slot + 1) & (slot_count - 1)
+        slots[slot] = (id_hash, target_digest(target_text), len(blob), len(data))
+        blob += data
+
+    data_start = _HEADER.size + slot_count * _SLOT.size
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, slot_count, len(entries), prompt_digest(prompt), model_digest(model)))
+        for slot in slots:
+            if slot is None:
+                f.write(_SLOT.pack(0, b"\0" * 16, 0, 0))
+            else:
+                id_hash, digest, offset, length = slot
+                f.write(_SLOT.pack(id_hash, digest, data_start + offset, length))
+        f.write(blob)
+    os.replace(tmp_path, path)
+
+
+class FactIndex:
+    """
+    A read-only, memory-mapped index of precomputed target facts.
+
+    Lookups hash the sample id into a fixed-size slot table, so finding a
+    sample's facts is O(1) and only touches the pages it needs. An entry is
+    only returned if the stored target hash matches the current target text.
+    The map is released by `close()`, or at exit if it is still open.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open a fact index built by `build_fact_index`.
+
+        Args:
+            path (str): The index file.
+        """
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:len(_MAGIC)] != _MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a fact index")
+        _, self._slot_count, self.entry_count, self.prompt_digest, self.model_digest = _HEADER.unpack_from(self._map, 0)
+        atexit.register(self.close)
+
+    def lookup(self, sample_id: str | int, target_text: str) -> list[str] | None:
+        """
+        Look up the facts for a sample's target.
+
+        Args:
+            sample_id (str | int): The sample id.
+            target_text (str): The sample's current target text.
+
+        Returns:
+            list[str] | None: The facts, or None if the sample is missing or its target changed.
+        """
+        id_hash = _id_hash(sample_id)
+        slot = id_hash & (self._slot_count - 1)
+        while True:
+            stored_hash, digest, offset, length = _SLOT.unpack_from(self._map, _HEADER.size + slot * _SLOT.size)
+            if stored_hash == 0:
+                return None
+            if stored_hash == id_hash:
+                if digest != target_digest(target_text):
+                    return None
+                data = self._map[offset:offset + length].decode("utf-8")
+                return data.split("\n") if data else []
+            slot = (slot + 1) & (self._slot_count - 1)
+
+    def matches_prompt(self, prompt: str) -> bool:
+        """
+        Check whether the index was built with the given extraction prompt.
+
+        Args:
+            prompt (str): The unformatted extraction prompt.
+
+        Returns:
+            bool: True if the prompt is the one the index was built with.
+        """
+        return self.prompt_digest == prompt_digest(prompt)
+
+    def matches_model(self, model: str) -> bool:
+        """
+        Check whether the index was built with the given fact model.
+
+        Args:
+            model (str): The fact model, e.g. "openai/gpt-4".
+
+        Returns:
+            bool: True if the model is the one the index was built with.
+        """
+        return self.model_digest == model_digest(model)
+
+    def close(self) -> None:
+        """
+        Release the memory map and file handle. Closing twice is harmless.
+        """
+        if self._map.closed:
+            return
+        self._map.close()
+        self._file.close()
+        atexit.unregister(self.close)
+
+
+async def build_fact_index_async(dataset: Iterable[Sample], path: str, model: str | Model | None = None, max_concurrency: int = 10) -> int:
+    """
+    Extract the facts of every sample's target and write them to a fact index.
+
+    Each distinct target text is sent through `fact_prompt` once. Samples
+    without an id are keyed by their 1-based position, matching the ids
+    inspect assigns at eval time. The index records the prompt and the
+    model, and `fact_scorer` ignores it if either differs from its own.
+
+    Args:
+        dataset (Iterable[Sample]): The samples to index.
+        path (str): The index file to write.
+        model (str | Model | None): The model used to extract facts.
+        max_concurrency (int): The maximum number of extraction calls in flight.
+
+    Returns:
+        int: The number of samples written.
+    """
+    from inspect_ai_scorers._fact_scorer import fact_prompt
+
+    fact_model = get_model(model)
+
+    samples = []
+    for position, sample in enumerate(dataset):
+        target = sample.target if isinstance(sample.target, str) else "".join(sample.target)
+        sample_id = sample.id if sample.id is not None else position + 1
+        samples.append((sample_id, target))
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def extract(text: str) -> list[str]:
+        async with semaphore:
+            return parse_facts((await fact_model.generate(fact_prompt.format(text=text))).completion)
+
+    texts = list(dict.fromkeys(target for _, target in samples))
+    facts_by_target = dict(zip(texts, await asyncio.gather(*(extract(text) for text in texts))))
+    write_fact_index(
+        path,
+        ((sample_id, target, facts_by_target[target]) for sample_id, target in samples),
+        prompt=fact_prompt,
+        model=str(fact_model),
+    )
+    return len(samples)
+
+
+def build_fact_index(dataset: Iterable[Sample], path: str, model: str | Model | None = None, max_concurrency: int = 10) -> int:
+    """
+    Build a fact index outside an event loop; see `build_fact_index_async`,
+    which is the one to await from async code.
+
+    Args:
+        dataset (Iterable[Sample]): The samples to index.
+        path (str): The index file to write.
+        model (str | Model | None): The model used to extract facts.
+        max_concurrency (int): The maximum number of extraction calls in flight.
+
+    Returns:
+        int: The number of samples written.
+    """
+    return asyncio.run(build_fact_index_async(dataset, path, model, max_concurrency))
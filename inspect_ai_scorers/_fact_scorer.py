@@ -1,8 +1,29 @@
-import json
-from inspect_ai.model import Model, get_model
+import logging
+from typing import Literal
+from inspect_ai.model import ChatMessage, ChatMessageAssistant, ChatMessageUser, GenerateConfig, Model, ModelOutput, get_model
 from inspect_ai.solver import TaskState
 from inspect_ai.scorer import Score, Scorer, Target, mean, scorer, stderr
 
+from inspect_ai_scorers._aggregate import fact_counts, micro_groundedness, micro_thoroughness
+from inspect_ai_scorers._batching import AdaptiveBatcher
+from inspect_ai_scorers._bootstrap import ci_bounds
+from inspect_ai_scorers._cascade import cheap_tier, seeded
+from inspect_ai_scorers._cache import FactCache, cache_key, cached_extraction, resolve_cache
+from inspect_ai_scorers._cassette import Cassette, resolve_cassette
+from inspect_ai_scorers._checkpoint import ScoreCheckpoint, content_hash, resolve_checkpoint
+from inspect_ai_scorers._chunking import extract_chunked
+from inspect_ai_scorers._fact_index import FactIndex
+from inspect_ai_scorers._facts import comparison_from_ids, format_facts, number_facts, parse_facts
+from inspect_ai_scorers._limiter import limited_generate
+from inspect_ai_scorers._metrics import scorer_metrics, start_metrics_server
+from inspect_ai_scorers._parsing import ComparisonResult, FactMatches, extract_json, parse_comparison, parse_matches, parse_with_repair, structured_output_config
+from inspect_ai_scorers._pipeline import StageGraph
+from inspect_ai_scorers._prematch import FactPrematcher, remap_matches
+from inspect_ai_scorers._singleflight import coalesced_generate
+from inspect_ai_scorers._tracing import SampleTrace, ScoreTracer, record_cache_hit, record_output, stage_span, traced, traced_parse
+
+logger = logging.getLogger(__name__)
+
 
 
 fact_prompt = """
@@ -64,6 +85,70 @@ Provide your results in this format:
 }}
 """
 
+compare_ids_prompt = """
+You will be comparing facts between a context and an answer to determine which facts are shared and which are unique to each.
+
+Here are the facts in the context, each with an ID:
+
+<context>
+{context_list}
+</context>
+
+And here are the facts in the answer, each with an ID:
+
+<answer>
+{answer_list}
+</answer>
+
+Carefully analyze the facts presented in the context and answer, focusing on the semantic meaning rather than the exact wording.
+
+Then, output a dictionary with a single key, "matches", whose value is a list of [context ID, answer ID] pairs, one for each context fact and answer fact that express the same fact. Any fact that is not part of a pair is treated as present in only one of the texts.
+
+Remember, the facts do not need to be worded identically to be considered the same. Focus on whether the core meaning is shared or unique.  A fact in the context may be expressed in different terms in the answer, or multiple facts in one may combine to express a single fact in the other; in that case include a pair for each fact involved.
+
+Refer to facts only by their IDs and do not repeat the text of any fact. Provide your results in this format:
+
+{{
+    "matches": [
+        ["C1", "A2"],
+        ["C3", "A1"]
+    ]
+}}
+"""
+
+compare_batch_prompt = """
+You will be comparing facts between a context and an answer for each of several samples, to determine which facts are shared and which are unique to each.
+
+Each sample below has an id and contains a context and an answer, with each fact labelled by an ID:
+
+{samples}
+
+For each sample, carefully analyze the facts presented in its context and answer, focusing on the semantic meaning rather than the exact wording. Only compare facts within the same sample.
+
+Then, output a dictionary with one key per sample id, whose value is a list of [context ID, answer ID] pairs, one for each context fact and answer fact in that sample that express the same fact. Use an empty list for a sample with no shared facts. Any fact that is not part of a pair is treated as present in only one of the texts.
+
+Remember, the facts do not need to be worded identically to be considered the same. Focus on whether the core meaning is shared or unique.  A fact in the context may be expressed in different terms in the answer, or multiple facts in one may combine to express a single fact in the other; in that case include a pair for each fact involved.
+
+Refer to facts only by their IDs and do not repeat the text of any fact. Provide your results in this format:
+
+{{
+    "1": [
+        ["C1", "A2"],
+        ["C3", "A1"]
+    ],
+    "2": []
+}}
+"""
+
+compare_batch_sample_format = """<sample id="{id}">
+<context>
+{context_list}
+</context>
+<answer>
+{answer_list}
+</answer>
+</sample>"""
+
 explanation_format = """
 Facts in Both:
 {facts_in_both}
@@ -75,39 +160,324 @@ Facts only in Context:
 {facts_only_in_context}
 """
 
-@scorer(metrics={"groundedness": [mean(), stderr()], "thoroughness": [mean(), stderr()]})
-def fact_scorer(model: str | Model | None = None) -> Scorer:
+@scorer(metrics={
+    "groundedness": [mean(), stderr(), *ci_bounds(), micro_groundedness()],
+    "thoroughness": [mean(), stderr(), *ci_bounds(), micro_thoroughness()],
+})
+def fact_scorer(model: str | Model | None = None, cache: bool | str | FactCache | None = None, target_index: str | FactIndex | None = None, compare_mode: Literal["text", "ids"] = "text", compare_batch_size: int | None = None, batch_timeout: float = 0.5, prematch: bool | FactPrematcher = False, compare_repairs: int = 1, chunk_tokens: int | None = None, chunk_overlap: int = 0, adaptive_concurrency: bool = False, coalesce_requests: bool = True, cassette: str | Cassette | None = None, tracer: ScoreTracer | None = None, metrics_port: int | None = None, checkpoint: str | ScoreCheckpoint | None = None, cascade_model: str | Model | None = None, cascade_samples: int = 2) -> Scorer:
     
     # TODO: Could add an option to have a separate fact and grader model
     fact_model = get_model(model)
     grader_model = get_model(model)
+    fact_cache = resolve_cache(cache)
+    grader_cassette = resolve_cassette(cassette)
+    score_checkpoint = resolve_checkpoint(checkpoint)
+    if compare_mode not in ("text", "ids"):
+        raise ValueError(f"Unknown compare_mode '{compare_mode}', expected 'text' or 'ids'")
+    if compare_batch_size is not None and compare_batch_size > 1 and compare_mode != "ids":
+        raise ValueError("compare_batch_size requires compare_mode='ids'")
+    if prematch and compare_mode != "ids":
+        raise ValueError("prematch requires compare_mode='ids'")
+    if cascade_model is not None and compare_batch_size is not None and compare_batch_size > 1:
+        raise ValueError("cascade_model can't be combined with compare_batch_size")
+    cheap_model = get_model(cascade_model) if cascade_model is not None else None
+    prematcher = FactPrematcher() if prematch is True else (prematch or None)
+    if metrics_port is not None:
+        start_metrics_server(metrics_port)
+
+    index = FactIndex(target_index) if isinstance(target_index, str) else target_index
+    mismatch = None
+    if index is not None and not index.matches_prompt(fact_prompt):
+        mismatch = "a different fact prompt"
+    elif index is not None and not index.matches_model(str(fact_model)):
+        mismatch = f"a different fact model than {fact_model}"
+    if mismatch is not None:
+        logger.warning(f"Ignoring fact index {index.path}: it was built with {mismatch}")
+        # an index opened from a path here is used by nothing else
+        if isinstance(target_index, str):
+            index.close()
+        index = None
 
     """
     Create a scorer for the fact comparator.
 
     Args:
         model: The AI model used for generating and comparing facts.
+        cache: Cache fact extraction results. True for the default on-disk cache,
+            a path for a cache stored there, or a FactCache instance.
+        target_index: A fact index (or its path) built with `build_fact_index`.
+            Target facts are read from it, falling back to live extraction for
+            samples that are missing or whose target has changed.
+        compare_mode: "text" has the grader write out the shared and unique facts.
+            "ids" numbers the extracted facts and has the grader return only
+            [context ID, answer ID] pairs, rebuilding the comparison locally.
+        compare_batch_size: The largest number of samples whose facts are compared
+            in one grader request (requires compare_mode="ids"). The batch size
+            adapts to parse failures, and samples the batch response doesn't
+            resolve are compared on their own.
+        batch_timeout: Seconds to wait for a compare batch to fill before sending it.
+        prematch: Resolve near-identical fact pairs locally before the grader
+            compare (requires compare_mode="ids"). True for the default
+            thresholds or a FactPrematcher. Only the remaining facts are sent
+            to the grader, and the compare call is skipped if none remain.
+        compare_repairs: How many times to ask the grader to fix a compare
+            response that can't be parsed. Only the compare call is retried.
+        chunk_tokens: Split texts longer than this many tokens at sentence and
+            paragraph boundaries, extract facts from the chunks concurrently and
+            merge them before the compare. None extracts each text in one request.
+        chunk_overlap: Tokens of trailing sentences repeated at the start of
+            the next chunk, so facts spanning a boundary keep their context.
+        adaptive_concurrency: Route every fact and grader call through a limiter
+            shared per model, which grows concurrency while latency is healthy
+            and backs off on throttling. See `grader_limiter_stats()`.
+        coalesce_requests: Share one call between concurrent identical requests
+            (same model, config and prompt), e.g. samples extracting facts from
+            the same target at the same time.
+        cassette: Record fact and grader calls to a file, or replay them from
+            one. A path replays strictly, failing on a request that wasn't
+            recorded; pass a Cassette to record or replay leniently.
+        tracer: Collect each sample's stage spans, to summarize the run or
+            write a trace file. The per-stage wall time, grader calls, tokens,
+            repairs and cache hits are in the score metadata under "stages"
+            either way.
+        metrics_port: Serve live metrics for the scorers in this process
+            (samples scored, grader calls in flight, stage latencies, parse
+            failures, repairs and running score means) in Prometheus format
+            at http://127.0.0.1:<port>/metrics.
+        checkpoint: Record each finished score, with its fact lists, so a
+            rerun after a crash serves the samples already scored instead of
+            calling the grader. A path or a ScoreCheckpoint.
+        cascade_model: A cheaper grader to compare facts with first. The
+            compare is escalated to `model` only when the cheap comparisons
+            can't be trusted: a response that can't be parsed, which isn't
+            repaired, or cheap samples that disagree on the fact counts (or
+            matches, in "ids" mode). Fact extraction stays with `model`. See
+            `cascade_summary` for the savings.
+        cascade_samples: The cheap grader's comparisons per sample, which must
+            agree. Samples after the first get a different seed.
 
     Returns:
         Scorer: The fact comparator scorer.
     """
-    async def score(state: TaskState, target: Target) -> Score:
-        
+    async def generate(model: Model, input: str | list[ChatMessage], config: GenerateConfig | None = None) -> ModelOutput:
+        async def call() -> ModelOutput:
+            # only calls that reach the model count towards the stage's usage
+            with scorer_metrics.grader_call():
+                if adaptive_concurrency:
+                    return record_output(await limited_generate(model, input, config))
+                return record_output(await model.generate(input, config=config or GenerateConfig()))
+
+        async def live() -> ModelOutput:
+            if coalesce_requests:
+                return await coalesced_generate(model, input, config, call)
+            return await call()
+
+        if grader_cassette is not None:
+            return await grader_cassette.generate(model, input, config, live)
+        return await live()
+
+    async def extract_chunk(text: str, cache_stats: dict[str, int]) -> str:
+        async def extract() -> str:
+            return (await generate(fact_model, fact_prompt.format(text=text))).completion
+
+        key = None
+        if fact_cache is not None:
+            key = cache_key(fact_prompt, str(fact_model), fact_model.config.model_dump(exclude_none=True), text)
+        return await cached_extraction(fact_cache, key, extract, cache_stats)
+
+    async def extract_facts(text: str, cache_stats: dict[str, int]) -> str:
+        if chunk_tokens is None:
+            return await extract_chunk(text, cache_stats)
+        return await extract_chunked(text, lambda chunk: extract_chunk(chunk, cache_stats), chunk_tokens, chunk_overlap)
+
+    async def extract_target_facts(target_text: str, sample_id: str | int, stats: dict) -> str:
+        if index is not None:
+            facts = index.lookup(sample_id, target_text)
+            if facts is not None:
+                stats["fact_index"]["hits"] += 1
+                record_cache_hit()
+                return format_facts(facts)
+            stats["fact_index"]["misses"] += 1
+        return await extract_facts(target_text, stats["fact_cache"])
+
+    # Request JSON output from providers that support it; the tolerant parser
+    # and the repair turn cover the rest
+    compare_config = structured_output_config(grader_model, ComparisonResult, "comparison_result")
+    match_config = structured_output_config(grader_model, FactMatches, "fact_matches")
+    if cheap_model is not None:
+        cheap_compare_config = structured_output_config(cheap_model, ComparisonResult, "comparison_result")
+        cheap_match_config = structured_output_config(cheap_model, FactMatches, "fact_matches")
+
+    def as_chat_messages(conversation: list[tuple[str, str]]) -> list[ChatMessage]:
+        return [
+            ChatMessageUser(content=text) if role == "user" else ChatMessageAssistant(content=text)
+            for role, text in conversation
+        ]
+
+    async def generate_compare(conversation: list[tuple[str, str]], config: GenerateConfig, model: Model = grader_model) -> str:
+        return (await generate(model, as_chat_messages(conversation), config)).completion
+
+    async def cascaded(cheap, expensive, same, stats: dict):
+        # cheap comparisons are only trusted if they parse without a repair and agree
+        results, reason, _ = await cheap_tier(
+            [lambda sample=sample: cheap(sample) for sample in range(cascade_samples)],
+            lambda results: None if all(same(results[0], result) for result in results[1:]) else "disagreement",
+        )
+        stats["cascade"] = {"escalated": reason is not None, "reason": reason}
+        if reason is None:
+            return results[0]
+        scorer_metrics.record_escalation("fact_scorer", reason)
+        with stage_span("escalation"):
+            return await expensive()
+
+    async def compare_facts(target_facts: str, answer_facts: str, stats: dict) -> dict:
+        prompt = compare_prompt.format(
+            context_list = target_facts,
+            answer_list = answer_facts
+        )
 
-        # First establish the facts in the target
-        target_facts = await fact_model.generate(fact_prompt.format(text=target.target))
+        async def compare_with(model: Model, config: GenerateConfig, repairs: int) -> dict:
+            comparison = await parse_with_repair(
+                prompt,
+                lambda conversation: generate_compare(conversation, config, model),
+                traced_parse(parse_comparison),
+                max_repairs = repairs,
+                stats = stats["compare"]
+            )
+            return comparison.model_dump()
+
+        if cheap_model is None:
+            return await compare_with(grader_model, compare_config, compare_repairs)
+        return await cascaded(
+            lambda sample: compare_with(cheap_model, seeded(cheap_compare_config, sample), 0),
+            lambda: compare_with(grader_model, compare_config, compare_repairs),
+            lambda first, other: fact_counts(first) == fact_counts(other),
+            stats
+        )
 
-        # Now establish the facts in the answer
-        answer_facts = await fact_model.generate(fact_prompt.format(text=state.output.completion))
+    async def match_ids_with(facts: tuple[list[str], list[str], dict], model: Model, config: GenerateConfig, repairs: int) -> list:
+        context_facts, answer_facts, compare_stats = facts
+        return await parse_with_repair(
+            compare_ids_prompt.format(
+                context_list = number_facts(context_facts, "C"),
+                answer_list = number_facts(answer_facts, "A")
+            ),
+            lambda conversation: generate_compare(conversation, config, model),
+            traced_parse(parse_matches),
+            max_repairs = repairs,
+            stats = compare_stats
+        )
 
-        # Compare the facts
-        compare_result = await grader_model.generate(compare_prompt.format(
-            context_list = target_facts,
-            answer_list = answer_facts
-        ))
+    async def match_fact_ids(facts: tuple[list[str], list[str], dict]) -> list:
+        return await match_ids_with(facts, grader_model, match_config, compare_repairs)
+
+    async def match_fact_ids_batch(batch: list[tuple[list[str], list[str], dict]]) -> list[list | None]:
+        samples = "\n\n".join(
+            compare_batch_sample_format.format(
+                id = i,
+                context_list = number_facts(context_facts, "C"),
+                answer_list = number_facts(answer_facts, "A")
+            )
+            for i, (context_facts, answer_facts, _) in enumerate(batch, 1)
+        )
+        compare_result = await generate(grader_model, compare_batch_prompt.format(samples = samples))
+        matches = traced_parse(extract_json)(compare_result.completion)
+
+        # samples missing from the response are compared on their own
+        return [
+            matches.get(str(i)) if isinstance(matches.get(str(i)), list) else None
+            for i in range(1, len(batch) + 1)
+        ]
+
+    batcher = None
+    if compare_batch_size is not None and compare_batch_size > 1:
+        batcher = AdaptiveBatcher(match_fact_ids_batch, match_fact_ids, max_batch_size=compare_batch_size, flush_timeout=batch_timeout)
+
+    async def compare_fact_ids(target_facts: str, answer_facts: str, stats: dict) -> dict:
+        context_facts = parse_facts(target_facts)
+        answer_facts = parse_facts(answer_facts)
+
+        matches = []
+        context_pending = list(range(len(context_facts)))
+        answer_pending = list(range(len(answer_facts)))
+        if prematcher is not None:
+            prematched = prematcher(context_facts, answer_facts)
+            matches = [[f"C{i + 1}", f"A{j + 1}"] for i, j in prematched.matches]
+            context_pending = prematched.context_pending
+            answer_pending = prematched.answer_pending
+            stats["prematch"] = {
+                "accepted": len(prematched.matches),
+                "rejected": prematched.rejected,
+                "pending": len(context_pending) + len(answer_pending),
+            }
+
+        # Nothing can match if either side has no facts left, so skip the grader
+        if context_pending and answer_pending:
+            pending = (
+                [context_facts[i] for i in context_pending],
+                [answer_facts[j] for j in answer_pending],
+                stats["compare"]
+            )
+            if batcher is not None:
+                pending_matches = await batcher.submit(pending)
+            elif cheap_model is not None:
+                pending_matches = await cascaded(
+                    lambda sample: match_ids_with(pending, cheap_model, seeded(cheap_match_config, sample), 0),
+                    lambda: match_fact_ids(pending),
+                    lambda first, other: sorted(map(str, first)) == sorted(map(str, other)),
+                    stats
+                )
+            else:
+                pending_matches = await match_fact_ids(pending)
+            matches += remap_matches(pending_matches, context_pending, answer_pending)
+
+        return comparison_from_ids(matches, context_facts, answer_facts)
+
+    # Target and answer extraction are independent, so they run concurrently
+    # and only the compare stage waits on both
+    pipeline = StageGraph()
+    pipeline.add("target_facts", traced("target_extraction", extract_target_facts), after=["target_text", "sample_id", "stats"])
+    pipeline.add("answer_facts", traced("answer_extraction", lambda answer_text, stats: extract_facts(answer_text, stats["fact_cache"])), after=["answer_text", "stats"])
+    if compare_mode == "ids":
+        pipeline.add("comparison_result", traced("compare", compare_fact_ids), after=["target_facts", "answer_facts", "stats"])
+    else:
+        pipeline.add("comparison_result", traced("compare", compare_facts), after=["target_facts", "answer_facts", "stats"])
+
+    def checkpoint_settings() -> list:
+        # every prompt and option that can change a score, read when scoring
+        # so that an edited prompt misses the checkpoint
+        return [
+            str(grader_model), compare_mode, compare_repairs, compare_batch_size, chunk_tokens, chunk_overlap,
+            None if prematcher is None else vars(prematcher),
+            str(cheap_model) if cheap_model is not None else None, cascade_samples,
+            fact_prompt, compare_prompt, compare_ids_prompt, compare_batch_prompt, compare_batch_sample_format,
+        ]
+
+    async def score(state: TaskState, target: Target) -> Score:
 
-        # TODO: Validate this result parses
-        comparison_result = json.loads(compare_result.completion)
+        if score_checkpoint is not None:
+            content = content_hash("fact_scorer", *checkpoint_settings(), target.text, state.output.completion)
+            restored = await score_checkpoint.aget(state.sample_id, state.epoch, content)
+            if restored is not None:
+                scorer_metrics.record_score("fact_scorer", restored)
+                return restored
+
+        stats = {
+            "fact_cache": {"hits": 0, "misses": 0},
+            "fact_index": {"hits": 0, "misses": 0},
+            "compare": {"repairs": 0},
+        }
+        trace = SampleTrace(state.sample_id, state.epoch)
+        with trace.activate():
+            results = await pipeline.run(
+                target_text = target.text,
+                answer_text = state.output.completion,
+                sample_id = state.sample_id,
+                stats = stats
+            )
+        if tracer is not None:
+            tracer.add(trace)
+        comparison_result = results["comparison_result"]
 
         # Basic counts for computing values
         facts_in_both_count = len(comparison_result["facts_in_both"])
@@ -130,13 +500,32 @@ def fact_scorer(model: str | Model | None = None) -> Scorer:
           )
         answer = state.output.completion
 
-        return Score(
+        metadata = {"fact_counts": fact_counts(comparison_result)}
+        if fact_cache is not None:
+            metadata["fact_cache"] = stats["fact_cache"]
+        if index is not None:
+            metadata["fact_index"] = stats["fact_index"]
+        if "prematch" in stats:
+            metadata["prematch"] = stats["prematch"]
+        if stats["compare"]["repairs"]:
+            metadata["compare_repairs"] = stats["compare"]["repairs"]
+        if cheap_model is not None:
+            metadata["cascade"] = {"model": str(cheap_model), **stats.get("cascade", {"escalated": False, "reason": None})}
+        metadata["stages"] = trace.stages()
+
+        result = Score(
             value={
                 "groundedness": groundedness,
                 "thoroughness": thoroughness
             },
             answer=answer,
             explanation=explanation,
+            metadata=metadata,
         )
+        scorer_metrics.record_score("fact_scorer", result)
+        if score_checkpoint is not None:
+            facts = {"target_facts": results["target_facts"], "answer_facts": results["answer_facts"], "comparison": comparison_result}
+            score_checkpoint.put(state.sample_id, state.epoch, content, result, facts)
+        return result
 
     return score
\ No newline at end of file
@@ -0,0 +1,138 @@
+import re
+
+_FACTS_BLOCK = re.compile(r"<facts>(.*?)(?:</facts>|$)", re.DOTALL | re.IGNORECASE)
+_LIST_MARKER = re.compile(r"^(?:[-*•]\s+|\d+[.)]\s+)")
+
+
+def parse_facts(text: str) -> list[str]:
+    """
+    Parse a fact extraction completion into a list of facts.
+
+    The extraction prompt asks for one fact per line inside <facts> tags. If the
+    tags are missing the whole completion is treated as the list. Blank lines
+    and leading list markers ("-", "*", "1.") are dropped.
+
+    Args:
+        text (str): The fact model's completion.
+
+    Returns:
+        list[str]: The individual facts, in order.
+    """
+    match = _FACTS_BLOCK.search(text)
+    block = match.group(1) if match else text
+
+    facts = []
+    for line in block.splitlines():
+        line = _LIST_MARKER.sub("", line.strip()).strip()
+        if line:
+            facts.append(line)
+    return facts
+
+
+def format_facts(facts: list[str]) -> str:
+    """
+    Format a list of facts the way the extraction prompt asks the model to.
+
+    Args:
+        facts (list[str]): The facts.
+
+    Returns:
+        str: The facts, one per line, inside <facts> tags.
+    """
+    return "<facts>\n" + "\n".join(facts) + "\n</facts>"
+
+
+def number_facts(facts: list[str], prefix: str) -> str:
+    """
+    Number a list of facts with short IDs so the grader can refer to them.
+
+    Args:
+        facts (list[str]): The facts.
+        prefix (str): The ID prefix, e.g. "C" for context and "A" for answer facts.
+
+    Returns:
+        str: One "<prefix><n>: <fact>" line per fact, numbered from 1.
+    """
+    return "\n".join(f"{prefix}{i}: {fact}" for i, fact in enumerate(facts, 1))
+
+
+def resolve_fact_id(fact_id, prefix: str, count: int) -> int | None:
+    """
+    Resolve a fact ID such as "C3" to a list index.
+
+    Args:
+        fact_id: The ID returned by the grader.
+        prefix (str): The expected ID prefix.
+        count (int): The number of facts numbered with that prefix.
+
+    Returns:
+        int | None: The zero-based index, or None if the ID is malformed or out of range.
+    """
+    fact_id = str(fact_id).strip().upper()
+    if not fact_id.startswith(prefix) or not fact_id[len(prefix):].isdigit():
+        return None
+    position = int(fact_id[len(prefix):]) - 1
+    return position if 0 <= position < count else None
+
+
+def comparison_from_ids(matches: list, context_facts: list[str], answer_facts: list[str]) -> dict[str, list[str]]:
+    """
+    Rebuild a fact comparison from the [context ID, answer ID] pairs returned by the grader.
+
+    Pairs that share a fact are joined into one group, e.g. [C1, A1] and
+    [C2, A1] when the answer combines two context facts into one, and each
+    group contributes one entry to "facts_in_both", as it would in a text
+    mode comparison. A fact is only ever counted once, however many pairs it
+    is in. Facts that appear in no pair are unique to their side, so the
+    grader never has to list them. Pairs with unknown IDs are ignored.
+
+    Args:
+        matches (list): [context ID, answer ID] pairs, e.g. [["C1", "A2"]].
+        context_facts (list[str]): The numbered context facts.
+        answer_facts (list[str]): The numbered answer facts.
+
+    Returns:
+        dict: "facts_in_both", "facts_only_in_answer" and "facts_only_in_context" fact lists.
+    """
+    pairs = []
+    seen = set()
+    for match in matches or []:
+        if not isinstance(match, (list, tuple)) or len(match) != 2:
+            continue
+        context_id = resolve_fact_id(match[0], "C", len(context_facts))
+        answer_id = resolve_fact_id(match[1], "A", len(answer_facts))
+        if context_id is not None and answer_id is not None and (context_id, answer_id) not in seen:
+            seen.add((context_id, answer_id))
+            pairs.append((context_id, answer_id))
+
+    matched_context = {context_id for context_id, _ in pairs}
+    matched_answer = {answer_id for _, answer_id in pairs}
+
+    # union-find over the matched facts, context facts as ("C", i) and answer facts as ("A", j)
+    parent: dict[tuple[str, int], tuple[str, int]] = {}
+
+    def find(node: tuple[str, int]) -> tuple[str, int]:
+        parent.setdefault(node, node)
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    for context_id, answer_id in pairs:
+        parent[find(("C", context_id))] = find(("A", answer_id))
+
+    groups: dict[tuple[str, int], tuple[list[int], list[int]]] = {}
+    for context_id in sorted(matched_context):
+        groups.setdefault(find(("C", context_id)), ([], []))[0].append(context_id)
+    for answer_id in sorted(matched_answer):
+        groups.setdefault(find(("A", answer_id)), ([], []))[1].append(answer_id)
+
+    def shared_fact(context_ids: list[int], answer_ids: list[int]) -> str:
+        texts = [context_facts[i] for i in context_ids] + [answer_facts[j] for j in answer_ids]
+        return " / ".join(dict.fromkeys(texts))
+
+    return {
+        "facts_in_both": [shared_fact(context_ids, answer_ids) for context_ids, answer_ids in groups.values()],
+        "facts_only_in_answer": [fact for i, fact in enumerate(answer_facts) if i not in matched_answer],
+        "facts_only_in_context": [fact for i, fact in enumerate(context_facts) if i not in matched_context],
+    }
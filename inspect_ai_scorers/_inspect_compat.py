@@ -0,0 +1,73 @@
+# inspect has no public API for naming a scorer or computing results from
+# scores outside of an eval, so log rescoring uses the same internals that
+# inspect's own `inspect score` does. They are imported here and nowhere else,
+# and checked against the inspect release they were written for.
+import warnings
+from typing import Any
+
+import inspect_ai
+from inspect_ai.scorer import Score, Scorer
+
+# the inspect release whose internals this module was written against
+TESTED_INSPECT_VERSION = "0.3.28"
+
+try:
+    from inspect_ai._eval.task.results import eval_results
+    from inspect_ai.scorer._metric import SampleScore
+    from inspect_ai.scorer._reducer import create_reducers
+    from inspect_ai.scorer._scorer import unique_scorer_name
+except ImportError as ex:
+    raise ImportError(
+        f"Log rescoring needs inspect_ai {TESTED_INSPECT_VERSION}, whose internals it uses; "
+        f"inspect_ai {inspect_ai.__version__} is installed. Install it with: pip install 'inspect_ai=={TESTED_INSPECT_VERSION}'"
+    ) from ex
+
+if inspect_ai.__version__ != TESTED_INSPECT_VERSION:
+    warnings.warn(
+        f"Log rescoring was tested with inspect_ai {TESTED_INSPECT_VERSION}, not {inspect_ai.__version__}; "
+        "the results it computes may not match inspect's."
+    )
+
+
+def scorer_name(scorer: Scorer) -> str:
+    """
+    Name a scorer's scores as inspect does in a log.
+
+    Args:
+        scorer (Scorer): The scorer.
+
+    Returns:
+        str: The scorer's registered name.
+    """
+    return unique_scorer_name(scorer, [])
+
+
+def sample_score(sample_id: Any, score: Score) -> SampleScore:
+    """
+    Wrap a sample's score for `log_results`.
+
+    Args:
+        sample_id: The sample's id.
+        score (Score): The sample's score.
+
+    Returns:
+        SampleScore: The score as inspect's metrics take it.
+    """
+    return SampleScore(sample_id=sample_id, value=score.value, metadata=score.metadata)
+
+
+def log_results(sample_scores: list[dict[str, SampleScore]], scorer: Scorer, epochs_reducer: Any = None) -> dict:
+    """
+    Compute a log's results from its samples' scores, as inspect does.
+
+    Args:
+        sample_scores (list[dict[str, SampleScore]]): Each sample's scores by
+            scorer name, from `sample_score`.
+        scorer (Scorer): The scorer whose metrics are computed.
+        epochs_reducer: The eval's epochs reducer(s), from its config.
+
+    Returns:
+        dict: The results, as they appear in a JSON log.
+    """
+    results = eval_results(len(sample_scores), sample_scores, create_reducers(epochs_reducer), [scorer], None)
+    return results.model_dump(mode="json", exclude_none=True)
@@ -0,0 +1,14 @@
+# The LangChain bridge is an optional extra. Modules that can run without it
+# import from here inside the functions that need it, so LangChain is only
+# loaded (and only required) when those code paths are used.
+try:
+    from langchain.prompts import PromptTemplate
+    from langchain_core.messages import AIMessage, HumanMessage
+
+    from inspect_ai_scorers.code_from_inspect_ai import InspectChatModel
+except ImportError as ex:
+    raise ImportError(
+        "The fact comparator needs LangChain. Install it with: pip install 'inspect_ai_scorers[langchain]'"
+    ) from ex
+
+__all__ = ["AIMessage", "HumanMessage", "InspectChatModel", "PromptTemplate"]
@@ -0,0 +1,221 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, TypeVar
+
+from inspect_ai.model import ChatMessage, GenerateConfig, Model, ModelOutput
+
+from inspect_ai_scorers._tracing import current_stage
+
+T = TypeVar("T")
+
+
+class AdaptiveLimiter:
+    """
+    An AIMD concurrency limit for calls to one grader model.
+
+    The limit grows additively (by about one per limit's worth of healthy
+    calls) while call latency stays within `latency_tolerance` times the
+    healthy baseline, and is cut multiplicatively when a call is throttled or
+    its latency spikes. inspect retries rate limited requests internally, so
+    throttling usually shows up here as a latency spike rather than an error.
+    Baselines are kept per kind of request (by default the scorer stage
+    making the call), so a long compare isn't taken for a throttled fact
+    extraction. Cuts are at most once per baseline latency, so one burst of
+    429s halves the limit once instead of collapsing it.
+    """
+
+    def __init__(
+        self,
+        initial: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        latency_tolerance: float = 2.0,
+        backoff: float = 0.5,
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            initial (int): The starting concurrency limit.
+            min_limit (int): The lowest the limit is cut to.
+            max_limit (int): The highest the limit grows to.
+            latency_tolerance (float): Latency, as a multiple of the healthy
+                baseline, above which a call counts as throttled.
+            backoff (float): The factor the limit is cut by.
+        """
+        if not 1 <= min_limit <= initial <= max_limit:
+            raise ValueError("expected 1 <= min_limit <= initial <= max_limit")
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_tolerance = latency_tolerance
+        self.backoff = backoff
+
+        self.in_flight = 0
+        self.completed = 0
+        self.errors = 0
+        self.throttle_events = 0
+        self.baselines: dict[str, float] = {}
+
+        self._waiters: deque[asyncio.Future] = deque()
+        self._last_cut = float("-inf")
+
+    async def run(self, call: Callable[[], Awaitable[T]], is_throttle: Callable[[BaseException], bool] | None = None, kind: str | None = None) -> T:
+        """
+        Run a call once a concurrency slot is free, adjusting the limit from its outcome.
+
+        Args:
+            call (Callable): The async call to make.
+            is_throttle (Callable | None): Tells whether an exception is a rate limit error.
+            kind (str | None): The kind of request, whose calls share a
+                latency baseline. Defaults to the open scorer stage.
+
+        Returns:
+            The call's result.
+        """
+        kind = kind or current_stage() or "default"
+        await self._acquire()
+        start = time.monotonic()
+        try:
+            result = await call()
+        except Exception as ex:
+            throttled = is_throttle is not None and is_throttle(ex)
+            self._release(kind, time.monotonic() - start, throttled=throttled, error=not throttled)
+            raise
+        except BaseException:
+            # cancellation says nothing about the grader's health
+            self.in_flight -= 1
+            self._wake()
+            raise
+        self._release(kind, time.monotonic() - start)
+        return result
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Read the limiter's state for monitoring.
+
+        Returns:
+            dict: The current limit, in-flight and queued calls, event counts
+                and the latency baseline of each kind of request.
+        """
+        return {
+            "limit": int(self.limit),
+            "in_flight": self.in_flight,
+            "queued": sum(1 for waiter in self._waiters if not waiter.done()),
+            "completed": self.completed,
+            "errors": self.errors,
+            "throttle_events": self.throttle_events,
+            "baselines": dict(self.baselines),
+        }
+
+    async def _acquire(self) -> None:
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self.in_flight += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except BaseException:
+            if waiter.done() and not waiter.cancelled():
+                # the slot was handed over just as we were cancelled
+                self.in_flight -= 1
+                self._wake()
+            raise
+
+    def _release(self, kind: str, latency: float, throttled: bool = False, error: bool = False) -> None:
+        self.in_flight -= 1
+        self.completed += 1
+
+        baseline = self.baselines.get(kind)
+        slow = baseline is not None and latency > self.latency_tolerance * baseline
+        if throttled or slow:
+            self.throttle_events += 1
+            now = time.monotonic()
+            if now - self._last_cut >= (baseline or latency):
+                self.limit = max(float(self.min_limit), self.limit * self.backoff)
+                self._last_cut = now
+        elif error:
+            self.errors += 1
+        else:
+            self.baselines[kind] = latency if baseline is None else 0.9 * baseline + 0.1 * latency
+            self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+
+        self._wake()
+
+    def _wake(self) -> None:
+        # hand free slots to waiters in arrival order
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self.in_flight += 1
+            waiter.set_result(None)
+
+
+_limiters: dict[str, AdaptiveLimiter] = {}
+
+
+def grader_limiter(model_name: str, max_connections: int | None = None) -> AdaptiveLimiter:
+    """
+    Get the shared limiter for a grader model, creating it on first use.
+
+    Args:
+        model_name (str): The grader model, e.g. "openai/gpt-4".
+        max_connections (int | None): The model's connection limit, which a
+            new limiter starts from and never grows past, as inspect would
+            queue any calls beyond it.
+
+    Returns:
+        AdaptiveLimiter: The model's limiter.
+    """
+    if model_name not in _limiters:
+        if max_connections is None:
+            _limiters[model_name] = AdaptiveLimiter()
+        else:
+            initial = max(1, max_connections)
+            _limiters[model_name] = AdaptiveLimiter(initial=initial, max_limit=initial)
+    return _limiters[model_name]
+
+
+def model_max_connections(model: Model, config: GenerateConfig | None = None) -> int:
+    """
+    Read the connection limit inspect would enforce for a model.
+
+    Args:
+        model (Model): The inspect model.
+        config (GenerateConfig | None): Generate config overrides.
+
+    Returns:
+        int: The configured max_connections, or the provider's default.
+    """
+    return (config and config.max_connections) or model.config.max_connections or model.api.max_connections()
+
+
+def grader_limiter_stats() -> dict[str, dict[str, Any]]:
+    """
+    Read the state of every grader model's limiter.
+
+    Returns:
+        dict: Limiter stats (see AdaptiveLimiter.stats) by model name.
+    """
+    return {model_name: limiter.stats() for model_name, limiter in _limiters.items()}
+
+
+async def limited_generate(model: Model, input: str | list[ChatMessage], config: GenerateConfig | None = None) -> ModelOutput:
+    """
+    Generate with an inspect model through its shared grader limiter.
+
+    Args:
+        model (Model): The grader model.
+        input (str | list[ChatMessage]): The prompt or messages.
+        config (GenerateConfig | None): Generate config overrides.
+
+    Returns:
+        ModelOutput: The model's output.
+    """
+    return await grader_limiter(str(model), model_max_connections(model, config)).run(
+        lambda: model.generate(input, config=config or GenerateConfig()),
+        model.api.is_rate_limit,
+    )
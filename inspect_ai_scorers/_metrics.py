@@ -0,0 +1,243 @@
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator
+
+from inspect_ai.scorer import Score, value_to_float
+
+from inspect_ai_scorers._aggregate import RunningStat
+
+# upper bounds, in seconds, of the stage latency histogram buckets
+STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+_to_float = value_to_float()
+
+
+class Histogram:
+    """
+    A Prometheus-style histogram of observations with fixed bucket bounds.
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = STAGE_BUCKETS):
+        """
+        Initialize an empty histogram.
+
+        Args:
+            buckets (tuple[float, ...]): The sorted bucket upper bounds.
+        """
+        self.buckets = buckets
+        # one count per bucket plus the +Inf bucket, not cumulative
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """
+        Add an observation.
+
+        Args:
+            value (float): The observation.
+        """
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> list[tuple[str, int]]:
+        """
+        Read the cumulative bucket counts as Prometheus reports them.
+
+        Returns:
+            list: (le, count) pairs, ending with "+Inf".
+        """
+        total = 0
+        result = []
+        for bound, count in zip([*map(repr, self.buckets), "+Inf"], self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+
+class ScorerMetrics:
+    """
+    Live counters for the scorers in this process, served in Prometheus text
+    format by `start_metrics_server`.
+
+    Updates are plain attribute and list increments with no locks. Scorers
+    update them from the event loop thread, and the metrics server thread
+    only reads, so a scrape can at worst see one update half applied.
+    """
+
+    def __init__(self):
+        """
+        Initialize zeroed metrics.
+        """
+        self.samples: dict[str, int] = {}
+        self.grader_calls = 0
+        self.grader_calls_in_flight = 0
+        self.grader_errors = 0
+        self.parse_failures = 0
+        self.retries = 0
+        self.escalations: dict[tuple[str, str], int] = {}
+        self.stage_seconds: dict[str, Histogram] = {}
+        self.score_means: dict[tuple[str, str], RunningStat] = {}
+
+    def observe_stage(self, stage: str, seconds: float) -> None:
+        """
+        Record a stage's wall time.
+
+        Args:
+            stage (str): The stage, e.g. "compare".
+            seconds (float): Its wall time.
+        """
+        histogram = self.stage_seconds.get(stage)
+        if histogram is None:
+            histogram = self.stage_seconds[stage] = Histogram()
+        histogram.observe(seconds)
+
+    def record_score(self, scorer: str, score: Score) -> None:
+        """
+        Count a scored sample and fold its values into the running means.
+
+        Args:
+            scorer (str): The scorer, e.g. "fact_scorer".
+            score (Score): The sample's score.
+        """
+        self.samples[scorer] = self.samples.get(scorer, 0) + 1
+        values = score.value if isinstance(score.value, dict) else {"value": score.value}
+        for key, value in values.items():
+            try:
+                value = _to_float(value)
+            except (TypeError, ValueError):
+                continue
+            stat = self.score_means.get((scorer, key))
+            if stat is None:
+                stat = self.score_means[(scorer, key)] = RunningStat()
+            stat.add(value)
+
+    def record_escalation(self, scorer: str, reason: str) -> None:
+        """
+        Count a sample a cascade escalated to its expensive grader.
+
+        Args:
+            scorer (str): The scorer, e.g. "prompt_scorer".
+            reason (str): Why the cheap grader's result wasn't used.
+        """
+        self.escalations[(scorer, reason)] = self.escalations.get((scorer, reason), 0) + 1
+
+    @contextmanager
+    def grader_call(self) -> Iterator[None]:
+        """
+        Count a grader call in flight for the duration of the block.
+        """
+        self.grader_calls += 1
+        self.grader_calls_in_flight += 1
+        try:
+            yield
+        except Exception:
+            self.grader_errors += 1
+            raise
+        finally:
+            self.grader_calls_in_flight -= 1
+
+    def render(self) -> str:
+        """
+        Format the metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: The metrics page.
+        """
+        lines: list[str] = []
+        # copying a dict doesn't run Python code, so it can't interleave with an update
+        samples, stage_seconds, score_means = dict(self.samples), dict(self.stage_seconds), dict(self.score_means)
+        escalations = dict(self.escalations)
+
+        def family(name: str, kind: str, description: str, samples: list[tuple[str, float]]) -> None:
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(f"{name}{labels} {value}" for labels, value in samples)
+
+        family("inspect_scorer_samples_total", "counter", "Samples scored.",
+               [(f'{{scorer="{scorer}"}}', count) for scorer, count in sorted(samples.items())])
+        family("inspect_scorer_grader_calls_total", "counter", "Grader calls made.", [("", self.grader_calls)])
+        family("inspect_scorer_grader_calls_in_flight", "gauge", "Grader calls awaiting a response.", [("", self.grader_calls_in_flight)])
+        family("inspect_scorer_grader_errors_total", "counter", "Grader calls that raised.", [("", self.grader_errors)])
+        family("inspect_scorer_parse_failures_total", "counter", "Grader responses that couldn't be parsed.", [("", self.parse_failures)])
+        family("inspect_scorer_retries_total", "counter", "Repair requests for unparseable responses.", [("", self.retries)])
+        family("inspect_scorer_escalations_total", "counter", "Samples a cascade escalated to its expensive grader.",
+               [(f'{{scorer="{scorer}",reason="{reason}"}}', count) for (scorer, reason), count in sorted(escalations.items())])
+
+        histogram_samples = []
+        for stage, histogram in sorted(stage_seconds.items()):
+            histogram_samples += [(f'_bucket{{stage="{stage}",le="{bound}"}}', count) for bound, count in histogram.cumulative()]
+            histogram_samples += [(f'_sum{{stage="{stage}"}}', histogram.sum), (f'_count{{stage="{stage}"}}', histogram.count)]
+        family("inspect_scorer_stage_seconds", "histogram", "Wall time of each scorer stage.", histogram_samples)
+
+        family("inspect_scorer_score_mean", "gauge", "Running mean of each score value.",
+               [(f'{{scorer="{scorer}",key="{key}"}}', stat.mean) for (scorer, key), stat in sorted(score_means.items())])
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """Zero every metric."""
+        self.__init__()
+
+
+# shared by every scorer in the process
+scorer_metrics = ScorerMetrics()
+
+_servers: dict[tuple[str, int], ThreadingHTTPServer] = {}
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = scorer_metrics.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        # scrapes every few seconds would flood the eval's output
+        pass
+
+
+def start_metrics_server(port: int = 9464, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """
+    Serve the scorer metrics at http://host:port/metrics from a daemon thread.
+
+    Starting a server on a port that already has one returns that server, so
+    every scorer created with the same `metrics_port` shares it.
+
+    Args:
+        port (int): The port, or 0 for any free port.
+        host (str): The interface to listen on.
+
+    Returns:
+        ThreadingHTTPServer: The server; `server_address` has the bound port.
+    """
+    server = _servers.get((host, port))
+    if server is not None:
+        return server
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="scorer-metrics", daemon=True).start()
+    _servers[(host, server.server_address[1] if port == 0 else port)] = server
+    return server
+
+
+def stop_metrics_server(server: ThreadingHTTPServer) -> None:
+    """
+    Stop a metrics server.
+
+    Args:
+        server (ThreadingHTTPServer): The server from `start_metrics_server`.
+    """
+    for key, running in list(_servers.items()):
+        if running is server:
+            del _servers[key]
+    server.shutdown()
+    server.server_close()
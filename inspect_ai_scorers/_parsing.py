@@ -0,0 +1,239 @@
+import ast
+import json
+import re
+from typing import Any, Awaitable, Callable
+
+from inspect_ai.model import GenerateConfig, Model
+from pydantic import BaseModel, Field, ValidationError
+
+from inspect_ai_scorers._metrics import scorer_metrics
+from inspect_ai_scorers._tracing import record_retry
+
+_FENCE = re.compile(r"```(?:json|JSON)?\s*(.*?)```", re.DOTALL)
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+_JSON_TOKEN = re.compile(r"[{}\"'\\]")
+
+# Providers that honour a JSON schema response format in inspect versions that
+# support one (inspect_ai 0.3.28 has no such option, so this is feature-detected)
+_STRUCTURED_OUTPUT_APIS = {"openai", "azureai", "google", "mistral"}
+
+compare_repair_prompt = """
+Your previous response could not be parsed: {error}
+
+Please respond again with only the corrected JSON object, in exactly the format requested and with no other text.
+"""
+
+
+class ComparisonResult(BaseModel):
+    """
+    A Pydantic model for representing the comparison result.
+    """
+    facts_in_both: list[str] = Field(default_factory=list, description="List of facts present in both context and answer")
+    facts_only_in_answer: list[str] = Field(default_factory=list, description="List of facts only present in the answer")
+    facts_only_in_context: list[str] = Field(default_factory=list, description="List of facts only present in the context")
+
+
+class FactMatches(BaseModel):
+    """
+    A Pydantic model for representing an ID-mode comparison result.
+    """
+    matches: list[list[str]] = Field(default_factory=list, description="[context ID, answer ID] pairs of facts present in both context and answer")
+
+
+class ComparisonParseError(ValueError):
+    """
+    Raised when a grader completion doesn't contain a usable comparison.
+    """
+
+
+def _balanced_objects(text: str) -> list[str]:
+    # every balanced {...} span, outermost first, found in one pass with a stack
+    # of open braces. Quotes only start strings inside an object, so an
+    # apostrophe in the prose around it doesn't hide the braces that follow
+    spans = []
+    starts: list[int] = []
+    quote = None
+    skip_to = 0
+    for match in _JSON_TOKEN.finditer(text):
+        i = match.start()
+        if i < skip_to:
+            continue
+        c = text[i]
+        if quote:
+            if c == "\\":
+                skip_to = i + 2
+            elif c == quote:
+                quote = None
+        elif c == "{":
+            starts.append(i)
+        elif not starts:
+            continue
+        elif c == "}":
+            spans.append((starts.pop(), i + 1))
+        elif c in "\"'":
+            quote = c
+    spans.sort()
+    return [text[start:end] for start, end in spans]
+
+
+def _loads(candidate: str) -> Any:
+    try:
+        return json.loads(candidate)
+    except json.JSONDecodeError:
+        pass
+    try:
+        return json.loads(_TRAILING_COMMA.sub(r"\1", candidate))
+    except json.JSONDecodeError:
+        pass
+    # single quoted keys/strings are valid Python literals
+    try:
+        return ast.literal_eval(candidate)
+    except (ValueError, SyntaxError, MemoryError, RecursionError):
+        return None
+
+
+def extract_json(text: str) -> dict:
+    """
+    Extract a JSON object from a noisy model completion.
+
+    Handles markdown code fences, leading or trailing prose, trailing commas
+    and single-quoted strings.
+
+    Args:
+        text (str): The model completion.
+
+    Returns:
+        dict: The first JSON object found in the completion.
+
+    Raises:
+        ComparisonParseError: If the completion contains no JSON object.
+    """
+    candidates = [block for block in _FENCE.findall(text)] + [text]
+    for candidate in candidates:
+        value = _loads(candidate.strip())
+        if isinstance(value, dict):
+            return value
+        for span in _balanced_objects(candidate):
+            value = _loads(span)
+            if isinstance(value, dict):
+                return value
+    raise ComparisonParseError("no JSON object found in the response")
+
+
+def parse_comparison(text: str) -> ComparisonResult:
+    """
+    Parse and validate a text-mode compare completion.
+
+    Args:
+        text (str): The grader's completion.
+
+    Returns:
+        ComparisonResult: The validated comparison.
+
+    Raises:
+        ComparisonParseError: If the completion has no valid comparison object.
+    """
+    data = extract_json(text)
+    if not any(key in data for key in ComparisonResult.model_fields):
+        raise ComparisonParseError(
+            f"expected a JSON object with the keys {', '.join(ComparisonResult.model_fields)}"
+        )
+    try:
+        return ComparisonResult.model_validate(data)
+    except ValidationError as ex:
+        raise ComparisonParseError(f"the JSON object is not a valid comparison: {ex.errors()[0]['msg']}") from ex
+
+
+def parse_matches(text: str) -> list:
+    """
+    Parse and validate an ID-mode compare completion.
+
+    Args:
+        text (str): The grader's completion.
+
+    Returns:
+        list: The [context ID, answer ID] pairs.
+
+    Raises:
+        ComparisonParseError: If the completion has no "matches" list.
+    """
+    data = extract_json(text)
+    matches = data.get("matches")
+    if not isinstance(matches, list):
+        raise ComparisonParseError('expected a JSON object with a "matches" list of [context ID, answer ID] pairs')
+    return matches
+
+
+async def parse_with_repair(
+    prompt: str,
+    generate: Callable[[list[tuple[str, str]]], Awaitable[str]],
+    parse: Callable[[str], Any],
+    max_repairs: int = 1,
+    stats: dict | None = None,
+) -> Any:
+    """
+    Generate a completion and parse it, asking the model to repair unparseable output.
+
+    Only this call is retried: the conversation is extended with the bad
+    completion and a repair request, so earlier pipeline stages never rerun.
+
+    Args:
+        prompt (str): The compare prompt.
+        generate (Callable): Async callable taking a conversation of (role, text)
+            turns, with role "user" or "assistant", and returning the completion.
+        parse (Callable): Parses a completion, raising ComparisonParseError on failure.
+        max_repairs (int): The maximum number of repair requests.
+        stats (dict | None): Updated with the number of "repairs" made.
+
+    Returns:
+        The parsed completion.
+
+    Raises:
+        ComparisonParseError: If the completion still can't be parsed after the repairs.
+    """
+    conversation = [("user", prompt)]
+    completion = await generate(conversation)
+    for attempt in range(max_repairs + 1):
+        try:
+            return parse(completion)
+        except ComparisonParseError as ex:
+            scorer_metrics.parse_failures += 1
+            if attempt == max_repairs:
+                raise
+            if stats is not None:
+                stats["repairs"] = stats.get("repairs", 0) + 1
+            scorer_metrics.retries += 1
+            record_retry()
+            conversation = conversation + [
+                ("assistant", completion),
+                ("user", compare_repair_prompt.format(error=ex)),
+            ]
+            completion = await generate(conversation)
+
+
+def structured_output_config(model: Model, schema: type[BaseModel], name: str) -> GenerateConfig:
+    """
+    Build a generate config requesting JSON output in the given schema, if possible.
+
+    Structured output is only requested when the installed inspect_ai supports
+    a response schema and the model's provider honours it; otherwise an empty
+    config is returned and the tolerant parser does the work.
+
+    Args:
+        model (Model): The grader model.
+        schema (type[BaseModel]): The expected response schema.
+        name (str): A name for the schema.
+
+    Returns:
+        GenerateConfig: The config to merge into the compare request.
+    """
+    if "response_schema" not in GenerateConfig.model_fields:
+        return GenerateConfig()
+    api = str(model).split("/")[0]
+    if api not in _STRUCTURED_OUTPUT_APIS:
+        return GenerateConfig()
+
+    from inspect_ai.model import ResponseSchema
+    from inspect_ai.util import json_schema
+
+    return GenerateConfig(response_schema=ResponseSchema(name=name, json_schema=json_schema(schema)))
@@ -0,0 +1,100 @@
+import asyncio
+from typing import Any, Awaitable, Callable
+
+
+class StageGraph:
+    """
+    A small dependency graph of async stages for the scorer pipeline.
+
+    Each stage is an async callable that receives the results of the stages
+    (or run inputs) it depends on as keyword arguments. Stages whose
+    dependencies are satisfied run concurrently, so independent stages such as
+    target and answer fact extraction overlap and a stage like compare only
+    waits on the stages it names.
+
+    The graph holds no per-run state, so a scorer can build it once and call
+    `run()` for every sample.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty stage graph.
+        """
+        self._stages: dict[str, tuple[Callable[..., Awaitable[Any]], tuple[str, ...]]] = {}
+
+    def add(self, name: str, fn: Callable[..., Awaitable[Any]], after: list[str] | tuple[str, ...] = ()) -> "StageGraph":
+        """
+        Add a stage to the graph.
+
+        Args:
+            name (str): The name of the stage, used as the key of its result.
+            fn (Callable): Async callable invoked with the results of `after` as keyword arguments.
+            after (list[str]): Names of the stages or run inputs this stage depends on.
+
+        Returns:
+            StageGraph: The graph, for chaining.
+        """
+        if name in self._stages:
+            raise ValueError(f"Stage '{name}' is already defined")
+        self._stages[name] = (fn, tuple(after))
+        return self
+
+    def _check(self, inputs: dict[str, Any]) -> None:
+        for name, (_, after) in self._stages.items():
+            for dep in after:
+                if dep not in self._stages and dep not in inputs:
+                    raise ValueError(f"Stage '{name}' depends on unknown stage or input '{dep}'")
+
+        # detect cycles with a depth first walk over stage dependencies
+        visiting: set[str] = set()
+        done: set[str] = set()
+
+        def visit(name: str) -> None:
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Stage graph has a cycle through '{name}'")
+            visiting.add(name)
+            for dep in self._stages[name][1]:
+                if dep in self._stages:
+                    visit(dep)
+            visiting.discard(name)
+            done.add(name)
+
+        for name in self._stages:
+            visit(name)
+
+    async def run(self, **inputs: Any) -> dict[str, Any]:
+        """
+        Run every stage, starting each one as soon as its dependencies complete.
+
+        Args:
+            **inputs: Values that stages can depend on by name.
+
+        Returns:
+            dict: The result of each stage, keyed by stage name.
+        """
+        self._check(inputs)
+
+        tasks: dict[str, asyncio.Task] = {}
+
+        async def run_stage(name: str) -> Any:
+            fn, after = self._stages[name]
+            kwargs = {}
+            for dep in after:
+                kwargs[dep] = await tasks[dep] if dep in self._stages else inputs[dep]
+            return await fn(**kwargs)
+
+        for name in self._stages:
+            tasks[name] = asyncio.ensure_future(run_stage(name))
+
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            # don't leave sibling stages running (and spending tokens) after a failure
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            raise
+
+        return {name: task.result() for name, task in tasks.items()}
@@ -0,0 +1,190 @@
+import re
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from inspect_ai_scorers._facts import resolve_fact_id
+
+_NON_WORD = re.compile(r"[^\w\s.]+")
+_SPACE = re.compile(r"\s+")
+_WORD = re.compile(r"\d+(?:\.\d+)?|\w+")
+
+# Words whose presence or absence doesn't change a fact. Negations are
+# deliberately not in this list.
+_STOP_WORDS = frozenset({
+    "a", "an", "the", "is", "are", "was", "were", "be", "been", "being", "it", "its",
+    "of", "and", "that", "this", "which", "who", "has", "have", "had", "as", "by",
+})
+_HEDGE_WORDS = frozenset({
+    "approximately", "about", "around", "roughly", "nearly", "almost", "circa",
+    "some", "just", "currently", "now", "also",
+})
+
+
+def _normalize(fact: str) -> str:
+    fact = _NON_WORD.sub(" ", fact.lower()).replace(". ", " ").rstrip(".")
+    return _SPACE.sub(" ", fact).strip()
+
+
+def _ngrams(text: str, n: int) -> list[str]:
+    padded = f" {text} "
+    if len(padded) <= n:
+        return [padded]
+    return [padded[i:i + n] for i in range(len(padded) - n + 1)]
+
+
+def similarity_matrix(context_facts: list[str], answer_facts: list[str], n: int = 3) -> np.ndarray:
+    """
+    Compute the character n-gram TF-IDF cosine similarity between two fact lists.
+
+    Args:
+        context_facts (list[str]): The context facts.
+        answer_facts (list[str]): The answer facts.
+        n (int): The n-gram length.
+
+    Returns:
+        np.ndarray: A (len(context_facts), len(answer_facts)) matrix of similarities in [0, 1].
+    """
+    documents = [_ngrams(_normalize(fact), n) for fact in context_facts + answer_facts]
+    if not context_facts or not answer_facts:
+        return np.zeros((len(context_facts), len(answer_facts)))
+
+    vocabulary: dict[str, int] = {}
+    rows = []
+    cols = []
+    for row, grams in enumerate(documents):
+        for gram in grams:
+            rows.append(row)
+            cols.append(vocabulary.setdefault(gram, len(vocabulary)))
+
+    counts = np.zeros((len(documents), len(vocabulary)))
+    np.add.at(counts, (np.asarray(rows), np.asarray(cols)), 1.0)
+
+    document_frequency = np.count_nonzero(counts, axis=0)
+    idf = np.log((1.0 + len(documents)) / (1.0 + document_frequency)) + 1.0
+    weights = counts * idf
+    norms = np.linalg.norm(weights, axis=1, keepdims=True)
+    weights /= np.where(norms == 0, 1.0, norms)
+
+    return weights[:len(context_facts)] @ weights[len(context_facts):].T
+
+
+@dataclass
+class PrematchResult:
+    """
+    The outcome of pre-matching two fact lists.
+    """
+    matches: list[tuple[int, int]] = field(default_factory=list)
+    """(context index, answer index) pairs decided locally as the same fact."""
+
+    context_pending: list[int] = field(default_factory=list)
+    """Indices of context facts still to be compared by the grader."""
+
+    answer_pending: list[int] = field(default_factory=list)
+    """Indices of answer facts still to be compared by the grader."""
+
+    rejected: int = 0
+    """Number of facts decided locally to have no match."""
+
+
+class FactPrematcher:
+    """
+    Resolve obvious fact matches locally before the grader compare.
+
+    Fact pairs whose character n-gram TF-IDF similarity is at least `accept`
+    are matched one-to-one without the grader, as long as their words differ
+    only by stop words and hedges like "approximately". Lexical similarity
+    alone can't tell "taller" from "older" or 20 from 50 degrees, so the word
+    check keeps local matches conservative. Facts whose best similarity to
+    every fact on the other side is below `reject` are decided to be unique.
+    Everything else is left for the grader.
+    """
+
+    def __init__(self, accept: float = 0.6, reject: float | None = None, ngram: int = 3):
+        """
+        Initialize the pre-matcher.
+
+        Args:
+            accept (float): Similarity at or above which a pair is matched locally.
+            reject (float | None): Similarity below which a fact is decided to be unique,
+                or None to leave every unmatched fact to the grader.
+            ngram (int): The character n-gram length.
+        """
+        if reject is not None and reject > accept:
+            raise ValueError("reject threshold must not exceed accept threshold")
+        self.accept = accept
+        self.reject = reject
+        self.ngram = ngram
+
+    def __call__(self, context_facts: list[str], answer_facts: list[str]) -> PrematchResult:
+        """
+        Pre-match two fact lists.
+
+        Args:
+            context_facts (list[str]): The context facts.
+            answer_facts (list[str]): The answer facts.
+
+        Returns:
+            PrematchResult: The local matches and the facts left for the grader.
+        """
+        similarity = similarity_matrix(context_facts, answer_facts, self.ngram)
+
+        context_words = [self._content_words(fact) for fact in context_facts]
+        answer_words = [self._content_words(fact) for fact in answer_facts]
+        candidates = similarity >= self.accept
+        for i, j in zip(*np.nonzero(candidates)):
+            if not (context_words[i] ^ answer_words[j]) <= _HEDGE_WORDS:
+                candidates[i, j] = False
+
+        # accept the most similar candidate pairs first, one-to-one
+        matches = []
+        used_context: set[int] = set()
+        used_answer: set[int] = set()
+        order = np.argsort(-np.where(candidates, similarity, -1.0), axis=None)
+        for flat in order[:int(candidates.sum())]:
+            i, j = np.unravel_index(flat, similarity.shape)
+            if i not in used_context and j not in used_answer:
+                matches.append((int(i), int(j)))
+                used_context.add(int(i))
+                used_answer.add(int(j))
+
+        context_pending = [i for i in range(len(context_facts)) if i not in used_context]
+        answer_pending = [j for j in range(len(answer_facts)) if j not in used_answer]
+
+        rejected = 0
+        if self.reject is not None and similarity.size:
+            best_for_context = similarity.max(axis=1)
+            best_for_answer = similarity.max(axis=0)
+            kept_context = [i for i in context_pending if best_for_context[i] >= self.reject]
+            kept_answer = [j for j in answer_pending if best_for_answer[j] >= self.reject]
+            rejected = len(context_pending) - len(kept_context) + len(answer_pending) - len(kept_answer)
+            context_pending, answer_pending = kept_context, kept_answer
+
+        return PrematchResult(matches=matches, context_pending=context_pending, answer_pending=answer_pending, rejected=rejected)
+
+    @staticmethod
+    def _content_words(fact: str) -> frozenset:
+        return frozenset(_WORD.findall(fact.lower())) - _STOP_WORDS
+
+
+def remap_matches(matches: list, context_pending: list[int], answer_pending: list[int]) -> list[list[str]]:
+    """
+    Translate ID pairs for a pending subset of facts back to IDs in the full lists.
+
+    Args:
+        matches (list): [context ID, answer ID] pairs numbered within the pending subsets.
+        context_pending (list[int]): Full-list indices of the pending context facts.
+        answer_pending (list[int]): Full-list indices of the pending answer facts.
+
+    Returns:
+        list[list[str]]: The pairs renumbered against the full lists; unknown IDs are dropped.
+    """
+    remapped = []
+    for match in matches or []:
+        if not isinstance(match, (list, tuple)) or len(match) != 2:
+            continue
+        context_id = resolve_fact_id(match[0], "C", len(context_pending))
+        answer_id = resolve_fact_id(match[1], "A", len(answer_pending))
+        if context_id is not None and answer_id is not None:
+            remapped.append([f"C{context_pending[context_id] + 1}", f"A{answer_pending[answer_id] + 1}"])
+    return remapped
@@ -0,0 +1,353 @@
+import argparse
+import asyncio
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Iterator
+
+from inspect_ai.model import ChatMessage, ModelName, ModelOutput
+from inspect_ai.scorer import Scorer, Target
+from inspect_ai.solver import TaskState
+import json_stream
+from pydantic import TypeAdapter
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_MESSAGES = TypeAdapter(list[ChatMessage])
+
+
+def _loads(data: bytes) -> Any:
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # inspect writes NaN and Infinity, which only the json module reads
+            pass
+    return json.loads(data)
+
+
+def _dumps(value: Any) -> bytes:
+    # indented like inspect's own logs
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_INDENT_2)
+    return json.dumps(value, indent=2).encode("utf-8")
+
+
+class LogReader:
+    """
+    Stream the fields and samples of an inspect JSON eval log.
+
+    The log is read with json-stream, as inspect reads log headers, so only
+    one sample is held in memory at a time however large the log is.
+    json-stream can't read the NaN and Infinity that inspect may write; a
+    log containing them is decoded whole instead, picking up after the
+    items already yielded.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize the reader.
+
+        Args:
+            path (str): The log file.
+        """
+        self.path = path
+        self._file = open(path, "rb")
+
+    def __enter__(self) -> "LogReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the log file."""
+        self._file.close()
+
+    def items(self) -> Iterator[tuple[str, Any]]:
+        """
+        Iterate over the log's top-level fields in file order.
+
+        Yields:
+            (key, value) pairs, except that each sample is yielded on its own
+            as a ("sample", dict) pair instead of one ("samples", list).
+        """
+        yielded = 0
+        try:
+            for item in self._stream():
+                yield item
+                yielded += 1
+        except ValueError as ex:
+            if "Invalid JSON character" not in str(ex):
+                raise
+            self._file.seek(0)
+            for index, item in enumerate(self._decoded()):
+                if index >= yielded:
+                    yield item
+
+    def _stream(self) -> Iterator[tuple[str, Any]]:
+        log = json_stream.load(self._file)
+        if not isinstance(log, json_stream.base.StreamingJSONObject):
+            raise ValueError(f"{self.path} is not a JSON eval log")
+        for key, value in log.items():
+            if key == "samples" and isinstance(value, json_stream.base.StreamingJSONList):
+                for sample in value:
+                    yield "sample", json_stream.to_standard_types(sample)
+            else:
+                yield key, json_stream.to_standard_types(value)
+
+    def _decoded(self) -> Iterator[tuple[str, Any]]:
+        log = _loads(self._file.read())
+        if not isinstance(log, dict):
+            raise ValueError(f"{self.path} is not a JSON eval log")
+        for key, value in log.items():
+            if key == "samples" and isinstance(value, list):
+                for sample in value:
+                    yield "sample", sample
+            else:
+                yield key, value
+
+
+def sample_state(sample: dict, model: str) -> tuple[TaskState, Target]:
+    """
+    Rebuild the task state and target of a logged sample for scoring.
+
+    The sample's transcript isn't decoded, as scorers don't read it.
+
+    Args:
+        sample (dict): The sample as decoded from the log.
+        model (str): The evaluated model, from the log's eval spec.
+
+    Returns:
+        tuple[TaskState, Target]: The state, with the stored completion, and the target.
+    """
+    sample_input = sample["input"]
+    if isinstance(sample_input, list):
+        sample_input = _MESSAGES.validate_python(sample_input)
+    state = TaskState(
+        model=ModelName(model),
+        sample_id=sample["id"],
+        epoch=sample["epoch"],
+        input=sample_input,
+        messages=_MESSAGES.validate_python(sample.get("messages") or []),
+        choices=sample.get("choices"),
+        output=ModelOutput.model_validate(sample["output"]),
+        completed=True,
+        metadata=sample.get("metadata") or {},
+    )
+    return state, Target(sample["target"])
+
+
+async def rescore_log_async(log_file: str, scorer: Scorer, output_file: str, max_concurrency: int = 16) -> dict[str, Any]:
+    """
+    Score the stored completions of an eval log again and write a new log.
+
+    Samples are streamed from the log, scored with at most `max_concurrency`
+    in flight and written to the new log in their original order, so memory
+    stays bounded by the concurrency rather than the log size. Each sample's
+    scores are replaced by the new scorer's, and the results are recomputed
+    from them; the rest of the log is copied unchanged.
+
+    Args:
+        log_file (str): The eval log (inspect's JSON format).
+        scorer (Scorer): The scorer, e.g. `fact_scorer(model)`.
+        output_file (str): Where to write the rescored log.
+        max_concurrency (int): The most samples scored at once.
+
+    Returns:
+        dict: The input and output paths and the number of samples rescored.
+    """
+    # inspect's own log rescoring (inspect_ai.score) works the same way, but
+    # holds the whole log in memory
+    from inspect_ai_scorers import _inspect_compat
+
+    scorer_name = _inspect_compat.scorer_name(scorer)
+    header: dict[str, Any] = {}
+    sample_scores: list[dict[str, _inspect_compat.SampleScore]] = []
+    pending: deque[tuple[dict, asyncio.Task]] = deque()
+
+    os.makedirs(os.path.dirname(os.path.abspath(output_file)), exist_ok=True)
+    partial_file = output_file + ".partial"
+    output = open(partial_file, "wb")
+    fields_written = 0
+    samples_open = False
+
+    def write_key(key: str) -> None:
+        nonlocal fields_written
+        output.write((b",\n" if fields_written else b"{\n") + _dumps(key) + b": ")
+        fields_written += 1
+
+    def write_field(key: str, value: Any) -> None:
+        write_key(key)
+        output.write(_dumps(value))
+
+    async def write_next() -> None:
+        nonlocal samples_open
+        sample, task = pending.popleft()
+        score = await task
+        sample["scores"] = {scorer_name: score.model_dump(exclude_none=True)}
+        if samples_open:
+            output.write(b",\n")
+        else:
+            write_key("samples")
+            output.write(b"[\n")
+            samples_open = True
+        output.write(_dumps(sample))
+        sample_scores.append({scorer_name: _inspect_compat.sample_score(sample["id"], score)})
+
+    async def finish_samples() -> None:
+        nonlocal samples_open
+        while pending:
+            await write_next()
+        if samples_open:
+            output.write(b"\n]")
+            samples_open = False
+
+    try:
+        with LogReader(log_file) as reader:
+            for key, value in reader.items():
+                if key != "sample":
+                    await finish_samples()
+                    header[key] = value
+                    # results and stats are recomputed or copied at the end
+                    if key not in ("results", "stats"):
+                        write_field(key, value)
+                    continue
+
+                if "eval" not in header:
+                    raise ValueError(f"{log_file} has samples before its eval spec")
+                state, target = sample_state(value, header["eval"]["model"])
+                pending.append((value, asyncio.create_task(scorer(state, target))))
+                if len(pending) >= max_concurrency:
+                    await write_next()
+        await finish_samples()
+
+        epochs_reducer = header["eval"].get("config", {}).get("epochs_reducer")
+        write_field("results", _inspect_compat.log_results(sample_scores, scorer, epochs_reducer))
+        if "stats" in header:
+            write_field("stats", header["stats"])
+        output.write(b"\n}\n")
+        output.close()
+    except BaseException:
+        for _, task in pending:
+            task.cancel()
+        output.close()
+        os.remove(partial_file)
+        raise
+
+    os.replace(partial_file, output_file)
+    return {"log_file": log_file, "output_file": output_file, "samples": len(sample_scores)}
+
+
+def build_scorer(name: str, **scorer_args: Any) -> Scorer:
+    """
+    Create one of this package's scorers by name.
+
+    Args:
+        name (str): "fact_scorer" or "prompt_scorer".
+        **scorer_args: Arguments for the scorer, e.g. model="openai/gpt-4".
+
+    Returns:
+        Scorer: The scorer.
+    """
+    if name == "fact_scorer":
+        from inspect_ai_scorers._fact_scorer import fact_scorer
+        return fact_scorer(**scorer_args)
+    if name == "prompt_scorer":
+        from inspect_ai_scorers.prompt_evaluator import prompt_scorer
+        return prompt_scorer(**scorer_args)
+    raise ValueError(f"Unknown scorer '{name}', expected 'fact_scorer' or 'prompt_scorer'")
+
+
+def _rescore_in_worker(log_file: str, scorer: str, scorer_args: dict[str, Any], output_file: str, max_concurrency: int) -> dict[str, Any]:
+    # scorers are closures, so each worker builds its own
+    return asyncio.run(rescore_log_async(log_file, build_scorer(scorer, **scorer_args), output_file, max_concurrency))
+
+
+def rescore_log(log_file: str, scorer: str, output_file: str, scorer_args: dict[str, Any] | None = None, max_concurrency: int = 16) -> dict[str, Any]:
+    """
+    Rescore one eval log with one of this package's scorers.
+
+    Args:
+        log_file (str): The eval log.
+        scorer (str): "fact_scorer" or "prompt_scorer".
+        output_file (str): Where to write the rescored log.
+        scorer_args (dict | None): Arguments for the scorer, e.g. {"model": "openai/gpt-4"}.
+        max_concurrency (int): The most samples scored at once.
+
+    Returns:
+        dict: The input and output paths and the number of samples rescored.
+    """
+    return _rescore_in_worker(log_file, scorer, scorer_args or {}, output_file, max_concurrency)
+
+
+def find_logs(log_dir: str) -> list[str]:
+    """
+    Find the JSON eval logs under a directory.
+
+    Args:
+        log_dir (str): The log directory.
+
+    Returns:
+        list[str]: The log paths, sorted.
+    """
+    logs = []
+    for root, _, files in os.walk(log_dir):
+        logs.extend(os.path.join(root, name) for name in files if name.endswith(".json") and name != "logs.json")
+    return sorted(logs)
+
+
+def rescore_logs(log_dir: str, scorer: str, output_dir: str, scorer_args: dict[str, Any] | None = None, max_concurrency: int = 16, workers: int | None = None) -> list[dict[str, Any]]:
+    """
+    Rescore every eval log under a directory, one log per worker process.
+
+    Each log's samples are decoded and scored in its worker, so decoding
+    large logs runs in parallel and each worker has its own event loop and
+    grader concurrency.
+
+    Args:
+        log_dir (str): The log directory.
+        scorer (str): "fact_scorer" or "prompt_scorer".
+        output_dir (str): Where to write the rescored logs, keeping their
+            paths relative to `log_dir`.
+        scorer_args (dict | None): Arguments for the scorer, e.g. {"model": "openai/gpt-4"}.
+        max_concurrency (int): The most samples scored at once in each worker.
+        workers (int | None): Worker processes, defaulting to one per CPU.
+            1 rescores the logs in this process.
+
+    Returns:
+        list[dict]: The input and output paths and sample count of each log.
+    """
+    if os.path.abspath(output_dir).startswith(os.path.join(os.path.abspath(log_dir), "")):
+        raise ValueError("output_dir must be outside log_dir, or reruns would rescore the rescored logs")
+
+    jobs = [
+        (log_file, scorer, scorer_args or {}, os.path.join(output_dir, os.path.relpath(log_file, log_dir)), max_concurrency)
+        for log_file in find_logs(log_dir)
+    ]
+    if workers == 1 or len(jobs) <= 1:
+        return [_rescore_in_worker(*job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_rescore_in_worker, *zip(*jobs)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rescore the stored completions in inspect eval logs.")
+    parser.add_argument('log_dir', type=str, help='The directory of eval logs to rescore.')
+    parser.add_argument('output_dir', type=str, help='The directory to write the rescored logs to.')
+    parser.add_argument('--scorer', type=str, default='fact_scorer', choices=['fact_scorer', 'prompt_scorer'], help='The scorer to apply.')
+    parser.add_argument('--model', type=str, default='openai/gpt-4', help='The grader model.')
+    parser.add_argument('--max_concurrency', type=int, default=16, help='The most samples scored at once in each worker.')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (defaults to one per CPU).')
+    args = parser.parse_args()
+
+    for result in rescore_logs(args.log_dir, args.scorer, args.output_dir, {"model": args.model}, args.max_concurrency, args.workers):
+        print(f"{result['log_file']} -> {result['output_file']} ({result['samples']} samples)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+import asyncio
+import hashlib
+import json
+from typing import Any, Awaitable, Callable, TypeVar
+
+from inspect_ai.model import ChatMessage, GenerateConfig, Model, ModelOutput
+
+T = TypeVar("T")
+
+
+def request_payload(model_name: str, config: dict[str, Any] | None, input: Any) -> list:
+    """
+    Describe a model request as plain JSON-serializable values.
+
+    Args:
+        model_name (str): The model, e.g. "openai/gpt-4".
+        config (dict | None): The generate config fields that were set.
+        input: The prompt, or a list of messages (pydantic models or plain values).
+
+    Returns:
+        list: The model, config and input.
+    """
+    if isinstance(input, list):
+        input = [message.model_dump(exclude_none=True) if hasattr(message, "model_dump") else message for message in input]
+    return [model_name, config or {}, input]
+
+
+def request_key(model_name: str, config: dict[str, Any] | None, input: Any) -> str:
+    """
+    Build the key identifying a model request for de-duplication.
+
+    Args:
+        model_name (str): The model, e.g. "openai/gpt-4".
+        config (dict | None): The generate config fields that were set.
+        input: The prompt, or a list of messages (pydantic models or plain values).
+
+    Returns:
+        str: A hex digest of the model, config and input.
+    """
+    payload = json.dumps(request_payload(model_name, config, input), sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def inspect_request(model: Model, input: str | list[ChatMessage], config: GenerateConfig | None) -> tuple[str, dict[str, Any], str | list[ChatMessage]]:
+    """
+    Resolve the model name and effective config of an inspect model request.
+
+    Args:
+        model (Model): The model being called.
+        input (str | list[ChatMessage]): The prompt or messages.
+        config (GenerateConfig | None): Generate config overrides for the call.
+
+    Returns:
+        tuple: The (model_name, config, input) arguments for `request_key`.
+    """
+    effective_config = model.config.merge(config or GenerateConfig())
+    return str(model), effective_config.model_dump(exclude_none=True), input
+
+
+class SingleFlight:
+    """
+    Share one in-flight call between concurrent callers making the same request.
+
+    The first caller for a key starts the call; callers arriving with the same
+    key before it finishes wait on it and receive its result (or exception).
+    Nothing is kept once the call finishes, so this never serves stale
+    results; the fact cache is what persists extractions.
+
+    One caller being cancelled doesn't fail the others, but once every
+    caller waiting on a call has been cancelled the call is cancelled too,
+    so an abandoned request stops spending tokens.
+    """
+
+    def __init__(self):
+        self._calls: dict[str, asyncio.Future] = {}
+        self._waiting: dict[asyncio.Future, int] = {}
+
+        # counters for monitoring
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, call: Callable[[], Awaitable[T]]) -> T:
+        """
+        Make a call, or join the identical call already in flight.
+
+        Args:
+            key (str): The request key (see `request_key`).
+            call (Callable): The async call to make.
+
+        Returns:
+            The call's result.
+        """
+        loop = asyncio.get_running_loop()
+        in_flight = self._calls.get(key)
+        if in_flight is not None and not in_flight.done() and in_flight.get_loop() is loop:
+            self.coalesced += 1
+            return await self._wait(in_flight)
+
+        self.calls += 1
+        task = loop.create_task(call())
+        self._calls[key] = task
+
+        def forget(done: asyncio.Future) -> None:
+            if self._calls.get(key) is done:
+                del self._calls[key]
+
+        task.add_done_callback(forget)
+        return await self._wait(task)
+
+    async def _wait(self, task: asyncio.Future) -> Any:
+        self._waiting[task] = self._waiting.get(task, 0) + 1
+        try:
+            # shielded so one caller's cancellation doesn't fail the others
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._waiting.get(task) == 1 and not task.done():
+                task.cancel()
+            raise
+        finally:
+            self._waiting[task] -= 1
+            if not self._waiting[task]:
+                del self._waiting[task]
+
+    def stats(self) -> dict[str, int]:
+        """
+        Read the call counters for monitoring.
+
+        Returns:
+            dict: The calls made and the requests that joined one in flight.
+        """
+        return {"calls": self.calls, "coalesced": self.coalesced, "in_flight": len(self._calls)}
+
+
+# shared by every scorer in the process so identical requests from different
+# samples, epochs and scorers coalesce
+grader_flights = SingleFlight()
+
+
+async def coalesced_generate(model: Model, input: str | list[ChatMessage], config: GenerateConfig | None, call: Callable[[], Awaitable[ModelOutput]]) -> ModelOutput:
+    """
+    Make an inspect model call, joining an identical request already in flight.
+
+    Args:
+        model (Model): The model being called.
+        input (str | list[ChatMessage]): The prompt or messages.
+        config (GenerateConfig | None): Generate config overrides for the call.
+        call (Callable): Async callable making the request.
+
+    Returns:
+        ModelOutput: The model's output, shared with the other callers.
+    """
+    return await grader_flights.do(request_key(*inspect_request(model, input, config)), call)
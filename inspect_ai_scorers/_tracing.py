@@ -0,0 +1,362 @@
+import json
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from itertools import count
+from typing import Any, Awaitable, Callable, Iterable, Iterator, Literal, TypeVar
+
+import numpy as np
+from inspect_ai.model import ModelOutput
+from inspect_ai.scorer import Score
+
+from inspect_ai_scorers._metrics import scorer_metrics
+
+T = TypeVar("T")
+
+# counters kept for every span, and the per-stage summary of each in score metadata
+SPAN_COUNTERS = ("calls", "input_tokens", "output_tokens", "retries", "cache_hits")
+
+_span_ids = count(1)
+
+
+@dataclass
+class Span:
+    """
+    The wall time and grader usage of one scorer stage for one sample.
+    """
+    name: str
+    start: float
+    parent: "Span | None" = None
+    seconds: float = 0.0
+    calls: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    retries: int = 0
+    cache_hits: int = 0
+    span_id: int = field(default_factory=lambda: next(_span_ids))
+
+
+_current_trace: ContextVar["SampleTrace | None"] = ContextVar("scorer_trace", default=None)
+_current_span: ContextVar[Span | None] = ContextVar("scorer_span", default=None)
+
+
+class SampleTrace:
+    """
+    The spans of one sample's scoring.
+
+    Scorers activate a trace around scoring a sample. Stages run inside it
+    open spans with `stage_span`, and model calls, repairs and cache hits
+    made while a span is open are counted on it. Spans started by
+    concurrent stages inherit the trace through the task context.
+    """
+
+    def __init__(self, sample_id: str | int | None = None, epoch: int | None = None):
+        """
+        Initialize an empty trace.
+
+        Args:
+            sample_id (str | int | None): The sample scored.
+            epoch (int | None): The sample's epoch.
+        """
+        self.sample_id = sample_id
+        self.epoch = epoch
+        self.root = Span("score", time.time())
+        self.spans: list[Span] = []
+
+    @contextmanager
+    def activate(self) -> Iterator["SampleTrace"]:
+        """
+        Record the stages run in this context on the trace, timing the whole.
+        """
+        trace_token = _current_trace.set(self)
+        span_token = _current_span.set(self.root)
+        started = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.root.seconds = time.perf_counter() - started
+            _current_span.reset(span_token)
+            _current_trace.reset(trace_token)
+
+    def stages(self) -> dict[str, dict[str, float]]:
+        """
+        Total the spans of each stage, for score metadata.
+
+        Returns:
+            dict: Each stage's wall time in seconds and counters, summed over
+                its spans (a chunked extraction or a repaired compare has several).
+        """
+        stages: dict[str, dict[str, float]] = {}
+        for span in self.spans:
+            totals = stages.setdefault(span.name, {"seconds": 0.0, **dict.fromkeys(SPAN_COUNTERS, 0)})
+            totals["seconds"] += span.seconds
+            for counter in SPAN_COUNTERS:
+                totals[counter] += getattr(span, counter)
+        return stages
+
+
+@contextmanager
+def stage_span(name: str) -> Iterator[Span | None]:
+    """
+    Time a stage of the active trace. Without an active trace nothing is recorded.
+
+    Args:
+        name (str): The stage, e.g. "compare".
+
+    Yields:
+        Span | None: The open span.
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield None
+        return
+    span = Span(name, time.time(), parent=_current_span.get())
+    token = _current_span.set(span)
+    started = time.perf_counter()
+    try:
+        yield span
+    finally:
+        span.seconds = time.perf_counter() - started
+        _current_span.reset(token)
+        trace.spans.append(span)
+        scorer_metrics.observe_stage(name, span.seconds)
+
+
+def current_stage() -> str | None:
+    """
+    Name the innermost open stage of the active trace.
+
+    Returns:
+        str | None: The stage, or None outside a stage.
+    """
+    span = _current_span.get()
+    if span is None or span.parent is None:
+        return None
+    return span.name
+
+
+def traced(name: str, fn: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+    """
+    Wrap an async stage so each call runs in a span.
+
+    Args:
+        name (str): The stage.
+        fn (Callable): The async stage.
+
+    Returns:
+        Callable: The wrapped stage.
+    """
+    async def run(*args: Any, **kwargs: Any) -> T:
+        with stage_span(name):
+            return await fn(*args, **kwargs)
+    return run
+
+
+def traced_parse(parse: Callable[[str], T]) -> Callable[[str], T]:
+    """
+    Wrap a completion parser so each call runs in a "parse" span.
+
+    Args:
+        parse (Callable): The parser.
+
+    Returns:
+        Callable: The wrapped parser.
+    """
+    def run(completion: str) -> T:
+        with stage_span("parse"):
+            return parse(completion)
+    return run
+
+
+def record_call(input_tokens: int = 0, output_tokens: int = 0) -> None:
+    """
+    Count a model call and its token usage on the open span, if any.
+
+    Args:
+        input_tokens (int): The call's input tokens.
+        output_tokens (int): The call's output tokens.
+    """
+    span = _current_span.get()
+    if span is not None:
+        span.calls += 1
+        span.input_tokens += input_tokens
+        span.output_tokens += output_tokens
+
+
+def record_output(output: ModelOutput) -> ModelOutput:
+    """
+    Count an inspect model call on the open span, with the usage it reports.
+
+    Args:
+        output (ModelOutput): The call's output.
+
+    Returns:
+        ModelOutput: The output, unchanged.
+    """
+    usage = output.usage
+    record_call(usage.input_tokens if usage else 0, usage.output_tokens if usage else 0)
+    return output
+
+
+def record_retry() -> None:
+    """Count a repair request on the open span, if any."""
+    span = _current_span.get()
+    if span is not None:
+        span.retries += 1
+
+
+def record_cache_hit() -> None:
+    """Count an extraction served from a cache or index on the open span, if any."""
+    span = _current_span.get()
+    if span is not None:
+        span.cache_hits += 1
+
+
+def stage_summary(stages: Iterable[dict[str, dict[str, float]]]) -> dict[str, dict[str, float]]:
+    """
+    Roll per-sample stage metadata up into run-level figures.
+
+    Args:
+        stages: The "stages" metadata of each sample's score.
+
+    Returns:
+        dict: For each stage, the samples that ran it, their total, mean, p50
+            and p95 wall time in seconds, and the summed counters.
+    """
+    per_stage: dict[str, list[dict[str, float]]] = {}
+    for sample_stages in stages:
+        for name, totals in (sample_stages or {}).items():
+            per_stage.setdefault(name, []).append(totals)
+
+    summary = {}
+    for name, samples in per_stage.items():
+        seconds = np.fromiter((totals.get("seconds", 0.0) for totals in samples), dtype=float)
+        summary[name] = {
+            "samples": len(samples),
+            "seconds": float(seconds.sum()),
+            "mean_seconds": float(seconds.mean()),
+            "p50_seconds": float(np.percentile(seconds, 50)),
+            "p95_seconds": float(np.percentile(seconds, 95)),
+            **{counter: int(sum(totals.get(counter, 0) for totals in samples)) for counter in SPAN_COUNTERS},
+        }
+    return summary
+
+
+def score_stage_summary(scores: Iterable[Score]) -> dict[str, dict[str, float]]:
+    """
+    Roll the stage metadata of scores up into run-level figures, e.g. for the
+    scores in an eval log.
+
+    Args:
+        scores: The scores.
+
+    Returns:
+        dict: The per-stage summary (see `stage_summary`).
+    """
+    return stage_summary((score.metadata or {}).get("stages") for score in scores)
+
+
+class ScoreTracer:
+    """
+    Collect the traces of every sample a scorer scores, to summarize the run
+    and export the spans as a trace file.
+
+    Pass one to a scorer's `tracer` argument, run the eval, then call
+    `summary()` or `write()`.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty tracer.
+        """
+        self.traces: list[SampleTrace] = []
+
+    def __len__(self) -> int:
+        return len(self.traces)
+
+    def add(self, trace: SampleTrace) -> None:
+        """
+        Add a finished sample trace.
+
+        Args:
+            trace (SampleTrace): The trace.
+        """
+        self.traces.append(trace)
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """
+        Roll the collected traces up into run-level figures.
+
+        Returns:
+            dict: The per-stage summary (see `stage_summary`).
+        """
+        return stage_summary(trace.stages() for trace in self.traces)
+
+    def write(self, path: str, format: Literal["chrome", "otlp"] = "chrome") -> None:
+        """
+        Export the collected spans.
+
+        Args:
+            path (str): The trace file.
+            format (str): "chrome" for the Trace Event format read by Perfetto
+                and chrome://tracing, or "otlp" for OpenTelemetry's OTLP/JSON.
+        """
+        if format == "chrome":
+            document = self._chrome_trace()
+        elif format == "otlp":
+            document = self._otlp_trace()
+        else:
+            raise ValueError(f"Unknown trace format '{format}', expected 'chrome' or 'otlp'")
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(document, file)
+
+    def _spans(self) -> Iterator[tuple[int, SampleTrace, Span]]:
+        for number, trace in enumerate(self.traces, 1):
+            yield number, trace, trace.root
+            for span in trace.spans:
+                yield number, trace, span
+
+    def _chrome_trace(self) -> dict:
+        # async begin/end pairs, as concurrent stages of a sample overlap
+        events = []
+        pid = os.getpid()
+        for number, trace, span in self._spans():
+            args = {counter: getattr(span, counter) for counter in SPAN_COUNTERS}
+            args.update(sample_id=trace.sample_id, epoch=trace.epoch)
+            start = span.start * 1e6
+            common = {"name": span.name, "cat": "scorer", "id": number, "pid": pid, "tid": number}
+            events.append({**common, "ph": "b", "ts": start, "args": args})
+            events.append({**common, "ph": "e", "ts": start + span.seconds * 1e6})
+        events.sort(key=lambda event: event["ts"])
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def _otlp_trace(self) -> dict:
+        def attribute(key: str, value: Any) -> dict:
+            if isinstance(value, int) and not isinstance(value, bool):
+                return {"key": key, "value": {"intValue": str(value)}}
+            return {"key": key, "value": {"stringValue": str(value)}}
+
+        spans = []
+        for number, trace, span in self._spans():
+            attributes = [attribute(counter, getattr(span, counter)) for counter in SPAN_COUNTERS]
+            attributes += [attribute("sample_id", trace.sample_id), attribute("epoch", trace.epoch)]
+            otlp_span = {
+                "traceId": f"{os.getpid():016x}{number:016x}",
+                "spanId": f"{span.span_id:016x}",
+                "name": span.name,
+                "kind": 1,
+                "startTimeUnixNano": str(int(span.start * 1e9)),
+                "endTimeUnixNano": str(int((span.start + span.seconds) * 1e9)),
+                "attributes": attributes,
+            }
+            if span.parent is not None:
+                otlp_span["parentSpanId"] = f"{span.parent.span_id:016x}"
+            spans.append(otlp_span)
+
+        return {"resourceSpans": [{
+            "resource": {"attributes": [attribute("service.name", "inspect_ai_scorers")]},
+            "scopeSpans": [{"scope": {"name": "inspect_ai_scorers"}, "spans": spans}],
+        }]}
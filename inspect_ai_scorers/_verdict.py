@@ -0,0 +1,71 @@
+import math
+
+from inspect_ai.model import GenerateConfig, ModelOutput
+
+# A verdict is one word: the stop sequence ends it at the first line break, the
+# token cap covers tokenizers that split PASS or FAIL, and the first token's
+# alternatives give a PASS probability on providers that report logprobs
+fast_verdict_config = GenerateConfig(max_tokens=3, stop_seqs=["\n"], logprobs=True, top_logprobs=5)
+
+
+def _verdict_token(token: str) -> str | None:
+    word = token.strip().upper()
+    if word and "PASS".startswith(word):
+        return "PASS"
+    if word and "FAIL".startswith(word):
+        return "FAIL"
+    return None
+
+
+def pass_probability(output: ModelOutput) -> float:
+    """
+    Read the probability of a PASS verdict from a grader's output.
+
+    When the provider reports logprobs, the probabilities of the first
+    token's alternatives that begin PASS and FAIL are normalized against
+    each other. Otherwise the completion is read as text, giving 1.0 or 0.0.
+
+    Args:
+        output (ModelOutput): The grader's output.
+
+    Returns:
+        float: The PASS probability, between 0 and 1.
+    """
+    logprobs = output.choices[0].logprobs if output.choices else None
+    if logprobs is not None and logprobs.content:
+        first = logprobs.content[0]
+        mass = {"PASS": 0.0, "FAIL": 0.0}
+        for candidate in first.top_logprobs or [first]:
+            verdict = _verdict_token(candidate.token)
+            if verdict is not None:
+                mass[verdict] += math.exp(candidate.logprob)
+        total = mass["PASS"] + mass["FAIL"]
+        if total > 0:
+            return mass["PASS"] / total
+    return 1.0 if "PASS" in output.completion else 0.0
+
+
+def verdict_uncertainty(outputs: list[ModelOutput], margin: float, threshold: float = 0.5) -> str | None:
+    """
+    Decide whether a cheap grader's PASS/FAIL verdicts can be trusted.
+
+    Args:
+        outputs (list[ModelOutput]): The cheap grader's verdicts on a sample.
+        margin (float): The smallest gap between the PASS and FAIL
+            probabilities to trust, read from first-token logprobs where the
+            provider reports them.
+        threshold (float): The PASS probability that makes a verdict a PASS.
+
+    Returns:
+        str | None: "parse_failure" if a verdict names neither PASS nor FAIL,
+            "disagreement" if the verdicts differ, "low_margin" if one is too
+            close to call, or None.
+    """
+    if any("PASS" not in output.completion and "FAIL" not in output.completion for output in outputs):
+        return "parse_failure"
+    probabilities = [pass_probability(output) for output in outputs]
+    if len({probability >= threshold for probability in probabilities}) > 1:
+        return "disagreement"
+    if any(abs(2 * probability - 1) < margin for probability in probabilities):
+        return "low_margin"
+    return None
@@ -0,0 +1,105 @@
+import asyncio
+from typing import Awaitable, Callable, TypeVar
+
+from inspect_ai.scorer import Score, metric
+
+T = TypeVar("T")
+
+
+def vote_outcome(passes: int, fails: int, votes: int, quorum: int) -> bool | None:
+    """
+    Decide a vote as soon as the remaining votes can't change it.
+
+    Args:
+        passes (int): PASS votes so far.
+        fails (int): FAIL votes so far.
+        votes (int): Votes in total.
+        quorum (int): PASS votes needed for the vote to pass.
+
+    Returns:
+        bool | None: True for a pass, False for a fail, None while undecided.
+    """
+    if passes >= quorum:
+        return True
+    if fails > votes - quorum:
+        return False
+    return None
+
+
+async def early_stopping_vote(calls: list[Callable[[], Awaitable[T]]], verdict: Callable[[T], bool], quorum: int) -> tuple[bool, list[tuple[int, T]], int]:
+    """
+    Run grader calls concurrently and stop once the vote is decided.
+
+    Every call starts at once. Verdicts are tallied as calls complete, and
+    the calls still outstanding are cancelled as soon as `quorum` passes are
+    reached or can no longer be reached. An exception from any call cancels
+    the rest and is raised.
+
+    Args:
+        calls (list[Callable]): One async call per vote.
+        verdict (Callable): Tells whether a call's result is a PASS.
+        quorum (int): PASS votes needed for the vote to pass.
+
+    Returns:
+        tuple: Whether the vote passed, the (vote index, result) pairs in the
+            order they completed, and the number of calls cancelled.
+    """
+    tasks = {asyncio.ensure_future(call()): index for index, call in enumerate(calls)}
+    pending = set(tasks)
+    results: list[tuple[int, T]] = []
+    passes = fails = 0
+    outcome = None
+    try:
+        while outcome is None:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            # tally in start order so simultaneous completions are deterministic
+            for task in sorted(done, key=tasks.get):
+                result = task.result()
+                results.append((tasks[task], result))
+                if verdict(result):
+                    passes += 1
+                else:
+                    fails += 1
+            outcome = vote_outcome(passes, fails, len(calls), quorum)
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+    return outcome, results, len(pending)
+
+
+@metric
+def agreement():
+    """
+    Metric function for the share of graders agreeing with the final verdict,
+    averaged over samples.
+
+    Returns:
+        function: The metric function.
+    """
+    def metric(scores: list[Score]) -> float:
+        rates = []
+        for score in scores:
+            votes = (score.metadata or {}).get("votes")
+            if votes:
+                verdict = "PASS" if score.value == "C" else "FAIL"
+                rates.append(sum(vote["verdict"] == verdict for vote in votes) / len(votes))
+        return sum(rates) / len(rates) if rates else 0.0
+    return metric
+
+
+@metric
+def grader_calls():
+    """
+    Metric function for the grader calls spent per sample, counting only the
+    votes that completed.
+
+    Returns:
+        function: The metric function.
+    """
+    def metric(scores: list[Score]) -> float:
+        calls = [(score.metadata or {}).get("grader_calls") for score in scores]
+        calls = [count for count in calls if count is not None]
+        return sum(calls) / len(calls) if calls else 0.0
+    return metric
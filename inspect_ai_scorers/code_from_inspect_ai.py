@@ -1,4 +1,5 @@
 import json
+from functools import lru_cache
 from typing import Any, Dict, Protocol, cast, runtime_checkable
 
 from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
@@ -6,7 +7,7 @@ from langchain_core.language_models import BaseChatModel
 from langchain_core.messages import AIMessage, BaseMessage, FunctionMessage, HumanMessage, SystemMessage, ToolMessage
 from langchain_core.messages import ToolCall as LCToolCall
 from langchain_core.outputs import ChatGeneration, ChatResult
-from pydantic.v1 import Field
+from pydantic import Field, PrivateAttr
 from typing_extensions import override
 
 from inspect_ai.model import (
@@ -22,8 +23,8 @@ from inspect_ai.model import (
     ModelName,
     ModelOutput,
     get_model,
-    ToolCall, ToolChoice, ToolInfo, ToolParam
 )
+from inspect_ai.tool import ToolCall, ToolChoice, ToolInfo, ToolParam, ToolParams
 
 from inspect_ai.solver import Generate, Solver, TaskState
 
@@ -62,8 +63,13 @@ def langchain_solver(agent: LangChainAgent) -> Solver:
 class InspectChatModel(BaseChatModel):
     # track messages and model output so we can update
     # the inspect task state when we are complete
-    messages: list[ChatMessage] = Field(default=[], exclude=True)
-    output: ModelOutput = Field(default=ModelOutput(), exclude=True)
+    messages: list[ChatMessage] = Field(default_factory=list, exclude=True)
+    output: ModelOutput = Field(default_factory=ModelOutput, exclude=True)
+
+    # (LangChain message, inspect message) pairs for the tracked transcript.
+    # Agents resend the whole history each turn, so messages already in the
+    # transcript are matched by identity (or equality) and not converted again.
+    _converted: list[tuple[BaseMessage, ChatMessage]] = PrivateAttr(default_factory=list)
 
     @property
     def _llm_type(self) -> str:
@@ -99,18 +105,13 @@ class InspectChatModel(BaseChatModel):
         tool_choice: ToolChoice | None = None
         lc_tools = cast(list[dict[str, Any]] | None, kwargs.get("tools", None))
         if lc_tools:
-            tools = [
-                ToolInfo(
-                    name=tool["function"]["name"],
-                    description=tool["function"]["description"],
-                    params=as_inspect_tool_params(tool["function"]["parameters"]),
-                )
-                for tool in lc_tools
-            ]
+            tools = as_inspect_tools(lc_tools)
             tool_choice = "auto"
 
-        # generate
-        input = [as_inspect_message(message) for message in messages]
+        # generate, converting only the messages not already in the transcript
+        reused = self._converted_prefix(messages)
+        new_messages = [(message, as_inspect_message(message)) for message in messages[reused:]]
+        input = [inspect_message for _, inspect_message in self._converted[:reused] + new_messages]
         result = await get_model().generate(
             input=input,
             tools=tools,
@@ -118,19 +119,43 @@ class InspectChatModel(BaseChatModel):
             config=GenerateConfig(stop_seqs=stop),
         )
 
-        # track last messages / model output
-        self.messages = input
-        self.messages.append(result.choices[0].message)
-        self.output = result
-
         # extract choices
         generations = [
             ChatGeneration(message=as_langchain_message(choice.message))
             for choice in result.choices
         ]
 
-        # return
-        return ChatResult(generations=generations)
+        # track messages / model output, updating the transcript in place. The
+        # reply is tracked as the LangChain message we return, which the agent
+        # sends back as part of its history next turn.
+        reply = (generations[0].message, result.choices[0].message)
+        del self._converted[reused:]
+        self._converted.extend(new_messages)
+        self._converted.append(reply)
+        del self.messages[reused:]
+        self.messages.extend(inspect_message for _, inspect_message in new_messages)
+        self.messages.append(reply[1])
+        self.output = result
+
+        # return, reporting usage the way LangChain chat models do
+        llm_output = None
+        if result.usage is not None:
+            llm_output = {"token_usage": {
+                "prompt_tokens": result.usage.input_tokens,
+                "completion_tokens": result.usage.output_tokens,
+                "total_tokens": result.usage.total_tokens,
+            }}
+        return ChatResult(generations=generations, llm_output=llm_output)
+
+
+    def _converted_prefix(self, messages: list[BaseMessage]) -> int:
+        # number of leading messages that match the tracked transcript
+        count = 0
+        for message, (converted, _) in zip(messages, self._converted):
+            if message is not converted and message != converted:
+                break
+            count += 1
+        return count
 
 
 def as_inspect_message(message: BaseMessage) -> ChatMessage:
@@ -228,18 +253,59 @@ def as_inspect_content(
         ]
 
 
-def as_inspect_tool_params(parameters: dict[str, Any]) -> list[ToolParam]:
-    params: list[ToolParam] = []
-    for key, param in parameters["properties"].items():
-        params.append(
-            ToolParam(
-                name=key,
-                type=param["type"],
-                description=param.get("description", param.get("title")),
-                optional=key not in parameters["required"],
-            )
+def as_inspect_tools(lc_tools: list[dict[str, Any]]) -> list[ToolInfo]:
+    # agents bind the same tools for the whole run, so compiled schemas are
+    # cached by their canonical JSON
+    return list(_compile_tools(json.dumps(lc_tools, sort_keys=True, default=str)))
+
+
+@lru_cache(maxsize=128)
+def _compile_tools(tools_json: str) -> tuple[ToolInfo, ...]:
+    return tuple(
+        ToolInfo(
+            name=tool["function"]["name"],
+            description=tool["function"].get("description", ""),
+            parameters=as_inspect_tool_params(tool["function"].get("parameters", {})),
         )
-    return params
+        for tool in json.loads(tools_json)
+    )
+
+
+def as_inspect_tool_params(parameters: dict[str, Any]) -> ToolParams:
+    return ToolParams(
+        properties={
+            key: as_inspect_tool_param(param)
+            for key, param in parameters.get("properties", {}).items()
+        },
+        required=parameters.get("required", []),
+    )
+
+
+def as_inspect_tool_param(param: dict[str, Any]) -> ToolParam:
+    # JSON Schema for one parameter, including nested arrays and objects
+    tool_param = ToolParam(
+        description=param.get("description", param.get("title")),
+        default=param.get("default"),
+    )
+    param_type = param.get("type")
+    if isinstance(param_type, list):
+        tool_param.anyOf = [ToolParam(type=t) for t in param_type]
+    elif param_type is not None:
+        tool_param.type = param_type
+    if "items" in param:
+        tool_param.items = as_inspect_tool_param(param["items"])
+    if "properties" in param:
+        tool_param.properties = {
+            key: as_inspect_tool_param(value) for key, value in param["properties"].items()
+        }
+        tool_param.required = param.get("required", [])
+    if isinstance(param.get("additionalProperties"), dict):
+        tool_param.additionalProperties = as_inspect_tool_param(param["additionalProperties"])
+    elif isinstance(param.get("additionalProperties"), bool):
+        tool_param.additionalProperties = param["additionalProperties"]
+    if "anyOf" in param:
+        tool_param.anyOf = [as_inspect_tool_param(option) for option in param["anyOf"]]
+    return tool_param
 
 
 def as_langchain_content(
@@ -1,12 +1,22 @@
+from functools import lru_cache
+
 from inspect_ai.dataset import Sample
+from inspect_ai.model import get_model
 from inspect_ai.solver import TaskState
 from inspect_ai.scorer import Score, Scorer, Target, metric, scorer
-from langchain.prompts import PromptTemplate
-from langchain.output_parsers import PydanticOutputParser
-from langchain_core.pydantic_v1 import BaseModel, Field
-from langchain_core.messages import HumanMessage
 
-from inspect_ai_scorers.code_from_inspect_ai import InspectChatModel
+from inspect_ai_scorers._aggregate import fact_counts, micro_groundedness, micro_thoroughness, score_values
+from inspect_ai_scorers._cache import cache_key, cached_extraction, resolve_cache
+from inspect_ai_scorers._cassette import resolve_cassette
+from inspect_ai_scorers._checkpoint import content_hash, resolve_checkpoint
+from inspect_ai_scorers._chunking import extract_chunked
+from inspect_ai_scorers._facts import comparison_from_ids, number_facts, parse_facts
+from inspect_ai_scorers._limiter import grader_limiter, model_max_connections
+from inspect_ai_scorers._metrics import scorer_metrics, start_metrics_server
+from inspect_ai_scorers._parsing import ComparisonResult, parse_comparison, parse_matches, parse_with_repair
+from inspect_ai_scorers._pipeline import StageGraph
+from inspect_ai_scorers._singleflight import grader_flights, request_key, request_payload
+from inspect_ai_scorers._tracing import SampleTrace, record_call, traced, traced_parse
 
 import json
 
@@ -15,15 +25,50 @@ class FactComparator:
     A class to compare facts between context and answer using an AI model.
     """
 
-    def __init__(self, model):
+    def __init__(self, model, cache=None, compare_mode="text", compare_repairs=1, chunk_tokens=None, chunk_overlap=0, adaptive_concurrency=False, coalesce_requests=True, cassette=None):
         """
         Initialize the FactComparator with the provided model.
         
         Args:
             model: The AI model used for generating and comparing facts.
+            cache: Cache fact parsing results. True for the default on-disk cache,
+                a path for a cache stored there, or a FactCache instance.
+            compare_mode: "text" has the model write out the shared and unique facts.
+                "ids" numbers the parsed facts and has the model return only
+                [context ID, answer ID] pairs, rebuilding the comparison locally.
+            compare_repairs: How many times to ask the model to fix a compare
+                response that can't be parsed.
+            chunk_tokens: Split texts longer than this many tokens at sentence
+                boundaries and parse the chunks concurrently, merging their facts.
+                None parses each text in one request.
+            chunk_overlap: Tokens of trailing sentences repeated at the start of
+                the next chunk.
+            adaptive_concurrency: Route model calls through the limiter shared
+                per model (see `grader_limiter_stats()`).
+            coalesce_requests: Share one model call between concurrent identical
+                requests, e.g. samples parsing the same context.
+            cassette: Record model calls to a file, or replay them from one. A
+                path replays strictly; pass a Cassette to record or replay leniently.
         """
+        if compare_mode not in ("text", "ids"):
+            raise ValueError(f"Unknown compare_mode '{compare_mode}', expected 'text' or 'ids'")
+
         self.model = model
-        self.parser = PydanticOutputParser(pydantic_object=ComparisonResult)
+        self.cache = resolve_cache(cache)
+        self.compare_mode = compare_mode
+        self.compare_repairs = compare_repairs
+        self.chunk_tokens = chunk_tokens
+        self.chunk_overlap = chunk_overlap
+        self.adaptive_concurrency = adaptive_concurrency
+        self.coalesce_requests = coalesce_requests
+        self.cassette = resolve_cassette(cassette)
+
+        # Context and answer parsing are independent, so they run concurrently
+        # and only the compare stage waits on both
+        self.pipeline = StageGraph()
+        self.pipeline.add("context_list", traced("context_extraction", lambda context_text, cache_stats: self._parse_facts(context_text, cache_stats)), after=["context_text", "cache_stats"])
+        self.pipeline.add("answer_list", traced("answer_extraction", lambda answer_text, cache_stats: self._parse_facts(answer_text, cache_stats)), after=["answer_text", "cache_stats"])
+        self.pipeline.add("comparison_result", traced("compare", self._compare_facts), after=["context_list", "answer_list"])
 
     async def __call__(self, context_text, answer_text):
         """
@@ -47,17 +92,211 @@ class FactComparator:
             answer_text (str): The answer text.
 
         Returns:
-            dict: The processed data and comparison results.
+            dict: The processed data and comparison results, plus the fact cache
+                hit/miss counts when a cache is configured.
         """
-        context_list = (await self.model._agenerate([HumanMessage(content=self._parse_prompt().format(text=context_text))])).generations[0].text
-        answer_list = (await self.model._agenerate([HumanMessage(content=self._parse_prompt().format(text=answer_text))])).generations[0].text
-        comparison_result = self.parser.parse((await self.model._agenerate([HumanMessage(content=self._compare_prompt().format(context_list=context_list, answer_list=answer_list))])).generations[0].text)
+        cache_stats = {"hits": 0, "misses": 0}
+        results = await self.pipeline.run(context_text=context_text, answer_text=answer_text, cache_stats=cache_stats)
 
-        return {
-            "context_list": context_list,
-            "answer_list": answer_list,
-            "comparison_result": comparison_result,
+        processed = {
+            "context_list": results["context_list"],
+            "answer_list": results["answer_list"],
+            "comparison_result": results["comparison_result"],
         }
+        if self.cache is not None:
+            processed["cache_stats"] = cache_stats
+        return processed
+
+    async def _parse_facts(self, text, cache_stats=None):
+        """
+        Parse a text into a list of facts using the model, in chunks if it is long.
+
+        Args:
+            text (str): The text to parse.
+            cache_stats (dict): Per-call cache hit/miss counts to update.
+
+        Returns:
+            str: The model's list of facts.
+        """
+        if self.chunk_tokens is None:
+            return await self._parse_chunk(text, cache_stats)
+        return await extract_chunked(text, lambda chunk: self._parse_chunk(chunk, cache_stats), self.chunk_tokens, self.chunk_overlap)
+
+    async def _parse_chunk(self, text, cache_stats=None):
+        """
+        Parse a text into a list of facts using the model, consulting the cache first.
+
+        Args:
+            text (str): The text to parse.
+            cache_stats (dict): Per-call cache hit/miss counts to update.
+
+        Returns:
+            str: The model's list of facts.
+        """
+        from inspect_ai_scorers._langchain import HumanMessage
+
+        prompt = self._parse_prompt()
+
+        async def extract():
+            return await self._generate([HumanMessage(content=prompt.format(text=text))])
+
+        key = None
+        if self.cache is not None:
+            key = cache_key(prompt.template, self._model_name(), self._generate_config(), text)
+        return await cached_extraction(self.cache, key, extract, cache_stats)
+
+    async def _compare_facts(self, context_list, answer_list):
+        """
+        Compare the facts parsed from the context and the answer using the model.
+
+        Args:
+            context_list (str): The facts parsed from the context.
+            answer_list (str): The facts parsed from the answer.
+
+        Returns:
+            ComparisonResult: The parsed comparison result.
+        """
+        if self.compare_mode == "ids":
+            return await self._compare_fact_ids(context_list, answer_list)
+
+        prompt = self._compare_prompt().format(context_list=context_list, answer_list=answer_list)
+        return await parse_with_repair(prompt, self._generate_turns, traced_parse(parse_comparison), max_repairs=self.compare_repairs)
+
+    async def _generate_turns(self, conversation):
+        """
+        Generate a completion for a conversation of (role, text) turns.
+
+        Args:
+            conversation (list): The turns, with role "user" or "assistant".
+
+        Returns:
+            str: The model's completion.
+        """
+        from inspect_ai_scorers._langchain import AIMessage, HumanMessage
+
+        messages = [HumanMessage(content=text) if role == "user" else AIMessage(content=text) for role, text in conversation]
+        return await self._generate(messages)
+
+    async def _generate(self, messages):
+        """
+        Generate a completion, through the shared grader limiter if enabled and
+        joining an identical request already in flight, or replay it from the cassette.
+
+        Args:
+            messages (list): The LangChain messages.
+
+        Returns:
+            str: The model's completion.
+        """
+        async def agenerate():
+            with scorer_metrics.grader_call():
+                result = await self.model._agenerate(messages)
+            usage = (result.llm_output or {}).get("token_usage") or {}
+            record_call(usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0))
+            return result.generations[0].text
+
+        # resolved once per request, as the active model changes between samples
+        inspect_model = self._inspect_model()
+        model_name = str(inspect_model) if inspect_model is not None else self._model_name()
+
+        async def call():
+            if not self.adaptive_concurrency:
+                return await agenerate()
+            if inspect_model is not None:
+                # InspectChatModel calls the active inspect model, so share its pool
+                return await grader_limiter(model_name, model_max_connections(inspect_model)).run(agenerate, inspect_model.api.is_rate_limit)
+            return await grader_limiter(model_name).run(agenerate)
+
+        request = (model_name, None, [(message.type, message.content) for message in messages])
+        key = request_key(*request)
+
+        async def live():
+            if not self.coalesce_requests:
+                return await call()
+            return await grader_flights.do(key, call)
+
+        if self.cassette is not None:
+            return await self.cassette.play(key, request_payload(*request), live)
+        return await live()
+
+    def _model_name(self):
+        """
+        Name the model for the shared limiter and request coalescing.
+
+        Returns:
+            str: The inspect model ("provider/name") behind an InspectChatModel,
+                otherwise the LangChain model's name.
+        """
+        inspect_model = self._inspect_model()
+        if inspect_model is not None:
+            return str(inspect_model)
+        return self.model._identifying_params.get("model_name", self.model._llm_type)
+
+    def _generate_config(self):
+        """
+        Describe the settings the model generates with, for the fact cache key.
+
+        Returns:
+            dict: The active inspect model's generate config behind an
+                InspectChatModel, otherwise the LangChain model's parameters.
+        """
+        inspect_model = self._inspect_model()
+        if inspect_model is not None:
+            return inspect_model.config.model_dump(exclude_none=True)
+        return self.model._identifying_params
+
+    def _inspect_model(self):
+        """
+        Resolve the inspect model an InspectChatModel grades with.
+
+        It is looked up on every call: eval() reuses one task, and so one
+        comparator, for each model it evaluates.
+
+        Returns:
+            Model | None: The active inspect model, or None for other LangChain models.
+        """
+        from inspect_ai_scorers._langchain import InspectChatModel
+
+        if isinstance(self.model, InspectChatModel):
+            return get_model()
+        return None
+
+    async def _compare_fact_ids(self, context_list, answer_list):
+        """
+        Compare numbered facts, having the model return only matching ID pairs.
+
+        Args:
+            context_list (str): The facts parsed from the context.
+            answer_list (str): The facts parsed from the answer.
+
+        Returns:
+            ComparisonResult: The comparison result rebuilt from the matched IDs.
+        """
+        context_facts = parse_facts(context_list)
+        answer_facts = parse_facts(answer_list)
+
+        # Nothing can match if either side has no facts, so skip the model
+        matches = []
+        if context_facts and answer_facts:
+            prompt = self._compare_ids_prompt().format(
+                context_list=number_facts(context_facts, "C"),
+                answer_list=number_facts(answer_facts, "A"),
+            )
+            matches = await parse_with_repair(prompt, self._generate_turns, traced_parse(parse_matches), max_repairs=self.compare_repairs)
+
+        return ComparisonResult(**comparison_from_ids(matches, context_facts, answer_facts))
+
+    def settings(self):
+        """
+        List the prompts and options that can change a score, for checkpoint hashes.
+
+        Returns:
+            list: The grader model, options and prompt templates.
+        """
+        return [
+            self._model_name(), self.compare_mode, self.compare_repairs, self.chunk_tokens, self.chunk_overlap,
+            self._parse_prompt().template, self._compare_prompt().template, self._compare_ids_prompt().template,
+        ]
 
     def calculate_metrics(self, comparison_result):
         """
@@ -88,13 +327,16 @@ class FactComparator:
         }
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def _parse_prompt():
         """
         Generate the prompt template for parsing facts from text.
 
         Returns:
-            PromptTemplate: The prompt template.
+            PromptTemplate: The prompt template, built once and shared.
         """
+        from inspect_ai_scorers._langchain import PromptTemplate
+
         return PromptTemplate(
             input_variables=["text"],
             template="""
@@ -113,13 +355,16 @@ class FactComparator:
         )
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def _compare_prompt():
         """
         Generate the prompt template for comparing facts between context and answer.
 
         Returns:
-            PromptTemplate: The prompt template.
+            PromptTemplate: The prompt template, built once and shared.
         """
+        from inspect_ai_scorers._langchain import PromptTemplate
+
         return PromptTemplate(
             input_variables=["context_list", "answer_list"],
             template="""
@@ -168,15 +413,50 @@ class FactComparator:
             """,
         )
 
-class ComparisonResult(BaseModel):
-    """
-    A Pydantic model for representing the comparison result.
-    """
-    facts_in_both: list[str] = Field(default_factory=list, description="List of facts present in both context and answer")
-    facts_only_in_answer: list[str] = Field(default_factory=list, description="List of facts only present in the answer")
-    facts_only_in_context: list[str] = Field(default_factory=list, description="List of facts only present in the context")
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _compare_ids_prompt():
+        """
+        Generate the prompt template for comparing numbered facts by ID.
 
+        Returns:
+            PromptTemplate: The prompt template, built once and shared.
+        """
+        from inspect_ai_scorers._langchain import PromptTemplate
+
+        return PromptTemplate(
+            input_variables=["context_list", "answer_list"],
+            template="""
+            You will be comparing facts between a context and an answer to determine which facts are shared and which are unique to each.
 
+            Here are the facts in the context, each with an ID:
+
+            <context>
+            {context_list}
+            </context>
+
+            And here are the facts in the answer, each with an ID:
+
+            <answer>
+            {answer_list}
+            </answer>
+
+            Carefully analyze the facts presented in the context and answer, focusing on the semantic meaning rather than the exact wording.
+
+            Then, output a dictionary with a single key, "matches", whose value is a list of [context ID, answer ID] pairs, one for each context fact and answer fact that express the same fact. Any fact that is not part of a pair is treated as present in only one of the texts.
+
+            Remember, the facts do not need to be worded identically to be considered the same. Focus on whether the core meaning is shared or unique.  A fact in the context may be expressed in different terms in the answer, or multiple facts in one may combine to express a single fact in the other; in that case include a pair for each fact involved.
+
+            Refer to facts only by their IDs and do not repeat the text of any fact. Provide your results in this format:
+
+            {{
+                "matches": [
+                    ["C1", "A2"],
+                    ["C3", "A1"]
+                ]
+            }}
+            """,
+        )
 
 class ModelComparator:
     """
@@ -190,6 +470,8 @@ class ModelComparator:
         Args:
             model: The AI model used for generating and comparing facts.
         """
+        from inspect_ai_scorers._langchain import InspectChatModel
+
         self.inspect_model = InspectChatModel()
         self.comparator = FactComparator(self.inspect_model)
 
@@ -238,15 +520,28 @@ class FactComparatorScorer:
     A class to score facts based on their groundedness and thoroughness.
     """
 
-    def __init__(self, model):
+    def __init__(self, model, cache=None, compare_mode="text", compare_repairs=1, chunk_tokens=None, chunk_overlap=0, adaptive_concurrency=False, coalesce_requests=True, cassette=None, tracer=None, checkpoint=None):
         """
         Initialize the FactComparatorScorer with the provided model.
         
         Args:
             model: The AI model used for generating and comparing facts.
+            cache: Cache fact parsing results (see FactComparator).
+            compare_mode: "text" or "ids" (see FactComparator).
+            compare_repairs: Repair requests for unparseable compare responses (see FactComparator).
+            chunk_tokens: Token budget for chunked fact parsing (see FactComparator).
+            chunk_overlap: Tokens repeated between chunks (see FactComparator).
+            adaptive_concurrency: Use the shared grader limiter (see FactComparator).
+            coalesce_requests: Coalesce identical concurrent requests (see FactComparator).
+            cassette: Record or replay model calls (see FactComparator).
+            tracer: A ScoreTracer collecting each sample's stage spans.
+            checkpoint: A path or ScoreCheckpoint recording finished scores,
+                so a rerun serves the samples already scored.
         """
         self.model = model
-        self.fact_comparator = FactComparator(model)
+        self.tracer = tracer
+        self.checkpoint = resolve_checkpoint(checkpoint)
+        self.fact_comparator = FactComparator(model, cache=cache, compare_mode=compare_mode, compare_repairs=compare_repairs, chunk_tokens=chunk_tokens, chunk_overlap=chunk_overlap, adaptive_concurrency=adaptive_concurrency, coalesce_requests=coalesce_requests, cassette=cassette)
 
     async def __call__(self, state: TaskState, target: Target):
         """
@@ -262,7 +557,17 @@ class FactComparatorScorer:
         context_text = state.output.choices[0].message.content
         answer_text = target.text
 
-        result = await self.fact_comparator.process_data(context_text, answer_text)
+        if self.checkpoint is not None:
+            content = content_hash("fact_comparator_scorer", *self.fact_comparator.settings(), context_text, answer_text)
+            restored = await self.checkpoint.aget(state.sample_id, state.epoch, content)
+            if restored is not None:
+                return restored
+
+        trace = SampleTrace(state.sample_id, state.epoch)
+        with trace.activate():
+            result = await self.fact_comparator.process_data(context_text, answer_text)
+        if self.tracer is not None:
+            self.tracer.add(trace)
 
         comparison = result["comparison_result"]
 
@@ -284,10 +589,20 @@ class FactComparatorScorer:
             "groundedness": metrics["groundedness"],
             "thoroughness": metrics["thoroughness"],
         }
-        return Score(
+        metadata = {"fact_counts": fact_counts(comparison.model_dump())}
+        if "cache_stats" in result:
+            metadata["fact_cache"] = result["cache_stats"]
+        metadata["stages"] = trace.stages()
+
+        score = Score(
             value=scorer_value,
             explanation=explanation,
+            metadata=metadata,
         )
+        if self.checkpoint is not None:
+            facts = {"context_list": result["context_list"], "answer_list": result["answer_list"], "comparison": comparison.model_dump()}
+            self.checkpoint.put(state.sample_id, state.epoch, content, score, facts)
+        return score
 
 
 @metric
@@ -299,11 +614,8 @@ def thoroughness():
         function: The metric function.
     """
     def metric(scores: list[Score]) -> float:
-        total = 0.0
-        for item in scores:
-            if isinstance(item.value, dict):
-                total += float(item.value["thoroughness"])
-        return total / float(len(scores))
+        values = score_values(scores, "thoroughness")
+        return float(values.mean()) if values.size else 0.0
     return metric
 
 
@@ -316,39 +628,68 @@ def groundedness():
         function: The metric function.
     """
     def metric(scores: list[Score]) -> float:
-        total = 0.0
-        for item in scores:
-            if isinstance(item.value, dict):
-                total += float(item.value["groundedness"])
-        return total / float(len(scores))
+        values = score_values(scores, "groundedness")
+        return float(values.mean()) if values.size else 0.0
     return metric
 
 
-@scorer(metrics=[groundedness(), thoroughness()])
-def fact_comparator_scorer() -> Scorer:
+@scorer(metrics=[groundedness(), thoroughness(), micro_groundedness(), micro_thoroughness()])
+def fact_comparator_scorer(cache=None, compare_mode="text", compare_repairs=1, chunk_tokens=None, chunk_overlap=0, adaptive_concurrency=False, coalesce_requests=True, cassette=None, tracer=None, metrics_port=None, checkpoint=None) -> Scorer:
     """
     Create a scorer for the fact comparator.
 
     Args:
-        model: The AI model used for generating and comparing facts.
+        cache: Cache fact parsing results. True for the default on-disk cache,
+            a path for a cache stored there, or a FactCache instance.
+        compare_mode: "text" has the model write out the shared and unique facts,
+            "ids" has it return only matching fact ID pairs.
+        compare_repairs: How many times to ask the model to fix a compare
+            response that can't be parsed.
+        chunk_tokens: Split texts longer than this many tokens and parse the
+            chunks concurrently. None parses each text in one request.
+        chunk_overlap: Tokens of trailing sentences repeated between chunks.
+        adaptive_concurrency: Route model calls through the limiter shared
+            per model (see `grader_limiter_stats()`).
+        coalesce_requests: Share one model call between concurrent identical requests.
+        cassette: Record model calls to a file, or replay them from one. A path
+            replays strictly; pass a Cassette to record or replay leniently.
+        tracer: A ScoreTracer collecting each sample's stage spans. The
+            per-stage wall time, model calls, tokens, repairs and cache hits
+            are in the score metadata under "stages" either way.
+        metrics_port: Serve live metrics for the scorers in this process in
+            Prometheus format at http://127.0.0.1:<port>/metrics.
+        checkpoint: Record each finished score, with its fact lists, so a
+            rerun after a crash serves the samples already scored instead of
+            calling the model. A path or a ScoreCheckpoint.
 
     Returns:
         Scorer: The fact comparator scorer.
     """
-    async def score(state: TaskState, target: Target) -> Score:
-        model = InspectChatModel()
-        fact_comparator_scorer = FactComparatorScorer(model)
+    fact_cache = resolve_cache(cache)
+    model_cassette = resolve_cassette(cassette)
+    if metrics_port is not None:
+        start_metrics_server(metrics_port)
 
+    from inspect_ai_scorers._langchain import InspectChatModel
+
+    # InspectChatModel resolves the active inspect model on each call, so one
+    # model and comparator serve every sample
+    model = InspectChatModel()
+    fact_comparator_scorer = FactComparatorScorer(model, cache=fact_cache, compare_mode=compare_mode, compare_repairs=compare_repairs, chunk_tokens=chunk_tokens, chunk_overlap=chunk_overlap, adaptive_concurrency=adaptive_concurrency, coalesce_requests=coalesce_requests, cassette=model_cassette, tracer=tracer, checkpoint=checkpoint)
+
+    async def score(state: TaskState, target: Target) -> Score:
         score = await fact_comparator_scorer(state, target)
         explanation = score.explanation
         
         answer = state.output.completion
 
-        return Score(
+        result = Score(
             value=score.value,
             answer=answer,
             explanation=explanation,
             metadata=score.metadata
         )
+        scorer_metrics.record_score("fact_comparator_scorer", result)
+        return result
 
     return score
\ No newline at end of file
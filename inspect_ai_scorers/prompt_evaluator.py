@@ -1,26 +1,114 @@
-from inspect_ai.model import get_model
+from inspect_ai.model import GenerateConfig, ModelOutput, get_model
 from inspect_ai.solver import TaskState
 from inspect_ai.scorer import Score, Scorer, Target, accuracy, scorer
 
+from inspect_ai_scorers._cascade import cheap_tier, escalation_rate, seeded
+from inspect_ai_scorers._cassette import Cassette, resolve_cassette
+from inspect_ai_scorers._checkpoint import ScoreCheckpoint, content_hash, resolve_checkpoint
+from inspect_ai_scorers._limiter import limited_generate
+from inspect_ai_scorers._metrics import scorer_metrics, start_metrics_server
+from inspect_ai_scorers._singleflight import coalesced_generate
+from inspect_ai_scorers._tracing import SampleTrace, ScoreTracer, record_output, stage_span
+from inspect_ai_scorers._verdict import fast_verdict_config, pass_probability, verdict_uncertainty
+from inspect_ai_scorers._voting import agreement, early_stopping_vote, grader_calls
 
-@scorer(metrics=[accuracy()])
-def prompt_scorer(model) -> Scorer:
+
+# The fast verdict prompt asks for the verdict alone, first
+fast_verdict_prompt = """Does the 'Answer' below fulfill the requirements outlined in the 'Target' below? Respond with one word: PASS or FAIL.
+
+Answer:
+{answer}
+
+Target:
+{target}
+"""
+
+# Asked after a FAIL when explanations are wanted
+explanation_prompt = """Explain briefly which requirements outlined in the 'Target' below the 'Answer' below doesn't fulfill.
+
+Answer:
+{answer}
+
+Target:
+{target}
+"""
+
+
+@scorer(metrics=[accuracy(), agreement(), grader_calls(), escalation_rate()])
+def prompt_scorer(model, votes: int | None = None, quorum: int | None = None, adaptive_concurrency: bool = False, coalesce_requests: bool = True, cassette: str | Cassette | None = None, tracer: ScoreTracer | None = None, metrics_port: int | None = None, checkpoint: str | ScoreCheckpoint | None = None, fast_verdict: bool = False, pass_threshold: float = 0.5, explain_failures: bool = False, cascade_model=None, cascade_samples: int = 2, cascade_margin: float = 0.5) -> Scorer:
     """
     Create a scorer for the prompt evaluator.
 
     Args:
-        model: The AI model used for evaluating prompts.
+        model: The AI model used for evaluating prompts, or a list of models
+            to grade with each in turn when voting.
+        votes: The number of grader votes, defaulting to one per model.
+            Votes beyond the number of models repeat them with a different
+            seed, which only gives independent votes at a temperature above 0.
+        quorum: The PASS votes needed to pass, defaulting to a majority. All
+            votes are requested at once, and the ones still outstanding are
+            cancelled as soon as the quorum is reached or can't be reached.
+        adaptive_concurrency: Route grader calls through the limiter shared
+            per model (see `grader_limiter_stats()`).
+        coalesce_requests: Share one grader call between concurrent identical
+            requests, e.g. epochs that produced the same answer.
+        cassette: Record grader calls to a file, or replay them from one. A
+            path replays strictly; pass a Cassette to record or replay leniently.
+        tracer: Collect each sample's stage spans (see `ScoreTracer`). The
+            grading call's wall time and usage are in the score metadata
+            under "stages" either way.
+        metrics_port: Serve live metrics for the scorers in this process in
+            Prometheus format at http://127.0.0.1:<port>/metrics.
+        checkpoint: Record each finished score so a rerun after a crash
+            serves the samples already scored (see `ScoreCheckpoint`).
+        fast_verdict: Ask for a bare PASS or FAIL, capped at a few tokens and
+            stopped at the first line break, and read the PASS probability
+            from the first token's logprobs where the provider reports them.
+        pass_threshold: The PASS probability a fast verdict needs to count as
+            a PASS vote.
+        explain_failures: After a FAIL, ask the first grader why the answer
+            fails, for the score's explanation. Only failures pay for the
+            longer completion.
+        cascade_model: A cheaper grader to try first. Samples are escalated to
+            `model`, with its votes, only when the cheap verdicts can't be
+            trusted: a response with no verdict, disagreement between the
+            cheap samples, or a PASS/FAIL probability margin below
+            `cascade_margin`. See `cascade_summary` for the savings.
+        cascade_samples: The cheap grader's verdicts per sample, which must
+            agree. Samples after the first get a different seed.
+        cascade_margin: The smallest gap between the cheap grader's PASS and
+            FAIL probabilities to trust, read from first-token logprobs where
+            the provider reports them.
 
     Returns:
         Scorer: The prompt evaluator scorer.
     """
-    # resolve model
-    grader_model = get_model(model)
+    # resolve models
+    graders = [get_model(grader) for grader in (model if isinstance(model, (list, tuple)) else [model])]
+    if not graders:
+        raise ValueError("prompt_scorer needs at least one grader model")
+    vote_count = votes if votes is not None else len(graders)
+    vote_quorum = quorum if quorum is not None else vote_count // 2 + 1
+    if not 1 <= vote_quorum <= vote_count:
+        raise ValueError(f"quorum must be between 1 and votes ({vote_count}), got {vote_quorum}")
+    grader_cassette = resolve_cassette(cassette)
+    score_checkpoint = resolve_checkpoint(checkpoint)
+    if metrics_port is not None:
+        start_metrics_server(metrics_port)
+    verdict_config = fast_verdict_config if fast_verdict else None
+    cheap_grader = get_model(cascade_model) if cascade_model is not None else None
+    # the cheap grader always asks for logprobs, to measure its margin
+    cheap_config = fast_verdict_config if fast_verdict else GenerateConfig(logprobs=True, top_logprobs=5)
+
+    def is_pass(output: ModelOutput) -> bool:
+        if fast_verdict:
+            return pass_probability(output) >= pass_threshold
+        return "PASS" in output.completion
 
     async def score(state: TaskState, target: Target) -> Score:
         
         # The grading prompt
-        prompt = """
+        prompt = fast_verdict_prompt if fast_verdict else """
 Return PASS if the 'Answer' below fulfills the requirements outlined in the 'Target' below, otherwise return FAIL:
 
 Answer:
@@ -33,22 +121,100 @@ Target:
         prompt = prompt.format(
                 answer=state.output.completion, target=target.target[0])
 
-        # generate the completion
-        result = await grader_model.generate(prompt)
-        final_result = result.completion
+        if score_checkpoint is not None:
+            content = content_hash("prompt_scorer", [str(grader) for grader in graders], vote_count, vote_quorum, pass_threshold, explain_failures, str(cheap_grader), cascade_samples, cascade_margin, prompt)
+            restored = await score_checkpoint.aget(state.sample_id, state.epoch, content)
+            if restored is not None:
+                scorer_metrics.record_score("prompt_scorer", restored)
+                return restored
+
+        def request(grader, prompt: str, config: GenerateConfig | None):
+            # generate the completion
+            async def call():
+                with scorer_metrics.grader_call():
+                    if adaptive_concurrency:
+                        return record_output(await limited_generate(grader, prompt, config))
+                    return record_output(await grader.generate(prompt, config=config or GenerateConfig()))
+
+            async def live():
+                if coalesce_requests:
+                    return await coalesced_generate(grader, prompt, config, call)
+                return await call()
+
+            async def run():
+                if grader_cassette is not None:
+                    return await grader_cassette.generate(grader, prompt, config, live)
+                return await live()
+
+            return run
+
+        def grade(vote: int):
+            # every vote after the first gets its own seed, so a grader listed
+            # or cycled more than once isn't coalesced into a single call
+            return request(graders[vote % len(graders)], prompt, seeded(verdict_config, vote))
+
+        trace = SampleTrace(state.sample_id, state.epoch)
+        explanation = None
+        escalation = None
+        cheap_results = []
+        cheap_calls = 0
+        voters = graders
+        with trace.activate():
+            if cheap_grader is not None:
+                cheap_results, escalation, cheap_calls = await cheap_tier(
+                    [request(cheap_grader, prompt, seeded(cheap_config, sample)) for sample in range(cascade_samples)],
+                    lambda outputs: verdict_uncertainty(outputs, cascade_margin, pass_threshold),
+                )
+            if cheap_grader is not None and escalation is None:
+                # the cheap verdicts agree and are confident, so they stand
+                passed, results, cancelled = is_pass(cheap_results[0]), list(enumerate(cheap_results)), 0
+                voters = [cheap_grader]
+            else:
+                if escalation is not None:
+                    scorer_metrics.record_escalation("prompt_scorer", escalation)
+                with stage_span("verdict" if cheap_grader is None else "escalation"):
+                    passed, results, cancelled = await early_stopping_vote(
+                        [grade(vote) for vote in range(vote_count)],
+                        is_pass,
+                        vote_quorum,
+                    )
+            if explain_failures and not passed:
+                explain = explanation_prompt.format(answer=state.output.completion, target=target.target[0])
+                with stage_span("explanation"):
+                    explanation = (await request(graders[0], explain, None)()).completion
+        if tracer is not None:
+            tracer.add(trace)
 
         # compute the score
-        if "PASS" in final_result:
-            pass_value = "C"
-        elif "FAIL" in final_result:
-            pass_value = "I"
-        else:
-            pass_value = "I"
-        
-        return Score(
+        pass_value = "C" if passed else "I"
+        verdicts = []
+        for vote, result in results:
+            verdict = {"vote": vote, "grader": str(voters[vote % len(voters)]), "verdict": "PASS" if is_pass(result) else "FAIL"}
+            if fast_verdict:
+                verdict["pass_probability"] = pass_probability(result)
+            verdicts.append(verdict)
+        final_result = next(result.completion for _, result in results if is_pass(result) == passed)
+
+        metadata = {
+            "votes": verdicts,
+            "grader_calls": len(results) + (cheap_calls if escalation is not None else 0),
+            "cancelled_votes": cancelled,
+            "stages": trace.stages(),
+        }
+        if cheap_grader is not None:
+            metadata["cascade"] = {"model": str(cheap_grader), "escalated": escalation is not None, "reason": escalation}
+        if fast_verdict:
+            metadata["pass_probability"] = sum(verdict["pass_probability"] for verdict in verdicts) / len(verdicts)
+        score = Score(
             value=pass_value,
-            answer=final_result
+            answer=final_result,
+            explanation=explanation,
+            metadata=metadata,
         )
+        scorer_metrics.record_score("prompt_scorer", score)
+        if score_checkpoint is not None:
+            score_checkpoint.put(state.sample_id, state.epoch, content, score)
+        return score
 
     return score
 
@@ -1,11 +1,22 @@
 from setuptools import setup, find_packages
 
+# Only the fact comparator's LangChain bridge needs these, so they are an extra
+LANGCHAIN_PACKAGES = ('langchain', 'langchain-core', 'langchain-text-splitters', 'langsmith')
+
 def parse_requirements(filename):
-    with open(filename, 'r') as f:
-        lines = f.readlines()
-    requirements = [line.strip() for line in lines if line.strip() and not line.startswith('#')]
+    with open(filename, 'rb') as f:
+        data = f.read()
+    # requirements.txt is saved as UTF-16
+    text = data.decode('utf-16') if data[:2] in (b'\xff\xfe', b'\xfe\xff') else data.decode('utf-8')
+    requirements = [line.strip() for line in text.splitlines() if line.strip() and not line.startswith('#')]
     return requirements
 
+def is_langchain(requirement):
+    name = requirement.split('==')[0].split('>=')[0].strip().lower().replace('_', '-')
+    return name in LANGCHAIN_PACKAGES
+
+requirements = parse_requirements('requirements.txt')
+
 setup(
     name='inspect_ai_scorers',
     version='0.1.8',
@@ -16,17 +27,24 @@ setup(
     author_email='abigail.haddad@gmail.com',
     url='https://github.com/abigailhaddad/inspect_ai_eval',
     license='MIT',
-    packages=find_packages(include=['inspect_ai_scorers', 'tests', 'examples']),
+    packages=find_packages(include=['inspect_ai_scorers', 'tests', 'examples', 'benchmarks']),
     include_package_data=True,  # This should be set to True
     package_data={
         '': ['README.md', 'LICENSE', 'requirements.txt'],
         'tests': ['*.py'],
         'examples': ['*.py'],
+        'benchmarks': ['*.py'],
     },
     exclude_package_data={
         '': ['__pycache__', 'logs/*'],
     },
-    install_requires=parse_requirements('requirements.txt'),
+    install_requires=[r for r in requirements if not is_langchain(r)],
+    extras_require={
+        'langchain': [r for r in requirements if is_langchain(r)],
+    },
+    entry_points={
+        'console_scripts': ['inspect-rescore=inspect_ai_scorers._rescore:main'],
+    },
     classifiers=[
         'Development Status :: 4 - Beta',
         'Environment :: Console',
@@ -0,0 +1,67 @@
+import unittest
+import os
+import sys
+import numpy as np
+from inspect_ai.scorer import Score
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from inspect_ai_scorers._aggregate import ScoreAggregator, micro_groundedness, micro_thoroughness
+from inspect_ai_scorers.fact_comparator import groundedness, thoroughness
+
+
+def fact_score(groundedness_value, thoroughness_value, in_both, only_in_answer, only_in_context):
+    return Score(
+        value={"groundedness": groundedness_value, "thoroughness": thoroughness_value},
+        metadata={"fact_counts": {"in_both": in_both, "only_in_answer": only_in_answer, "only_in_context": only_in_context}},
+    )
+
+
+SCORES = [
+    fact_score(100, 50, 1, 0, 1),
+    fact_score(50, 100, 4, 4, 0),
+    fact_score(0, 0, 0, 2, 3),
+]
+
+
+class TestScoreAggregator(unittest.TestCase):
+    def test_incremental_matches_numpy(self):
+        aggregator = ScoreAggregator()
+        for score in SCORES:
+            aggregator.add(score)
+        snapshot = aggregator.snapshot()
+
+        values = np.array([100, 50, 0], dtype=float)
+        self.assertEqual(snapshot["samples"], 3)
+        self.assertAlmostEqual(snapshot["groundedness"]["mean"], values.mean())
+        self.assertAlmostEqual(snapshot["groundedness"]["variance"], values.var(ddof=1))
+        self.assertAlmostEqual(snapshot["groundedness"]["stderr"], values.std(ddof=1) / np.sqrt(3))
+
+        batch = ScoreAggregator.from_scores(SCORES).snapshot()
+        self.assertAlmostEqual(batch["thoroughness"]["variance"], snapshot["thoroughness"]["variance"])
+
+    def test_micro_averages_pool_fact_counts(self):
+        snapshot = ScoreAggregator.from_scores(SCORES).snapshot()
+        self.assertAlmostEqual(snapshot["micro_groundedness"], 5 / 11 * 100)
+        self.assertAlmostEqual(snapshot["micro_thoroughness"], 5 / 9 * 100)
+        self.assertAlmostEqual(micro_groundedness()(SCORES), 5 / 11 * 100)
+        self.assertAlmostEqual(micro_thoroughness()(SCORES), 5 / 9 * 100)
+
+    def test_merge_and_snapshot_mid_run(self):
+        first = ScoreAggregator()
+        first.add(SCORES[0])
+        self.assertEqual(first.snapshot()["groundedness"]["mean"], 100)
+
+        second = ScoreAggregator.from_scores(SCORES[1:])
+        first.merge(second)
+        self.assertAlmostEqual(first.snapshot()["groundedness"]["variance"], np.var([100, 50, 0], ddof=1))
+
+    def test_non_dict_scores_do_not_bias_the_mean(self):
+        scores = SCORES[:2] + [Score(value="E")]
+        self.assertEqual(groundedness()(scores), 75)
+        self.assertEqual(thoroughness()(scores), 75)
+        self.assertEqual(ScoreAggregator.from_scores(scores).snapshot()["groundedness"]["count"], 2)
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
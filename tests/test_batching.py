@@ -0,0 +1,108 @@
+import unittest
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from inspect_ai_scorers._batching import AdaptiveBatcher
+
+
+class TestAdaptiveBatcher(unittest.TestCase):
+    def setUp(self):
+        self.batches = []
+        self.singles = []
+
+    async def run_batch(self, items):
+        self.batches.append(list(items))
+        return [item * 10 for item in items]
+
+    async def run_one(self, item):
+        self.singles.append(item)
+        return item * 10
+
+    def test_full_batches_are_sent_together(self):
+        batcher = AdaptiveBatcher(self.run_batch, self.run_one, max_batch_size=3, flush_timeout=10)
+
+        async def main():
+            return await asyncio.gather(*(batcher.submit(i) for i in range(6)))
+
+        self.assertEqual(asyncio.run(main()), [0, 10, 20, 30, 40, 50])
+        self.assertEqual(self.batches, [[0, 1, 2], [3, 4, 5]])
+        self.assertEqual(self.singles, [])
+
+    def test_stragglers_flush_after_timeout(self):
+        batcher = AdaptiveBatcher(self.run_batch, self.run_one, max_batch_size=4, flush_timeout=0.01)
+
+        async def main():
+            return await asyncio.gather(*(batcher.submit(i) for i in range(2)))
+
+        self.assertEqual(asyncio.run(main()), [0, 10])
+        self.assertEqual(self.batches, [[0, 1]])
+
+    def test_unresolved_items_fall_back_and_shrink_batches(self):
+        async def partial_batch(items):
+            self.batches.append(list(items))
+            return [None if item == 1 else item * 10 for item in items]
+
+        batcher = AdaptiveBatcher(partial_batch, self.run_one, max_batch_size=4, flush_timeout=0.01)
+
+        async def main():
+            return await asyncio.gather(*(batcher.submit(i) for i in range(4)))
+
+        self.assertEqual(asyncio.run(main()), [0, 10, 20, 30])
+        self.assertEqual(self.singles, [1])
+        self.assertEqual(batcher.batch_size, 2)
+        self.assertEqual(batcher.fallbacks, 1)
+
+    def test_failed_batch_falls_back_to_single_items(self):
+        async def failing_batch(items):
+            raise ValueError("unparseable")
+
+        batcher = AdaptiveBatcher(failing_batch, self.run_one, max_batch_size=2, flush_timeout=0.01)
+
+        async def main():
+            return await asyncio.gather(*(batcher.submit(i) for i in range(2)))
+
+        self.assertEqual(asyncio.run(main()), [0, 10])
+        self.assertEqual(sorted(self.singles), [0, 1])
+        self.assertEqual(batcher.batch_size, 1)
+
+    def test_batching_recovers_after_errors(self):
+        failing = True
+
+        async def flaky_batch(items):
+            self.batches.append(list(items))
+            if failing:
+                raise ValueError("unparseable")
+            return [item * 10 for item in items]
+
+        batcher = AdaptiveBatcher(flaky_batch, self.run_one, max_batch_size=4, flush_timeout=0.01, regrow_after=3)
+
+        async def main():
+            nonlocal failing
+            await asyncio.gather(*(batcher.submit(i) for i in range(4)))
+            await asyncio.gather(*(batcher.submit(i) for i in range(2)))
+            self.assertEqual(batcher.batch_size, 1)
+
+            failing = False
+            for i in range(3):
+                await batcher.submit(i)
+            self.assertEqual(batcher.batch_size, 2)
+            return await asyncio.gather(*(batcher.submit(i) for i in range(8)))
+
+        self.assertEqual(asyncio.run(main()), [i * 10 for i in range(8)])
+        self.assertEqual(batcher.batch_size, 4)
+        self.assertEqual(self.batches[-4:], [[0, 1], [2, 3], [4, 5], [6, 7]])
+
+    def test_single_item_errors_propagate(self):
+        async def failing_one(item):
+            raise RuntimeError("grader down")
+
+        batcher = AdaptiveBatcher(self.run_batch, failing_one, max_batch_size=2, flush_timeout=0.01)
+        with self.assertRaises(RuntimeError):
+            asyncio.run(batcher.submit(1))
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
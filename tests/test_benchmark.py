@@ -0,0 +1,103 @@
+import unittest
+import asyncio
+import json
+import os
+import sys
+from unittest import mock
+from inspect_ai.model import get_model
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.harness import benchmark_scorers, format_results
+from benchmarks.mock_grader import MockGraderError, configure_mock_grader, mock_grader_stats, reset_mock_grader
+
+
+def generate(prompt, **model_args):
+    return asyncio.run(get_model("mockgrader/model", **model_args).generate(prompt)).completion
+
+
+class TestMockGrader(unittest.TestCase):
+    def setUp(self):
+        reset_mock_grader()
+
+    def tearDown(self):
+        reset_mock_grader()
+
+    def test_extracts_one_fact_per_sentence(self):
+        completion = generate("Parse this text into facts:\n<text>\nThe sun is a star. It is old.\n</text>")
+        self.assertEqual(completion, "<facts>\nThe sun is a star.\nIt is old.\n</facts>")
+
+    def test_compares_facts_ignoring_case_and_punctuation(self):
+        completion = generate(
+            'Output "facts_in_both".\n<context>\nThe sun is a star.\nThe sun is old.\n</context>\n'
+            '<answer>\nthe sun is a star\nThe moon is bright.\n</answer>'
+        )
+        self.assertEqual(json.loads(completion), {
+            "facts_in_both": ["the sun is a star"],
+            "facts_only_in_answer": ["The moon is bright."],
+            "facts_only_in_context": ["The sun is old."],
+        })
+
+    def test_matches_fact_ids(self):
+        completion = generate(
+            'Return "matches".\n<context>\nC1: The sun is a star.\nC2: The sun is old.\n</context>\n'
+            '<answer>\nA1: The sun is old.\n</answer>'
+        )
+        self.assertEqual(json.loads(completion), {"matches": [["C2", "A1"]]})
+
+    def test_verdict(self):
+        prompt = "Return PASS or FAIL:\n\nAnswer:\n{answer}\n\nTarget:\nThe sun is a star."
+        self.assertEqual(generate(prompt.format(answer="The sun is a star.")), "PASS")
+        self.assertEqual(generate(prompt.format(answer="The moon is a star.")), "FAIL")
+
+    def test_canned_responses_take_precedence(self):
+        self.assertEqual(generate("<text>\nAnything.\n</text>", responses={"Anything": "canned"}), "canned")
+
+    def test_injected_errors_are_counted(self):
+        configure_mock_grader(error_rate=1.0)
+        with self.assertRaises(MockGraderError):
+            generate("<text>\nThe sun is a star.\n</text>")
+        self.assertEqual(mock_grader_stats()["errors"], 1)
+
+    def test_reports_token_usage(self):
+        output = asyncio.run(get_model("mockgrader/model").generate("<text>\nThe sun is a star.\n</text>"))
+        self.assertGreater(output.usage.input_tokens, 0)
+        self.assertEqual(output.usage.total_tokens, output.usage.input_tokens + output.usage.output_tokens)
+
+
+class TestBenchmark(unittest.TestCase):
+    def tearDown(self):
+        reset_mock_grader()
+
+    def test_reports_throughput_latency_and_calls(self):
+        results = benchmark_scorers(scorers=("fact_scorer", "prompt_scorer"), concurrency=(1, 4), samples=8, latency=0.001)
+
+        self.assertEqual([(result.scorer, result.concurrency) for result in results], [
+            ("fact_scorer", 1), ("fact_scorer", 4), ("prompt_scorer", 1), ("prompt_scorer", 4),
+        ])
+        for result in results:
+            self.assertEqual(result.errors, 0)
+            self.assertGreater(result.samples_per_second, 0)
+            self.assertLessEqual(result.p50, result.p95)
+            self.assertLessEqual(result.p95, result.p99)
+        # two extractions and a compare per sample, one verdict per sample
+        self.assertEqual(results[0].grader_calls_per_sample, 3)
+        self.assertEqual(results[2].grader_calls_per_sample, 1)
+        self.assertIn("fact_scorer", format_results(results))
+
+    def test_fact_comparator_runs_with_an_active_model(self):
+        with mock.patch.dict(os.environ, clear=False):
+            os.environ.pop("INSPECT_EVAL_MODEL", None)
+            results = benchmark_scorers(scorers=("fact_comparator_scorer",), concurrency=(2,), samples=4, latency=0.001)
+            self.assertNotIn("INSPECT_EVAL_MODEL", os.environ)
+
+        self.assertEqual(results[0].errors, 0)
+        self.assertEqual(results[0].grader_calls_per_sample, 3)
+
+    def test_counts_failed_samples(self):
+        results = benchmark_scorers(scorers=("prompt_scorer",), concurrency=(2,), samples=4, error_rate=1.0)
+        self.assertEqual(results[0].errors, 4)
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
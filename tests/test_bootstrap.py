@@ -0,0 +1,99 @@
+import unittest
+import os
+import sys
+import time
+from types import SimpleNamespace
+import numpy as np
+from inspect_ai.scorer import Score
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from unittest import mock
+
+from inspect_ai_scorers import _bootstrap
+from inspect_ai_scorers._bootstrap import bootstrap_ci, bootstrap_means, ci_bounds, ci_lower, ci_upper, paired_bootstrap
+
+
+def fake_log(values):
+    # only the sample fields the paired bootstrap reads
+    return SimpleNamespace(samples=[
+        SimpleNamespace(id=i, epoch=1, scores={"fact_scorer": Score(value={"groundedness": value, "thoroughness": 100})})
+        for i, value in enumerate(values)
+    ])
+
+
+class TestBootstrap(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(1)
+        # skewed percentages of small fact counts, like real groundedness scores
+        self.values = np.round(100 * rng.binomial(3, 0.85, size=500) / 3, 2)
+
+    def test_interval_brackets_the_mean(self):
+        for method in ("percentile", "bca"):
+            lower, upper = bootstrap_ci(self.values, method=method)
+            self.assertLess(lower, self.values.mean())
+            self.assertGreater(upper, self.values.mean())
+            self.assertLessEqual(upper, 100)
+
+    def test_interval_matches_index_resampling(self):
+        rng = np.random.default_rng(2)
+        means = self.values[rng.integers(0, self.values.size, size=(4000, self.values.size))].mean(axis=1)
+        expected = np.quantile(means, [0.025, 0.975])
+        lower, upper = bootstrap_ci(self.values, method="percentile")
+        self.assertAlmostEqual(lower, expected[0], delta=0.5)
+        self.assertAlmostEqual(upper, expected[1], delta=0.5)
+
+    def test_degenerate_inputs(self):
+        self.assertEqual(bootstrap_ci(np.full(10, 100.0)), (100.0, 100.0))
+        self.assertTrue(np.isnan(bootstrap_ci(np.array([]))[0]))
+        with self.assertRaises(ValueError):
+            bootstrap_ci(self.values, method="normal")
+
+    def test_metrics_are_reproducible(self):
+        scores = [Score(value=value) for value in self.values]
+        self.assertEqual(ci_lower()(scores), ci_lower()(scores))
+        self.assertLess(ci_lower()(scores), ci_upper()(scores))
+
+    def test_continuous_values_resample_indices(self):
+        # every value distinct, so the resamples are drawn as indices
+        values = np.random.default_rng(4).normal(80, 10, size=2000)
+        means = bootstrap_means(values, resamples=4000)
+        self.assertAlmostEqual(means.mean(), values.mean(), delta=0.1)
+        self.assertAlmostEqual(means.std(), values.std() / np.sqrt(values.size), delta=0.02)
+
+    def test_bounds_share_one_bootstrap(self):
+        scores = [Score(value=value) for value in self.values + 0.5]
+        lower_metric, upper_metric = ci_bounds()
+        with mock.patch.object(_bootstrap, "bootstrap_means", wraps=_bootstrap.bootstrap_means) as resample:
+            lower, upper = lower_metric(scores), upper_metric(scores)
+            # a new list of scores, even an equal one, is bootstrapped again
+            self.assertEqual(lower_metric(list(scores)), lower)
+        self.assertEqual(resample.call_count, 2)
+        self.assertEqual((lower, upper), bootstrap_ci(self.values + 0.5))
+
+    def test_separate_metrics_do_not_share_an_interval(self):
+        scores = [Score(value=value) for value in self.values]
+        self.assertEqual(ci_lower(confidence=0.5)(scores), bootstrap_ci(self.values, confidence=0.5)[0])
+        self.assertEqual(ci_lower(confidence=0.99)(scores), bootstrap_ci(self.values, confidence=0.99)[0])
+
+    def test_large_runs_are_fast(self):
+        values = np.round(100 * np.random.default_rng(3).binomial(5, 0.7, size=100_000) / 5, 2)
+        start = time.perf_counter()
+        bootstrap_ci(values, resamples=10_000)
+        self.assertLess(time.perf_counter() - start, 1.0)
+
+    def test_paired_bootstrap(self):
+        baseline = fake_log(self.values)
+        improved = fake_log(np.minimum(100, self.values + 10))
+        result = paired_bootstrap(baseline, improved)
+        self.assertEqual(result.samples, self.values.size)
+        self.assertGreater(result.ci_lower, 0)
+        self.assertLess(result.p_value, 0.01)
+
+        unchanged = paired_bootstrap(baseline, fake_log(self.values))
+        self.assertEqual(unchanged.mean_difference, 0)
+        self.assertEqual(unchanged.p_value, 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
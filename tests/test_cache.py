@@ -0,0 +1,142 @@
+import unittest
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from inspect_ai_scorers._cache import FactCache, cache_key
+
+
+class TestFactCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "facts.sqlite")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_key_depends_on_every_component(self):
+        base = cache_key("prompt {text}", "openai/gpt-4", {"temperature": 0}, "text")
+        self.assertEqual(base, cache_key("prompt {text}", "openai/gpt-4", {"temperature": 0}, "text"))
+        self.assertNotEqual(base, cache_key("other {text}", "openai/gpt-4", {"temperature": 0}, "text"))
+        self.assertNotEqual(base, cache_key("prompt {text}", "openai/gpt-4o", {"temperature": 0}, "text"))
+        self.assertNotEqual(base, cache_key("prompt {text}", "openai/gpt-4", {"temperature": 1}, "text"))
+        self.assertNotEqual(base, cache_key("prompt {text}", "openai/gpt-4", {"temperature": 0}, "other"))
+
+    def test_comparator_keys_parsed_facts_by_model_and_config(self):
+        from langchain_core.language_models import FakeListChatModel
+        from inspect_ai.model import GenerateConfig, get_model
+        from inspect_ai.model._model import active_model_context_var
+        from inspect_ai_scorers._langchain import InspectChatModel
+        from inspect_ai_scorers.fact_comparator import FactComparator
+
+        async def parse(comparator, model=None):
+            if model is not None:
+                active_model_context_var.set(model)
+            cache_stats = {"hits": 0, "misses": 0}
+            for _ in range(2):
+                await comparator._parse_chunk("The sky is blue.", cache_stats)
+            return cache_stats
+
+        # a LangChain model without a "model_name" parameter
+        comparator = FactComparator(FakeListChatModel(responses=["<facts>\nThe sky is blue.\n</facts>"]), cache=FactCache(path=self.path))
+        self.assertEqual(asyncio.run(parse(comparator)), {"hits": 1, "misses": 1})
+        comparator.cache.close()
+
+        comparator = FactComparator(InspectChatModel(), cache=FactCache(path=self.path))
+        for temperature in (0.0, 1.0):
+            model = get_model("mockllm/model", config=GenerateConfig(temperature=temperature))
+            self.assertEqual(asyncio.run(parse(comparator, model)), {"hits": 1, "misses": 1})
+        comparator.cache.close()
+
+    def test_hits_and_misses(self):
+        cache = FactCache(path=self.path)
+        self.assertIsNone(cache.get("key"))
+        cache.set("key", "<facts>\nA fact.\n</facts>")
+        self.assertEqual(cache.get("key"), "<facts>\nA fact.\n</facts>")
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        cache.close()
+
+    def test_disk_tier_survives_restart(self):
+        cache = FactCache(path=self.path)
+        cache.set("key", "value")
+        cache.close()
+
+        reopened = FactCache(path=self.path)
+        self.assertEqual(reopened.get("key"), "value")
+        reopened.close()
+
+    def test_memory_tier_is_bounded(self):
+        cache = FactCache(path=self.path, max_entries=2)
+        for key in ["a", "b", "c"]:
+            cache.set(key, key)
+        self.assertEqual(list(cache._memory), ["b", "c"])
+        # evicted from memory but still served from disk
+        self.assertEqual(cache.get("a"), "a")
+        cache.close()
+
+    def test_disk_tier_evicts_least_recently_used(self):
+        cache = FactCache(path=self.path, max_disk_bytes=10)
+        cache.set("a", "12345")
+        time.sleep(0.01)
+        cache.set("b", "12345")
+        time.sleep(0.01)
+        cache.set("c", "12345")
+        keys = [row[0] for row in cache._db.execute("SELECT key FROM facts")]
+        self.assertEqual(sorted(keys), ["b", "c"])
+        cache.close()
+
+    def test_memory_hits_keep_entries_on_disk(self):
+        cache = FactCache(path=self.path, max_disk_bytes=10)
+        cache.set("a", "12345")
+        time.sleep(0.01)
+        cache.set("b", "12345")
+        time.sleep(0.01)
+        # served from memory, but still the most recently used entry on disk
+        self.assertEqual(cache.get("a"), "12345")
+        time.sleep(0.01)
+        cache.set("c", "12345")
+        keys = [row[0] for row in cache._db.execute("SELECT key FROM facts")]
+        self.assertEqual(sorted(keys), ["a", "c"])
+        cache.close()
+
+    def test_disk_size_is_tracked_without_rescanning(self):
+        cache = FactCache(path=self.path, max_disk_bytes=12)
+        for key, value in [("a", "1234"), ("b", "1234"), ("a", "123456"), ("c", "1234")]:
+            cache.set(key, value)
+        (total,) = cache._db.execute("SELECT SUM(size) FROM facts").fetchone()
+        self.assertEqual(cache._disk_bytes, total)
+        self.assertLessEqual(total, 12)
+        cache.close()
+
+        reopened = FactCache(path=self.path)
+        self.assertEqual(reopened._disk_bytes, total)
+        reopened.close()
+
+    def test_async_lookups(self):
+        cache = FactCache(path=self.path, max_entries=1)
+
+        async def run():
+            self.assertIsNone(await cache.aget("a"))
+            await cache.aset("a", "1")
+            await cache.aset("b", "2")
+            # "a" was evicted from memory, so this one is read from disk
+            return await cache.aget("a"), await cache.aget("b")
+
+        self.assertEqual(asyncio.run(run()), ("1", "2"))
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+        cache.close()
+
+    def test_expired_entries_are_misses(self):
+        cache = FactCache(path=self.path, ttl=0.01)
+        cache.set("key", "value")
+        time.sleep(0.02)
+        self.assertIsNone(cache.get("key"))
+        cache.close()
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
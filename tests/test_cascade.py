@@ -0,0 +1,131 @@
+import unittest
+import asyncio
+import os
+import sys
+from inspect_ai.model import ModelOutput, get_model
+from inspect_ai.scorer import Score
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.harness import synthetic_samples
+from benchmarks.mock_grader import reset_mock_grader
+from inspect_ai_scorers._cascade import cascade_summary, cheap_tier, escalation_rate
+from inspect_ai_scorers._fact_scorer import fact_scorer
+from inspect_ai_scorers._metrics import scorer_metrics
+from inspect_ai_scorers._parsing import ComparisonParseError
+from inspect_ai_scorers._verdict import verdict_uncertainty
+from inspect_ai_scorers.prompt_evaluator import prompt_scorer
+
+
+def verdict(content):
+    return ModelOutput.from_content(model="mockgrader", content=content)
+
+
+def cascade_score(escalated, cheap, expensive=None):
+    stages = {"cascade": cheap}
+    if expensive is not None:
+        stages["escalation"] = expensive
+    reason = "low_margin" if escalated else None
+    return Score(value="C", metadata={"cascade": {"model": "mockgrader/cheap", "escalated": escalated, "reason": reason}, "stages": stages})
+
+
+class TestVerdictUncertainty(unittest.TestCase):
+    def test_reasons(self):
+        self.assertIsNone(verdict_uncertainty([verdict("PASS"), verdict("PASS")], 0.5))
+        self.assertEqual(verdict_uncertainty([verdict("PASS"), verdict("FAIL")], 0.5), "disagreement")
+        self.assertEqual(verdict_uncertainty([verdict("PASS"), verdict("Maybe")], 0.5), "parse_failure")
+
+
+class TestCascadeScorers(unittest.TestCase):
+    def setUp(self):
+        reset_mock_grader()
+        scorer_metrics.reset()
+
+    def tearDown(self):
+        reset_mock_grader()
+        scorer_metrics.reset()
+
+    def test_confident_cheap_verdict_stands(self):
+        state, target = synthetic_samples(1)[0]
+        scorer = prompt_scorer("mockgrader/expensive", cascade_model="mockgrader/cheap", fast_verdict=True)
+        score = asyncio.run(scorer(state, target))
+
+        self.assertEqual(score.value, "I")
+        self.assertEqual(score.metadata["cascade"], {"model": "mockgrader/cheap", "escalated": False, "reason": None})
+        self.assertEqual({vote["grader"] for vote in score.metadata["votes"]}, {"mockgrader/cheap"})
+        self.assertEqual(score.metadata["grader_calls"], 2)
+        self.assertNotIn("escalation", score.metadata["stages"])
+
+    def test_low_margin_is_escalated(self):
+        state, target = synthetic_samples(1)[0]
+        cheap = get_model("mockgrader/cheap", verdict_confidence=0.6)
+        score = asyncio.run(prompt_scorer("mockgrader/expensive", cascade_model=cheap, fast_verdict=True)(state, target))
+
+        self.assertEqual(score.metadata["cascade"]["reason"], "low_margin")
+        self.assertEqual([vote["grader"] for vote in score.metadata["votes"]], ["mockgrader/expensive"])
+        self.assertEqual(score.metadata["grader_calls"], 3)
+        self.assertEqual(score.metadata["stages"]["escalation"]["calls"], 1)
+        self.assertIn('inspect_scorer_escalations_total{scorer="prompt_scorer",reason="low_margin"} 1', scorer_metrics.render())
+
+    def test_unparseable_compare_is_escalated(self):
+        state, target = synthetic_samples(1)[0]
+        cheap = get_model("mockgrader/cheap", malformed_rate=1.0)
+        score = asyncio.run(fact_scorer("mockgrader/expensive", cascade_model=cheap)(state, target))
+
+        self.assertEqual(score.metadata["cascade"]["reason"], "parse_failure")
+        self.assertEqual(score.metadata["fact_counts"], {"in_both": 3, "only_in_answer": 1, "only_in_context": 1})
+        self.assertEqual(score.metadata["stages"]["escalation"]["calls"], 1)
+
+    def test_agreeing_compares_stand(self):
+        state, target = synthetic_samples(1)[0]
+        score = asyncio.run(fact_scorer("mockgrader/expensive", compare_mode="ids", cascade_model="mockgrader/cheap")(state, target))
+
+        self.assertFalse(score.metadata["cascade"]["escalated"])
+        self.assertEqual(score.metadata["stages"]["cascade"]["calls"], 2)
+        self.assertEqual(score.value["thoroughness"], 75)
+
+    def test_parse_failure_cancels_the_other_cheap_calls(self):
+        cancelled = []
+
+        async def unparseable():
+            raise ComparisonParseError("not JSON")
+
+        async def slow():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+            return "late"
+
+        async def run():
+            return await asyncio.wait_for(cheap_tier([slow, unparseable, slow], lambda results: None), timeout=5)
+
+        self.assertEqual(asyncio.run(run()), ([], "parse_failure", 1))
+        self.assertEqual(cancelled, [True, True])
+
+    def test_cascade_requires_unbatched_compares(self):
+        with self.assertRaises(ValueError):
+            fact_scorer("mockgrader/expensive", compare_mode="ids", compare_batch_size=8, cascade_model="mockgrader/cheap")
+
+
+class TestCascadeSummary(unittest.TestCase):
+    def test_escalation_rate_and_savings(self):
+        cheap = {"calls": 2, "input_tokens": 200, "output_tokens": 2, "seconds": 0.1}
+        expensive = {"calls": 1, "input_tokens": 100, "output_tokens": 1, "seconds": 1.0}
+        scores = [cascade_score(False, cheap), cascade_score(False, cheap), cascade_score(False, cheap), cascade_score(True, cheap, expensive)]
+
+        summary = cascade_summary(scores, cheap_price=(1.0, 1.0), expensive_price=(10.0, 10.0))
+        self.assertEqual(summary["escalation_rate"], 0.25)
+        self.assertEqual(summary["reasons"], {"low_margin": 1})
+        self.assertEqual(summary["expensive"]["calls"], 1)
+        # 808 cheap tokens at $1/M and 101 expensive at $10/M, against 404 expensive tokens
+        self.assertAlmostEqual(summary["cost"], 1818e-6)
+        self.assertAlmostEqual(summary["baseline_cost"], 4040e-6)
+        self.assertAlmostEqual(summary["mean_seconds"], 1.4 / 4)
+        self.assertAlmostEqual(summary["latency_savings"], 1 - 0.35)
+        self.assertEqual(escalation_rate()(scores), 0.25)
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
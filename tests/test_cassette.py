@@ -0,0 +1,117 @@
+import unittest
+import asyncio
+import json
+import os
+import sys
+import tempfile
+from unittest import mock
+from inspect_ai.model import get_model
+from inspect_ai.scorer import Target
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.harness import synthetic_samples
+from benchmarks.mock_grader import configure_mock_grader, mock_grader_stats, reset_mock_grader
+from inspect_ai_scorers._cassette import Cassette, CassetteMissError
+from inspect_ai_scorers._fact_scorer import fact_scorer
+from inspect_ai_scorers.prompt_evaluator import prompt_scorer
+
+
+def record(path, scorer_factory, samples):
+    with Cassette(path, "record") as cassette:
+        scorer = scorer_factory(cassette)
+        return [asyncio.run(scorer(state, target)) for state, target in samples]
+
+
+class TestCassette(unittest.TestCase):
+    def setUp(self):
+        reset_mock_grader()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "grader.jsonl")
+        self.model = get_model("mockgrader/model")
+
+    def tearDown(self):
+        reset_mock_grader()
+        self.tmpdir.cleanup()
+
+    def test_replay_serves_recorded_responses_without_calling_the_model(self):
+        samples = synthetic_samples(2)
+        recorded = record(self.path, lambda cassette: fact_scorer(self.model, cassette=cassette), samples)
+        calls = mock_grader_stats()["calls"]
+
+        # any call reaching the model would now fail
+        configure_mock_grader(error_rate=1.0)
+        cassette = Cassette(self.path)
+        scorer = fact_scorer(self.model, cassette=cassette)
+        replayed = [asyncio.run(scorer(state, target)) for state, target in samples]
+
+        self.assertEqual([score.value for score in replayed], [score.value for score in recorded])
+        self.assertEqual(mock_grader_stats()["calls"], calls)
+        self.assertEqual(cassette.stats(), {"entries": 6, "hits": 6, "misses": 0, "recorded": 0})
+
+    def test_closed_cassettes_leave_no_exit_hook(self):
+        with mock.patch("atexit.register") as register, mock.patch("atexit.unregister") as unregister:
+            record(self.path, lambda cassette: prompt_scorer(self.model, cassette=cassette), synthetic_samples(1))
+        self.assertEqual(register.call_count, 1)
+        self.assertEqual(unregister.call_args_list, register.call_args_list)
+
+    def test_entries_keep_the_request(self):
+        record(self.path, lambda cassette: prompt_scorer(self.model, cassette=cassette), synthetic_samples(1))
+        with open(self.path, encoding="utf-8") as file:
+            entry = json.loads(file.readline())
+        self.assertEqual(entry["request"][0], "mockgrader/model")
+        self.assertIn("Item 0 has property 0.", entry["request"][2])
+        self.assertIn("FAIL", entry["response"]["choices"][0]["message"]["content"])
+
+    def test_strict_replay_fails_on_a_miss(self):
+        record(self.path, lambda cassette: prompt_scorer(self.model, cassette=cassette), synthetic_samples(1))
+        scorer = prompt_scorer(self.model, cassette=self.path)
+        state, _ = synthetic_samples(1)[0]
+        with self.assertRaises(CassetteMissError):
+            asyncio.run(scorer(state, Target("A different target.")))
+
+    def test_strict_replay_requires_a_cassette(self):
+        with self.assertRaises(FileNotFoundError):
+            Cassette(self.path, "replay")
+
+    def test_lenient_replay_falls_through_and_records(self):
+        samples = synthetic_samples(2)
+        record(self.path, lambda cassette: prompt_scorer(self.model, cassette=cassette), samples[:1])
+
+        with Cassette(self.path, "lenient") as cassette:
+            scorer = prompt_scorer(self.model, cassette=cassette)
+            for state, target in samples:
+                asyncio.run(scorer(state, target))
+            self.assertEqual(cassette.stats(), {"entries": 2, "hits": 1, "misses": 1, "recorded": 1})
+
+        self.assertEqual(len(Cassette(self.path)), 2)
+
+    def test_truncated_cassette_keeps_earlier_entries(self):
+        record(self.path, lambda cassette: prompt_scorer(self.model, cassette=cassette), synthetic_samples(3))
+        with open(self.path, "rb") as file:
+            data = file.read()
+        with open(self.path, "wb") as file:
+            file.write(data[:-20])
+
+        self.assertEqual(len(Cassette(self.path)), 2)
+
+    def test_session_after_a_crash_keeps_every_entry(self):
+        samples = synthetic_samples(3)
+        record(self.path, lambda cassette: prompt_scorer(self.model, cassette=cassette), samples[:2])
+        # a session that died partway through writing its entry
+        with open(self.path, "rb") as file:
+            data = file.read()
+        with open(self.path, "wb") as file:
+            file.write(data[:-20])
+
+        with Cassette(self.path, "lenient") as cassette:
+            scorer = prompt_scorer(self.model, cassette=cassette)
+            for state, target in samples:
+                asyncio.run(scorer(state, target))
+            self.assertEqual(cassette.stats(), {"entries": 3, "hits": 1, "misses": 2, "recorded": 2})
+
+        self.assertEqual(len(Cassette(self.path)), 3)
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
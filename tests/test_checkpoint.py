@@ -0,0 +1,127 @@
+import unittest
+import asyncio
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+from unittest import mock
+from inspect_ai.model import get_model
+from inspect_ai.scorer import Score, Target
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.harness import synthetic_samples
+from benchmarks.mock_grader import MockGraderError, mock_grader_stats, reset_mock_grader
+from inspect_ai_scorers import _fact_scorer
+from inspect_ai_scorers._checkpoint import ScoreCheckpoint
+from inspect_ai_scorers._fact_scorer import fact_scorer
+from inspect_ai_scorers.prompt_evaluator import prompt_scorer
+
+
+def score_all(scorer, samples):
+    return [asyncio.run(scorer(state, target)) for state, target in samples]
+
+
+class TestScoreCheckpoint(unittest.TestCase):
+    def setUp(self):
+        reset_mock_grader()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "checkpoint.sqlite")
+        self.model = get_model("mockgrader/model")
+
+    def tearDown(self):
+        reset_mock_grader()
+        self.tmpdir.cleanup()
+
+    def test_resumed_run_serves_scored_samples(self):
+        samples = synthetic_samples(3)
+        with ScoreCheckpoint(self.path) as checkpoint:
+            scored = score_all(fact_scorer(self.model, checkpoint=checkpoint), samples[:2])
+        calls = mock_grader_stats()["calls"]
+
+        # the rerun only calls the grader for the sample that wasn't scored
+        with ScoreCheckpoint(self.path) as checkpoint:
+            resumed = score_all(fact_scorer(self.model, checkpoint=checkpoint), samples)
+            self.assertEqual(checkpoint.stats()["restored"], 2)
+
+        self.assertEqual([score.value for score in resumed[:2]], [score.value for score in scored])
+        self.assertEqual(resumed[0].explanation, scored[0].explanation)
+        self.assertEqual(mock_grader_stats()["calls"], calls + 3)
+
+    def test_changed_target_is_scored_again(self):
+        state, target = synthetic_samples(1)[0]
+        with ScoreCheckpoint(self.path) as checkpoint:
+            scorer = prompt_scorer(self.model, checkpoint=checkpoint)
+            asyncio.run(scorer(state, target))
+            asyncio.run(scorer(state, Target("A different target.")))
+            self.assertEqual(checkpoint.stats()["restored"], 0)
+            self.assertEqual(len(checkpoint), 2)
+
+    def test_fact_lists_are_kept_with_the_score(self):
+        state, target = synthetic_samples(1)[0]
+        with ScoreCheckpoint(self.path) as checkpoint:
+            asyncio.run(fact_scorer(self.model, checkpoint=checkpoint)(state, target))
+            checkpoint.flush()
+            with sqlite3.connect(self.path) as reader:
+                (content,) = reader.execute("SELECT content_hash FROM scores").fetchone()
+            facts = checkpoint.facts(state.sample_id, state.epoch, content)
+        self.assertIn("Item 0 has property 0.", facts["target_facts"])
+        self.assertEqual(set(facts["comparison"]), {"facts_in_both", "facts_only_in_answer", "facts_only_in_context"})
+
+    def test_changed_prompt_is_scored_again(self):
+        samples = synthetic_samples(1)
+        with ScoreCheckpoint(self.path) as checkpoint:
+            score_all(fact_scorer(self.model, checkpoint=checkpoint), samples)
+            with mock.patch.object(_fact_scorer, "compare_prompt", _fact_scorer.compare_prompt + "\nBe strict."):
+                score_all(fact_scorer(self.model, checkpoint=checkpoint), samples)
+            score_all(fact_scorer(self.model, checkpoint=checkpoint, chunk_tokens=512), samples)
+            self.assertEqual(checkpoint.stats()["restored"], 0)
+            self.assertEqual(len(checkpoint), 3)
+
+    def test_writes_are_committed_in_batches(self):
+        checkpoint = ScoreCheckpoint(self.path, batch_size=2, flush_interval=3600)
+        for sample_id in range(3):
+            checkpoint.put(sample_id, 1, "hash", Score(value=sample_id))
+        # commits run on the writer thread
+        checkpoint.wait()
+
+        self.assertEqual(checkpoint.stats(), {"restored": 0, "written": 3, "commits": 1, "pending": 1})
+        # buffered scores are already served, committed ones are visible to other readers
+        self.assertEqual(checkpoint.get(2, 1, "hash").value, 2)
+        with sqlite3.connect(self.path) as reader:
+            self.assertEqual(reader.execute("SELECT COUNT(*) FROM scores").fetchone()[0], 2)
+
+        checkpoint.close()
+        checkpoint.close()
+        with sqlite3.connect(self.path) as reader:
+            self.assertEqual(reader.execute("SELECT COUNT(*) FROM scores").fetchone()[0], 3)
+
+    def test_lookups_do_not_wait_for_a_commit(self):
+        with ScoreCheckpoint(self.path) as checkpoint:
+            checkpoint.put("case1", 1, "hash", Score(value="C"))
+            checkpoint.flush()
+
+            # a commit holding the writer's connection, as during its fsync
+            with checkpoint._db_lock:
+                checkpoint._db.execute("BEGIN IMMEDIATE")
+                checkpoint._db.execute("INSERT INTO scores VALUES ('other', NULL, NULL, 'hash', '{}', NULL, 0)")
+                result = []
+                reader = threading.Thread(target=lambda: result.append(asyncio.run(checkpoint.aget("case1", 1, "hash"))))
+                reader.start()
+                reader.join(timeout=5)
+                checkpoint._db.execute("ROLLBACK")
+
+            self.assertFalse(reader.is_alive())
+            self.assertEqual(result[0].value, "C")
+
+    def test_failed_samples_are_not_checkpointed(self):
+        state, target = synthetic_samples(1)[0]
+        with ScoreCheckpoint(self.path) as checkpoint:
+            with self.assertRaises(MockGraderError):
+                asyncio.run(prompt_scorer(get_model("mockgrader/model", error_rate=1.0), checkpoint=checkpoint)(state, target))
+            self.assertEqual(len(checkpoint), 0)
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
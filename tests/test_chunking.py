@@ -0,0 +1,67 @@
+import unittest
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from inspect_ai_scorers._chunking import count_tokens, extract_chunked, merge_facts, split_text
+from inspect_ai_scorers._facts import parse_facts
+
+TEXT = (
+    "The sun is 4.6 billion years old. It is a mid-sized star.\n\n"
+    "The Earth orbits the sun. A year on Earth lasts 365 days. "
+    "The moon orbits the Earth."
+)
+
+
+class TestSplitText(unittest.TestCase):
+    def test_short_text_is_one_chunk(self):
+        self.assertEqual(split_text(TEXT, max_tokens=1000), [TEXT])
+
+    def test_chunks_respect_budget_and_sentences(self):
+        chunks = split_text(TEXT, max_tokens=15)
+        self.assertGreater(len(chunks), 1)
+        for chunk in chunks:
+            self.assertLessEqual(count_tokens(chunk), 15)
+            self.assertTrue(chunk.endswith("."))
+        self.assertEqual(" ".join(chunks).split(), TEXT.split())
+
+    def test_overlap_repeats_trailing_sentences(self):
+        chunks = split_text(TEXT, max_tokens=20, overlap=8)
+        for previous, chunk in zip(chunks, chunks[1:]):
+            last_sentence = previous.split(". ")[-1].split("\n")[-1]
+            self.assertTrue(chunk.startswith(last_sentence))
+
+    def test_long_sentence_is_split_between_words(self):
+        chunks = split_text("word " * 50, max_tokens=10)
+        self.assertEqual(len(chunks), 5)
+
+    def test_invalid_budgets(self):
+        with self.assertRaises(ValueError):
+            split_text(TEXT, max_tokens=10, overlap=10)
+
+
+class TestMergeFacts(unittest.TestCase):
+    def test_duplicates_are_dropped(self):
+        merged = merge_facts([
+            ["The sun is a star.", "The sun is old."],
+            ["the sun is a star", "The Earth orbits the sun."],
+        ])
+        self.assertEqual(merged, ["The sun is a star.", "The sun is old.", "The Earth orbits the sun."])
+
+    def test_extract_chunked(self):
+        seen = []
+
+        async def extract(chunk):
+            seen.append(chunk)
+            return "<facts>\n" + chunk.replace(". ", ".\n") + "\n</facts>"
+
+        facts = parse_facts(asyncio.run(extract_chunked(TEXT, extract, max_tokens=15, overlap=8)))
+        self.assertGreater(len(seen), 1)
+        self.assertEqual(len(facts), len(set(facts)))
+        self.assertIn("The moon orbits the Earth.", facts)
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
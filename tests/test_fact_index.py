@@ -0,0 +1,140 @@
+import unittest
+import asyncio
+import json
+import os
+import sys
+import tempfile
+from unittest import mock
+from inspect_ai.dataset import Sample
+from inspect_ai.model import ChatMessageUser, ModelOutput, get_model
+from inspect_ai.scorer import Target
+from inspect_ai.solver import TaskState
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from inspect_ai_scorers._fact_index import FactIndex, build_fact_index, build_fact_index_async, write_fact_index
+from inspect_ai_scorers._fact_scorer import fact_prompt, fact_scorer
+
+
+def mock_output(content):
+    return ModelOutput.from_content(model="mockllm", content=content)
+
+
+class TestFactIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "targets.idx")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_lookup_round_trip(self):
+        entries = [(i, f"target {i}", [f"fact {i}a", f"fact {i}b"]) for i in range(1, 200)]
+        entries.append(("named", "named target", []))
+        write_fact_index(self.path, entries, prompt=fact_prompt, model="mockllm/model")
+
+        index = FactIndex(self.path)
+        for sample_id, target, facts in entries:
+            self.assertEqual(index.lookup(sample_id, target), facts)
+        self.assertEqual(index.entry_count, len(entries))
+        index.close()
+
+    def test_missing_and_stale_entries(self):
+        write_fact_index(self.path, [("case1", "The sun is old.", ["The sun is old."])], prompt=fact_prompt, model="mockllm/model")
+
+        index = FactIndex(self.path)
+        self.assertIsNone(index.lookup("case2", "The sun is old."))
+        self.assertIsNone(index.lookup("case1", "The sun is young."))
+        self.assertTrue(index.matches_prompt(fact_prompt))
+        self.assertFalse(index.matches_prompt("A different prompt {text}"))
+        self.assertTrue(index.matches_model("mockllm/model"))
+        self.assertFalse(index.matches_model("openai/gpt-4"))
+        index.close()
+
+    def test_index_from_another_model_is_ignored(self):
+        write_fact_index(self.path, [("case1", "The sun is old.", ["The sun is old."])], prompt=fact_prompt, model="openai/gpt-4")
+        index = FactIndex(self.path)
+
+        with self.assertLogs("inspect_ai_scorers._fact_scorer", level="WARNING") as logs:
+            fact_scorer(get_model("mockllm/model"), target_index=index)
+        self.assertIn("different fact model", logs.output[0])
+        index.close()
+
+    def test_index_is_closed_at_exit_or_by_close(self):
+        write_fact_index(self.path, [("case1", "The sun is old.", ["The sun is old."])], prompt=fact_prompt, model="mockllm/model")
+
+        with mock.patch("inspect_ai_scorers._fact_index.atexit") as hooks:
+            index = FactIndex(self.path)
+            hooks.register.assert_called_once_with(index.close)
+            index.close()
+            index.close()
+        hooks.unregister.assert_called_once_with(index.close)
+
+    def test_ignored_index_opened_from_a_path_is_closed(self):
+        write_fact_index(self.path, [("case1", "The sun is old.", ["The sun is old."])], prompt=fact_prompt, model="openai/gpt-4")
+
+        with mock.patch("inspect_ai_scorers._fact_index.atexit") as hooks, self.assertLogs("inspect_ai_scorers._fact_scorer", level="WARNING"):
+            fact_scorer(get_model("mockllm/model"), target_index=self.path)
+        hooks.unregister.assert_called_once()
+
+    def test_unknown_files_are_rejected(self):
+        with open(self.path, "wb") as f:
+            f.write(b"FACTIDX1" + bytes(64))
+        with self.assertRaisesRegex(ValueError, "not a fact index"):
+            FactIndex(self.path)
+
+    def test_build_inside_a_running_loop(self):
+        dataset = [Sample(input="How old is the sun?", target="The sun is old.", id="case1")]
+        model = get_model("mockllm/model", custom_outputs=[mock_output("<facts>\nThe sun is old.\n</facts>")])
+
+        async def main():
+            return await build_fact_index_async(dataset, self.path, model=model)
+
+        self.assertEqual(asyncio.run(main()), 1)
+        index = FactIndex(self.path)
+        self.assertEqual(index.lookup("case1", "The sun is old."), ["The sun is old."])
+        self.assertTrue(index.matches_model(str(model)))
+        index.close()
+
+    def test_build_and_score_from_index(self):
+        dataset = [
+            Sample(input="How old is the sun?", target="The sun is 4.6 billion years old.", id="case1"),
+            Sample(input="How big is the sun?", target="The sun is a mid-sized star."),
+        ]
+        model = get_model("mockllm/model", custom_outputs=[
+            mock_output("<facts>\nThe sun is 4.6 billion years old.\n</facts>"),
+            mock_output("<facts>\nThe sun is a mid-sized star.\n</facts>"),
+        ])
+        self.assertEqual(build_fact_index(dataset, self.path, model=model), 2)
+
+        index = FactIndex(self.path)
+        self.assertEqual(index.lookup("case1", "The sun is 4.6 billion years old."), ["The sun is 4.6 billion years old."])
+        self.assertEqual(index.lookup(2, "The sun is a mid-sized star."), ["The sun is a mid-sized star."])
+
+        # only the answer extraction and the compare call reach the model
+        comparison = {
+            "facts_in_both": ["The sun is 4.6 billion years old."],
+            "facts_only_in_answer": [],
+            "facts_only_in_context": [],
+        }
+        grader = get_model("mockllm/model", custom_outputs=[
+            mock_output("<facts>\nThe sun is 4.6 billion years old.\n</facts>"),
+            mock_output(json.dumps(comparison)),
+        ])
+        state = TaskState(
+            model="mockllm/model",
+            sample_id="case1",
+            epoch=1,
+            input="How old is the sun?",
+            messages=[ChatMessageUser(content="How old is the sun?")],
+        )
+        state.output = mock_output("The sun is 4.6 billion years old.")
+
+        score = asyncio.run(fact_scorer(grader, target_index=index)(state, Target("The sun is 4.6 billion years old.")))
+        self.assertEqual(score.metadata["fact_index"], {"hits": 1, "misses": 0})
+        self.assertEqual(score.value["thoroughness"], 100)
+        index.close()
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
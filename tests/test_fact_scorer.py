@@ -0,0 +1,166 @@
+import unittest
+import asyncio
+import json
+import os
+import sys
+import tempfile
+from inspect_ai.model import ChatMessageUser, ModelOutput, get_model
+from inspect_ai.scorer import Target
+from inspect_ai.solver import TaskState
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from inspect_ai_scorers._cache import FactCache
+from inspect_ai_scorers._fact_scorer import fact_scorer
+
+
+def mock_output(content):
+    return ModelOutput.from_content(model="mockllm", content=content)
+
+
+def task_state(completion):
+    state = TaskState(
+        model="mockllm/model",
+        sample_id="case1",
+        epoch=1,
+        input="How old is the sun?",
+        messages=[ChatMessageUser(content="How old is the sun?")],
+    )
+    state.output = mock_output(completion)
+    return state
+
+
+COMPARISON = {
+    "facts_in_both": ["The sun is 4.6 billion years old."],
+    "facts_only_in_answer": [],
+    "facts_only_in_context": ["The sun is a mid-sized star."],
+}
+
+
+class TestFactScorer(unittest.TestCase):
+    def test_scores_groundedness_and_thoroughness(self):
+        model = get_model("mockllm/model", custom_outputs=[
+            mock_output("<facts>\nThe sun is 4.6 billion years old.\nThe sun is a mid-sized star.\n</facts>"),
+            mock_output("<facts>\nThe sun is 4.6 billion years old.\n</facts>"),
+            mock_output(json.dumps(COMPARISON)),
+        ])
+
+        score = asyncio.run(fact_scorer(model)(
+            task_state("The sun is 4.6 billion years old."),
+            Target("The sun is approximately 4.6 billion years old. It's a mid-sized star."),
+        ))
+
+        self.assertEqual(score.value["groundedness"], 100)
+        self.assertEqual(score.value["thoroughness"], 50)
+        self.assertIn("The sun is a mid-sized star.", score.explanation)
+        self.assertEqual(score.metadata["fact_counts"], {"in_both": 1, "only_in_answer": 0, "only_in_context": 1})
+
+    def test_cache_skips_repeated_extraction(self):
+        # the first sample extracts both texts, the second is served from the cache
+        model = get_model("mockllm/model", custom_outputs=[
+            mock_output("<facts>\nThe sun is 4.6 billion years old.\nThe sun is a mid-sized star.\n</facts>"),
+            mock_output("<facts>\nThe sun is 4.6 billion years old.\n</facts>"),
+            mock_output(json.dumps(COMPARISON)),
+            mock_output(json.dumps(COMPARISON)),
+        ])
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = FactCache(path=os.path.join(tmpdir, "facts.sqlite"))
+            scorer = fact_scorer(model, cache=cache)
+            state = task_state("The sun is 4.6 billion years old.")
+            target = Target("The sun is approximately 4.6 billion years old. It's a mid-sized star.")
+
+            first = asyncio.run(scorer(state, target))
+            second = asyncio.run(scorer(state, target))
+            cache.close()
+
+        self.assertEqual(first.metadata["fact_cache"], {"hits": 0, "misses": 2})
+        self.assertEqual(second.metadata["fact_cache"], {"hits": 2, "misses": 0})
+
+    def test_ids_compare_mode(self):
+        model = get_model("mockllm/model", custom_outputs=[
+            mock_output("<facts>\nThe sun is 4.6 billion years old.\nThe sun is a mid-sized star.\n</facts>"),
+            mock_output("<facts>\nThe sun is 4.6 billion years old.\n</facts>"),
+            mock_output(json.dumps({"matches": [["C1", "A1"]]})),
+        ])
+
+        score = asyncio.run(fact_scorer(model, compare_mode="ids")(
+            task_state("The sun is 4.6 billion years old."),
+            Target("The sun is approximately 4.6 billion years old. It's a mid-sized star."),
+        ))
+
+        self.assertEqual(score.value["groundedness"], 100)
+        self.assertEqual(score.value["thoroughness"], 50)
+        self.assertIn("The sun is a mid-sized star.", score.explanation)
+
+    def test_batched_compare_mode(self):
+        # the first sample's identical target and answer share one extraction call
+        facts = "<facts>\nThe sun is 4.6 billion years old.\n</facts>"
+        model = get_model("mockllm/model", custom_outputs=[
+            mock_output(facts),
+            mock_output(facts),
+            mock_output(facts),
+            mock_output(json.dumps({"1": [["C1", "A1"]], "2": []})),
+        ])
+        scorer = fact_scorer(model, compare_mode="ids", compare_batch_size=2, batch_timeout=10)
+
+        async def score_both():
+            return await asyncio.gather(
+                scorer(task_state("The sun is 4.6 billion years old."), Target("The sun is 4.6 billion years old.")),
+                scorer(task_state("The sun is young."), Target("The sun is old.")),
+            )
+
+        first, second = asyncio.run(score_both())
+        self.assertEqual(first.value["groundedness"], 100)
+        self.assertEqual(second.value["groundedness"], 0)
+
+    def test_prematch_skips_compare_when_everything_matches(self):
+        # no compare output is queued, so a compare call would fail the test
+        model = get_model("mockllm/model", custom_outputs=[
+            mock_output("<facts>\nThe sun is 4.6 billion years old.\n</facts>"),
+            mock_output("<facts>\nThe Sun is approximately 4.6 billion years old.\n</facts>"),
+        ])
+
+        score = asyncio.run(fact_scorer(model, compare_mode="ids", prematch=True)(
+            task_state("The Sun is approximately 4.6 billion years old."),
+            Target("The sun is 4.6 billion years old."),
+        ))
+
+        self.assertEqual(score.value, {"groundedness": 100, "thoroughness": 100})
+        self.assertEqual(score.metadata["prematch"], {"accepted": 1, "rejected": 0, "pending": 0})
+
+    def test_unparseable_compare_is_repaired(self):
+        # only the compare call is retried, the extractions are not rerun
+        model = get_model("mockllm/model", custom_outputs=[
+            mock_output("<facts>\nThe sun is 4.6 billion years old.\nThe sun is a mid-sized star.\n</facts>"),
+            mock_output("<facts>\nThe sun is 4.6 billion years old.\n</facts>"),
+            mock_output("I compared the facts and most of them match."),
+            mock_output("```json\n" + json.dumps(COMPARISON) + "\n```"),
+        ])
+
+        score = asyncio.run(fact_scorer(model)(
+            task_state("The sun is 4.6 billion years old."),
+            Target("The sun is approximately 4.6 billion years old. It's a mid-sized star."),
+        ))
+
+        self.assertEqual(score.value["thoroughness"], 50)
+        self.assertEqual(score.metadata["compare_repairs"], 1)
+
+    def test_chunked_extraction_merges_facts(self):
+        # the answer is split in two chunks that share the middle sentence
+        model = get_model("mockllm/model", custom_outputs=[
+            mock_output("<facts>\nThe sun is 4.6 billion years old.\nThe sun is a mid-sized star.\n</facts>"),
+            mock_output("<facts>\nThe sun is 4.6 billion years old.\nThe sun is a star.\n</facts>"),
+            mock_output("<facts>\nThe sun is a star.\nThe sun is mid-sized.\n</facts>"),
+            mock_output(json.dumps({"matches": [["C1", "A1"], ["C2", "A3"]]})),
+        ])
+
+        score = asyncio.run(fact_scorer(model, compare_mode="ids", chunk_tokens=16, chunk_overlap=6)(
+            task_state("The sun is 4.6 billion years old. The sun is a star. The sun is mid-sized."),
+            Target("The sun is an old, mid-sized star."),
+        ))
+
+        self.assertEqual(score.metadata["fact_counts"], {"in_both": 2, "only_in_answer": 1, "only_in_context": 0})
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,63 @@
+import unittest
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from inspect_ai_scorers._aggregate import fact_counts
+from inspect_ai_scorers._facts import comparison_from_ids, number_facts, parse_facts
+
+
+class TestParseFacts(unittest.TestCase):
+    def test_parses_facts_block(self):
+        text = "Sure!\n<facts>\n- The sun is a star.\n\n2. The sun is 4.6 billion years old.\n</facts>"
+        self.assertEqual(parse_facts(text), ["The sun is a star.", "The sun is 4.6 billion years old."])
+
+    def test_falls_back_to_whole_completion(self):
+        self.assertEqual(parse_facts("The sun is a star.\nIt is hot."), ["The sun is a star.", "It is hot."])
+
+
+class TestComparisonFromIds(unittest.TestCase):
+    def setUp(self):
+        self.context = ["The sun is a star.", "The sun is 4.6 billion years old.", "The sun is mid-sized."]
+        self.answer = ["The sun is about 4.6 billion years old.", "The sun is hot."]
+
+    def test_number_facts(self):
+        self.assertEqual(
+            number_facts(self.answer, "A"),
+            "A1: The sun is about 4.6 billion years old.\nA2: The sun is hot.",
+        )
+
+    def test_rebuilds_comparison(self):
+        comparison = comparison_from_ids([["C2", "A1"]], self.context, self.answer)
+        self.assertEqual(comparison["facts_in_both"], ["The sun is 4.6 billion years old. / The sun is about 4.6 billion years old."])
+        self.assertEqual(comparison["facts_only_in_answer"], ["The sun is hot."])
+        self.assertEqual(comparison["facts_only_in_context"], ["The sun is a star.", "The sun is mid-sized."])
+
+    def test_many_to_one_matches_count_once(self):
+        # the answer combines two context facts into one
+        context = ["The sun is a star.", "The sun is 4.6 billion years old.", "The sun is mid-sized."]
+        answer = ["The sun is a 4.6 billion year old star.", "The sun is hot."]
+        comparison = comparison_from_ids([["C1", "A1"], ["C2", "A1"]], context, answer)
+        self.assertEqual(comparison["facts_in_both"], ["The sun is a star. / The sun is 4.6 billion years old. / The sun is a 4.6 billion year old star."])
+        self.assertEqual(comparison["facts_only_in_answer"], ["The sun is hot."])
+        self.assertEqual(comparison["facts_only_in_context"], ["The sun is mid-sized."])
+        counts = fact_counts(comparison)
+        self.assertEqual(counts["in_both"] + counts["only_in_answer"], len(answer))
+
+        # one-to-many, the same fact text on both sides, and separate groups
+        comparison = comparison_from_ids([["C1", "A1"], ["C1", "A2"], ["C3", "A3"]], context, answer + ["The sun is mid-sized."])
+        self.assertEqual(comparison["facts_in_both"], [
+            "The sun is a star. / The sun is a 4.6 billion year old star. / The sun is hot.",
+            "The sun is mid-sized.",
+        ])
+        self.assertEqual(comparison["facts_only_in_context"], ["The sun is 4.6 billion years old."])
+
+    def test_ignores_unknown_and_duplicate_ids(self):
+        comparison = comparison_from_ids([["c2", " a1 "], ["C2", "A1"], ["C9", "A1"], ["A1", "C2"], "C1"], self.context, self.answer)
+        self.assertEqual(len(comparison["facts_in_both"]), 1)
+        self.assertEqual(len(comparison["facts_only_in_context"]), 2)
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,83 @@
+import unittest
+import asyncio
+import math
+import os
+import sys
+from inspect_ai.model import Logprob, Logprobs, ModelOutput, TopLogprob, get_model
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.harness import synthetic_samples
+from benchmarks.mock_grader import mock_grader_stats, reset_mock_grader
+from inspect_ai_scorers._verdict import pass_probability
+from inspect_ai_scorers.prompt_evaluator import prompt_scorer
+
+
+def output_with_logprobs(completion, candidates):
+    output = ModelOutput.from_content(model="mockgrader", content=completion)
+    top = [TopLogprob(token=token, logprob=math.log(probability)) for token, probability in candidates]
+    output.choices[0].logprobs = Logprobs(content=[Logprob(token=top[0].token, logprob=top[0].logprob, top_logprobs=top)])
+    return output
+
+
+def passing_sample():
+    state, target = synthetic_samples(1)[0]
+    state.output = ModelOutput.from_content(model="mockgrader", content=target.text)
+    return state, target
+
+
+class TestPassProbability(unittest.TestCase):
+    def test_reads_first_token_logprobs(self):
+        output = output_with_logprobs("PASS", [("PASS", 0.6), (" FAIL", 0.2), ("P", 0.1), ("Maybe", 0.1)])
+        self.assertAlmostEqual(pass_probability(output), 0.7 / 0.9)
+
+    def test_falls_back_to_the_completion(self):
+        self.assertEqual(pass_probability(ModelOutput.from_content(model="mockgrader", content="PASS")), 1.0)
+        self.assertEqual(pass_probability(ModelOutput.from_content(model="mockgrader", content="FAIL")), 0.0)
+
+
+class TestFastVerdict(unittest.TestCase):
+    def setUp(self):
+        reset_mock_grader()
+
+    def tearDown(self):
+        reset_mock_grader()
+
+    def test_pass_probability_is_recorded(self):
+        state, target = passing_sample()
+        score = asyncio.run(prompt_scorer(get_model("mockgrader/model", verdict_confidence=0.8), fast_verdict=True)(state, target))
+
+        self.assertEqual(score.value, "C")
+        self.assertAlmostEqual(score.metadata["pass_probability"], 0.8)
+        self.assertAlmostEqual(score.metadata["votes"][0]["pass_probability"], 0.8)
+        self.assertIsNone(score.explanation)
+
+    def test_threshold_decides_the_vote(self):
+        state, target = passing_sample()
+        grader = get_model("mockgrader/model", verdict_confidence=0.6)
+        score = asyncio.run(prompt_scorer(grader, fast_verdict=True, pass_threshold=0.75)(state, target))
+
+        self.assertEqual(score.value, "I")
+        self.assertEqual(score.metadata["votes"][0]["verdict"], "FAIL")
+
+    def test_failures_are_explained(self):
+        state, target = synthetic_samples(1)[0]
+        score = asyncio.run(prompt_scorer("mockgrader/model", fast_verdict=True, explain_failures=True)(state, target))
+
+        self.assertEqual(score.value, "I")
+        self.assertIn("2000", score.explanation)
+        self.assertEqual(score.metadata["grader_calls"], 1)
+        self.assertEqual(set(score.metadata["stages"]), {"verdict", "explanation"})
+        self.assertEqual(mock_grader_stats()["explain"], 1)
+
+    def test_passes_are_not_explained(self):
+        state, target = passing_sample()
+        score = asyncio.run(prompt_scorer("mockgrader/model", fast_verdict=True, explain_failures=True)(state, target))
+
+        self.assertEqual(score.value, "C")
+        self.assertIsNone(score.explanation)
+        self.assertEqual(mock_grader_stats()["calls"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,58 @@
+import unittest
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Budget for the package's own modules, excluding inspect_ai, numpy and other
+# dependencies. Generous so only real regressions (a heavy eager import) trip it.
+OWN_IMPORT_BUDGET_SECONDS = 0.25
+
+
+def import_profile(statement):
+    """
+    Run an import in a fresh interpreter with -X importtime.
+
+    Returns:
+        tuple[dict[str, int], set[str]]: Self import time in microseconds by
+            module, and the modules loaded once the statement has run.
+    """
+    code = f"{statement}\nimport sys\nprint('\\n'.join(sys.modules))"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            self_time, _, module = line[len("import time:"):].split("|")
+            if self_time.strip().isdigit():
+                times[module.strip()] = int(self_time)
+    return times, set(result.stdout.split())
+
+
+class TestImportTime(unittest.TestCase):
+    def assert_langchain_free(self, statement):
+        times, modules = import_profile(statement)
+        self.assertFalse(
+            [module for module in modules if module.split(".")[0] in ("langchain", "langchain_core")],
+            f"'{statement}' imported LangChain",
+        )
+        own = sum(time for module, time in times.items() if module.startswith("inspect_ai_scorers"))
+        self.assertLess(own / 1e6, OWN_IMPORT_BUDGET_SECONDS)
+
+    def test_fact_scorer_does_not_load_langchain(self):
+        self.assert_langchain_free("from inspect_ai_scorers import fact_scorer")
+
+    def test_prompt_scorer_does_not_load_langchain(self):
+        self.assert_langchain_free("from inspect_ai_scorers import prompt_scorer")
+
+    def test_fact_comparator_loads_langchain_on_use(self):
+        self.assert_langchain_free("import inspect_ai_scorers.fact_comparator")
+        _, modules = import_profile("from inspect_ai_scorers.fact_comparator import FactComparator\nFactComparator._parse_prompt()")
+        self.assertIn("langchain_core", modules)
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
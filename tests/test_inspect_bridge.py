@@ -0,0 +1,120 @@
+import unittest
+import asyncio
+import json
+import os
+import sys
+import time
+from unittest import mock
+from langchain_core.messages import HumanMessage, SystemMessage
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from inspect_ai_scorers import code_from_inspect_ai
+from inspect_ai_scorers.code_from_inspect_ai import InspectChatModel, as_inspect_tools
+
+SEARCH_TOOL = {
+    "type": "function",
+    "function": {
+        "name": "search",
+        "description": "Search a document collection.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "query": {"type": "string", "description": "The search query."},
+                "filters": {
+                    "type": "object",
+                    "properties": {
+                        "years": {"type": "array", "items": {"type": "integer"}},
+                        "author": {"type": ["string", "null"]},
+                    },
+                    "required": ["years"],
+                },
+                "limit": {"type": "integer", "default": 10},
+            },
+            "required": ["query"],
+        },
+    },
+}
+
+
+def run_agent(turns, model=None):
+    """
+    Simulate an agent that resends its whole history every turn.
+
+    Returns:
+        tuple[InspectChatModel, list[int]]: The model and the number of
+            messages converted on each turn.
+    """
+    model = model or InspectChatModel()
+    history = [SystemMessage(content="You are a helpful assistant.")]
+    conversions = []
+    convert = code_from_inspect_ai.as_inspect_message
+
+    async def agent():
+        for turn in range(turns):
+            history.append(HumanMessage(content=f"Step {turn}"))
+            with mock.patch.object(code_from_inspect_ai, "as_inspect_message", wraps=convert) as counted:
+                result = await model._agenerate(list(history))
+            conversions.append(counted.call_count)
+            history.append(result.generations[0].message)
+
+    asyncio.run(agent())
+    return model, conversions
+
+
+class TestInspectChatModel(unittest.TestCase):
+    def setUp(self):
+        self.env = mock.patch.dict(os.environ, {"INSPECT_EVAL_MODEL": "mockllm/model"})
+        self.env.start()
+
+    def tearDown(self):
+        self.env.stop()
+
+    def test_only_new_messages_are_converted(self):
+        model, conversions = run_agent(30)
+        # the first turn converts the system and user messages, then one new user message per turn
+        self.assertEqual(conversions, [2] + [1] * 29)
+        self.assertEqual(len(model.messages), 61)
+        self.assertEqual(model.messages[-1].role, "assistant")
+        self.assertEqual(model.messages[-2].text, "Step 29")
+
+    def test_rebuilt_history_is_matched_by_equality(self):
+        model, _ = run_agent(3)
+        # new message objects with the same content as the start of the transcript
+        rebuilt = [SystemMessage(content="You are a helpful assistant."), HumanMessage(content="A different task")]
+        with mock.patch.object(code_from_inspect_ai, "as_inspect_message", wraps=code_from_inspect_ai.as_inspect_message) as counted:
+            asyncio.run(model._agenerate(rebuilt))
+        self.assertEqual(counted.call_count, 1)
+        self.assertEqual([message.text for message in model.messages[:2]], ["You are a helpful assistant.", "A different task"])
+        self.assertEqual(len(model.messages), 3)
+
+
+class TestToolSchemas(unittest.TestCase):
+    def test_nested_parameters_are_preserved(self):
+        [tool] = as_inspect_tools([SEARCH_TOOL])
+        self.assertEqual(tool.name, "search")
+        self.assertEqual(tool.parameters.required, ["query"])
+
+        filters = tool.parameters.properties["filters"]
+        self.assertEqual(filters.type, "object")
+        self.assertEqual(filters.required, ["years"])
+        self.assertEqual(filters.properties["years"].items.type, "integer")
+        self.assertEqual([option.type for option in filters.properties["author"].anyOf], ["string", "null"])
+        self.assertEqual(tool.parameters.properties["limit"].default, 10)
+
+    def test_compiled_schemas_are_cached(self):
+        first = as_inspect_tools([SEARCH_TOOL])
+        # an equal definition built separately hits the same cache entry
+        second = as_inspect_tools([json.loads(json.dumps(SEARCH_TOOL))])
+        self.assertIs(first[0], second[0])
+
+
+if __name__ == '__main__':
+    # conversion work per turn should stay flat as the history grows
+    os.environ.setdefault("INSPECT_EVAL_MODEL", "mockllm/model")
+    for turns in (50, 200, 800):
+        start = time.perf_counter()
+        _, conversions = run_agent(turns)
+        elapsed = time.perf_counter() - start
+        print(f"{turns} turns: {elapsed / turns * 1e3:.2f} ms/turn, {sum(conversions) / turns:.2f} conversions/turn")
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
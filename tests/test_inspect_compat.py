@@ -0,0 +1,38 @@
+import unittest
+import importlib
+import os
+import sys
+from unittest import mock
+import inspect_ai
+from inspect_ai.scorer import Score, match
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from inspect_ai_scorers import _inspect_compat
+
+
+class TestInspectCompat(unittest.TestCase):
+    def tearDown(self):
+        importlib.reload(_inspect_compat)
+
+    def test_computes_results_as_inspect_does(self):
+        scorer = match()
+        name = _inspect_compat.scorer_name(scorer)
+        self.assertEqual(name, "match")
+        scores = [{name: _inspect_compat.sample_score(i, Score(value=value))} for i, value in enumerate("CCI")]
+        results = _inspect_compat.log_results(scores, scorer)
+        self.assertEqual(results["total_samples"], 3)
+        metrics = results["scores"][0]["metrics"]
+        self.assertAlmostEqual(metrics["accuracy"]["value"], 2 / 3)
+
+    def test_warns_on_an_untested_inspect_release(self):
+        with mock.patch.object(inspect_ai, "__version__", "0.0.1"), self.assertWarnsRegex(UserWarning, "0.3.28"):
+            importlib.reload(_inspect_compat)
+
+    def test_tested_release_is_the_pinned_one(self):
+        with open(os.path.join(os.path.dirname(__file__), '..', 'requirements.txt'), 'rb') as file:
+            requirements = file.read().decode('utf-16')
+        self.assertIn(f"inspect_ai=={_inspect_compat.TESTED_INSPECT_VERSION}", requirements.split())
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
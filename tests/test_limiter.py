@@ -0,0 +1,107 @@
+import unittest
+import asyncio
+import os
+import sys
+from inspect_ai.model import GenerateConfig, ModelOutput, get_model
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from inspect_ai_scorers._limiter import AdaptiveLimiter, grader_limiter, grader_limiter_stats, limited_generate
+
+
+class RateLimitError(Exception):
+    pass
+
+
+class TestAdaptiveLimiter(unittest.TestCase):
+    def test_concurrency_stays_within_limit(self):
+        limiter = AdaptiveLimiter(initial=2, max_limit=2)
+        active = []
+        peak = []
+
+        async def call():
+            active.append(1)
+            peak.append(len(active))
+            await asyncio.sleep(0.01)
+            active.pop()
+            return "ok"
+
+        async def main():
+            return await asyncio.gather(*(limiter.run(call) for _ in range(8)))
+
+        self.assertEqual(asyncio.run(main()), ["ok"] * 8)
+        self.assertEqual(max(peak), 2)
+        self.assertEqual(limiter.stats()["in_flight"], 0)
+        self.assertEqual(limiter.stats()["queued"], 0)
+
+    def test_limit_grows_while_healthy(self):
+        limiter = AdaptiveLimiter(initial=2, max_limit=10, latency_tolerance=100)
+
+        async def call():
+            await asyncio.sleep(0.001)
+
+        async def main():
+            for _ in range(20):
+                await limiter.run(call)
+
+        asyncio.run(main())
+        self.assertGreater(limiter.stats()["limit"], 2)
+        self.assertEqual(limiter.stats()["throttle_events"], 0)
+
+    def test_throttling_backs_off_once_per_window(self):
+        limiter = AdaptiveLimiter(initial=8)
+        limiter.baselines["default"] = 10.0
+
+        async def throttled():
+            raise RateLimitError()
+
+        async def main():
+            for _ in range(3):
+                with self.assertRaises(RateLimitError):
+                    await limiter.run(throttled, lambda ex: isinstance(ex, RateLimitError))
+
+        asyncio.run(main())
+        stats = limiter.stats()
+        self.assertEqual(stats["limit"], 4)
+        self.assertEqual(stats["throttle_events"], 3)
+        self.assertEqual(stats["errors"], 0)
+
+    def test_latency_spikes_count_as_throttling(self):
+        limiter = AdaptiveLimiter(initial=8)
+        limiter.baselines["default"] = 0.001
+
+        async def slow():
+            await asyncio.sleep(0.05)
+
+        asyncio.run(limiter.run(slow))
+        self.assertEqual(limiter.stats()["limit"], 4)
+
+    def test_baselines_are_kept_per_kind(self):
+        limiter = AdaptiveLimiter(initial=8)
+        limiter.baselines["facts"] = 0.001
+
+        async def slow():
+            await asyncio.sleep(0.05)
+
+        asyncio.run(limiter.run(slow, kind="compare"))
+        stats = limiter.stats()
+        self.assertEqual(stats["throttle_events"], 0)
+        self.assertEqual(stats["limit"], 8)
+        self.assertEqual(set(stats["baselines"]), {"facts", "compare"})
+
+    def test_limited_generate_uses_a_pool_per_model(self):
+        model = get_model("mockllm/model", custom_outputs=[ModelOutput.from_content(model="mockllm", content="PASS")])
+        output = asyncio.run(limited_generate(model, "Grade this"))
+        self.assertEqual(output.completion, "PASS")
+        self.assertGreaterEqual(grader_limiter_stats()[str(model)]["completed"], 1)
+
+    def test_limit_starts_from_and_stays_within_max_connections(self):
+        model = get_model("mockllm/connections", config=GenerateConfig(max_connections=20), custom_outputs=[ModelOutput.from_content(model="mockllm", content="PASS")])
+        asyncio.run(limited_generate(model, "Grade this"))
+        self.assertEqual(grader_limiter_stats()[str(model)]["limit"], 20)
+        # inspect would queue calls past max_connections, inflating their latency
+        self.assertEqual(grader_limiter(str(model)).max_limit, 20)
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
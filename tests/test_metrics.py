@@ -0,0 +1,74 @@
+import unittest
+import asyncio
+import os
+import sys
+import urllib.error
+import urllib.request
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from inspect_ai.model import get_model
+
+from benchmarks.harness import synthetic_samples
+from benchmarks.mock_grader import reset_mock_grader
+from inspect_ai_scorers._fact_scorer import fact_scorer
+from inspect_ai_scorers._metrics import Histogram, scorer_metrics, start_metrics_server, stop_metrics_server
+from inspect_ai_scorers.prompt_evaluator import prompt_scorer
+
+
+async def score_all(scorer, samples):
+    return await asyncio.gather(*(scorer(state, target) for state, target in samples))
+
+
+class TestScorerMetrics(unittest.TestCase):
+    def setUp(self):
+        reset_mock_grader()
+        scorer_metrics.reset()
+        self.model = get_model("mockgrader/model")
+
+    def tearDown(self):
+        reset_mock_grader()
+        scorer_metrics.reset()
+
+    def test_scorers_update_the_metrics(self):
+        asyncio.run(score_all(fact_scorer(self.model), synthetic_samples(4)))
+        asyncio.run(score_all(prompt_scorer(self.model), synthetic_samples(2)))
+
+        self.assertEqual(scorer_metrics.samples, {"fact_scorer": 4, "prompt_scorer": 2})
+        self.assertEqual(scorer_metrics.grader_calls, 4 * 3 + 2)
+        self.assertEqual(scorer_metrics.grader_calls_in_flight, 0)
+        self.assertEqual(scorer_metrics.stage_seconds["compare"].count, 4)
+        self.assertEqual(scorer_metrics.stage_seconds["verdict"].count, 2)
+        self.assertEqual(scorer_metrics.score_means[("fact_scorer", "groundedness")].count, 4)
+        # prompt_scorer's C/I values are read as 1/0
+        self.assertEqual(scorer_metrics.score_means[("prompt_scorer", "value")].mean, 0)
+
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = Histogram((0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 5.0):
+            histogram.observe(value)
+        self.assertEqual(histogram.cumulative(), [("0.1", 2), ("1.0", 3), ("+Inf", 4)])
+        self.assertEqual(histogram.count, 4)
+
+    def test_server_exposes_prometheus_text(self):
+        asyncio.run(score_all(prompt_scorer(self.model), synthetic_samples(1)))
+        server = start_metrics_server(0)
+        try:
+            port = server.server_address[1]
+            self.assertIs(start_metrics_server(port), server)
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics") as response:
+                self.assertTrue(response.headers["Content-Type"].startswith("text/plain"))
+                page = response.read().decode("utf-8")
+            with self.assertRaises(urllib.error.HTTPError):
+                urllib.request.urlopen(f"http://127.0.0.1:{port}/other")
+        finally:
+            stop_metrics_server(server)
+
+        self.assertIn("# TYPE inspect_scorer_stage_seconds histogram", page)
+        self.assertIn('inspect_scorer_samples_total{scorer="prompt_scorer"} 1', page)
+        self.assertIn('inspect_scorer_stage_seconds_bucket{stage="verdict",le="+Inf"} 1', page)
+        self.assertIn("inspect_scorer_grader_calls_in_flight 0", page)
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
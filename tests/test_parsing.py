@@ -0,0 +1,84 @@
+import unittest
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from inspect_ai_scorers._parsing import ComparisonParseError, _balanced_objects, extract_json, parse_comparison, parse_matches, parse_with_repair
+
+
+class TestExtractJson(unittest.TestCase):
+    def test_plain_object(self):
+        self.assertEqual(extract_json('{"matches": [["C1", "A1"]]}'), {"matches": [["C1", "A1"]]})
+
+    def test_code_fence_and_prose(self):
+        text = 'Here is the result:\n```json\n{"facts_in_both": ["a"]}\n```\nLet me know if you need more.'
+        self.assertEqual(extract_json(text), {"facts_in_both": ["a"]})
+
+    def test_object_inside_prose(self):
+        text = 'Sure! {"facts_in_both": ["The {sun} is hot."], "facts_only_in_answer": []} Hope that helps.'
+        self.assertEqual(extract_json(text)["facts_in_both"], ["The {sun} is hot."])
+
+    def test_trailing_commas_and_single_quotes(self):
+        self.assertEqual(extract_json('{"matches": [["C1", "A1"],],}'), {"matches": [["C1", "A1"]]})
+        self.assertEqual(extract_json("{'matches': [['C1', 'A2']]}"), {"matches": [["C1", "A2"]]})
+
+    def test_nested_objects_and_apostrophes(self):
+        text = "Here's what I found: {\"matches\": [[\"C1\", \"A1\"]], \"notes\": {\"sun's\": \"}\"}} and that's it."
+        self.assertEqual(extract_json(text), {"matches": [["C1", "A1"]], "notes": {"sun's": "}"}})
+        self.assertEqual(_balanced_objects('x {"a": {"b": 1}} y {"c": 2}'), ['{"a": {"b": 1}}', '{"b": 1}', '{"c": 2}'])
+
+    def test_unbalanced_braces_are_scanned_once(self):
+        # each span used to be rescanned from every "{", which was quadratic
+        text = "{" * 200_000 + '{"matches": []}'
+        started = time.perf_counter()
+        self.assertEqual(extract_json(text), {"matches": []})
+        self.assertLess(time.perf_counter() - started, 2.0)
+
+    def test_no_object(self):
+        with self.assertRaises(ComparisonParseError):
+            extract_json("The facts mostly match.")
+
+
+class TestParseComparison(unittest.TestCase):
+    def test_missing_keys_default_to_empty(self):
+        result = parse_comparison('{"facts_in_both": ["a"]}')
+        self.assertEqual(result.facts_in_both, ["a"])
+        self.assertEqual(result.facts_only_in_context, [])
+
+    def test_wrong_shape_is_rejected(self):
+        with self.assertRaises(ComparisonParseError):
+            parse_comparison('{"result": "ok"}')
+        with self.assertRaises(ComparisonParseError):
+            parse_comparison('{"facts_in_both": "a"}')
+        with self.assertRaises(ComparisonParseError):
+            parse_matches('{"matches": "none"}')
+
+
+class TestParseWithRepair(unittest.TestCase):
+    def test_repair_extends_the_conversation(self):
+        conversations = []
+        completions = iter(["no json here", '{"matches": []}'])
+
+        async def generate(conversation):
+            conversations.append(conversation)
+            return next(completions)
+
+        stats = {"repairs": 0}
+        self.assertEqual(asyncio.run(parse_with_repair("compare", generate, parse_matches, stats=stats)), [])
+        self.assertEqual(stats["repairs"], 1)
+        self.assertEqual([role for role, _ in conversations[1]], ["user", "assistant", "user"])
+        self.assertEqual(conversations[1][1][1], "no json here")
+
+    def test_gives_up_after_max_repairs(self):
+        async def generate(conversation):
+            return "still no json"
+
+        with self.assertRaises(ComparisonParseError):
+            asyncio.run(parse_with_repair("compare", generate, parse_matches, max_repairs=2))
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
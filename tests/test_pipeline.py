@@ -0,0 +1,83 @@
+import unittest
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from inspect_ai_scorers._pipeline import StageGraph
+
+
+class TestStageGraph(unittest.TestCase):
+    def test_independent_stages_run_concurrently(self):
+        running = []
+        peak = []
+
+        async def slow(name):
+            running.append(name)
+            peak.append(len(running))
+            await asyncio.sleep(0.05)
+            running.remove(name)
+            return name.upper()
+
+        async def combine(a, b):
+            return a + b
+
+        graph = StageGraph()
+        graph.add("a", lambda text: slow(text), after=["text"])
+        graph.add("b", lambda other: slow(other), after=["other"])
+        graph.add("ab", combine, after=["a", "b"])
+
+        results = asyncio.run(graph.run(text="x", other="y"))
+
+        self.assertEqual(results, {"a": "X", "b": "Y", "ab": "XY"})
+        self.assertEqual(max(peak), 2)
+
+    def test_graph_is_reusable_across_runs(self):
+        async def echo(text):
+            return text
+
+        graph = StageGraph().add("echo", echo, after=["text"])
+
+        self.assertEqual(asyncio.run(graph.run(text="one"))["echo"], "one")
+        self.assertEqual(asyncio.run(graph.run(text="two"))["echo"], "two")
+
+    def test_unknown_dependency_raises(self):
+        async def noop(missing):
+            return None
+
+        graph = StageGraph().add("stage", noop, after=["missing"])
+        with self.assertRaises(ValueError):
+            asyncio.run(graph.run())
+
+    def test_cycle_raises(self):
+        async def noop(**kwargs):
+            return None
+
+        graph = StageGraph()
+        graph.add("a", noop, after=["b"])
+        graph.add("b", noop, after=["a"])
+        with self.assertRaises(ValueError):
+            asyncio.run(graph.run())
+
+    def test_failure_cancels_sibling_stages(self):
+        cancelled = []
+
+        async def fail():
+            raise RuntimeError("boom")
+
+        async def slow():
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        graph = StageGraph().add("fail", fail).add("slow", slow)
+        with self.assertRaises(RuntimeError):
+            asyncio.run(graph.run())
+        self.assertEqual(cancelled, [True])
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
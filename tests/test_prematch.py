@@ -0,0 +1,47 @@
+import unittest
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from inspect_ai_scorers._prematch import FactPrematcher, remap_matches, similarity_matrix
+
+
+class TestSimilarityMatrix(unittest.TestCase):
+    def test_shape_and_range(self):
+        similarity = similarity_matrix(["The sun is a star.", "Water is wet."], ["The Sun is a star!", "Fire is hot.", "Ice is cold."])
+        self.assertEqual(similarity.shape, (2, 3))
+        self.assertAlmostEqual(float(similarity[0, 0]), 1.0)
+        self.assertTrue(((similarity >= 0) & (similarity <= 1 + 1e-9)).all())
+
+    def test_empty_lists(self):
+        self.assertEqual(similarity_matrix([], ["A fact."]).shape, (0, 1))
+
+
+class TestFactPrematcher(unittest.TestCase):
+    def test_accepts_hedged_rephrasing(self):
+        result = FactPrematcher()(
+            ["The sun is 4.6 billion years old.", "The sun is a mid-sized star."],
+            ["The Sun is approximately 4.6 billion years old.", "The Sun is a medium-sized star."],
+        )
+        self.assertEqual(result.matches, [(0, 0)])
+        self.assertEqual(result.context_pending, [1])
+        self.assertEqual(result.answer_pending, [1])
+
+    def test_never_accepts_changed_numbers_or_words(self):
+        result = FactPrematcher(accept=0.0)(
+            ["The average temperature today is 20 degrees Celsius.", "John is taller than Mike."],
+            ["The average temperature today is 50 degrees Celsius.", "John is older than Mike."],
+        )
+        self.assertEqual(result.matches, [])
+
+    def test_rejects_unrelated_facts(self):
+        result = FactPrematcher(reject=0.2)(["The library opens at 9 AM."], ["Water boils at 100 degrees Celsius."])
+        self.assertEqual((result.context_pending, result.answer_pending, result.rejected), ([], [], 2))
+
+    def test_remap_matches(self):
+        self.assertEqual(remap_matches([["C1", "A2"], ["C5", "A1"]], [2, 4], [0, 3]), [["C3", "A4"]])
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
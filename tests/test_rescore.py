@@ -0,0 +1,114 @@
+import unittest
+import json
+import os
+import sys
+import tempfile
+from inspect_ai import Task, eval
+from inspect_ai.dataset import Sample
+from inspect_ai.log import read_eval_log
+from inspect_ai.scorer import match
+from inspect_ai.solver import generate
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.mock_grader import MockGraderError, configure_mock_grader, reset_mock_grader
+from inspect_ai_scorers._rescore import LogReader, rescore_logs
+
+
+def write_log(log_dir, targets, epochs=1):
+    task = Task(
+        dataset=[Sample(id=index, input="Say something.", target=target) for index, target in enumerate(targets)],
+        plan=[generate()],
+        scorer=match(),
+        epochs=epochs,
+    )
+    return eval(task, model="mockllm/model", log_dir=log_dir, display="none")[0]
+
+
+class TestRescore(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.log_dir = os.path.join(self.tmpdir.name, "logs")
+        self.output_dir = os.path.join(self.tmpdir.name, "rescored")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_rescores_stored_completions(self):
+        log = write_log(self.log_dir, ["Default output from mockllm/model", "Something else."], epochs=2)
+        results = rescore_logs(self.log_dir, "prompt_scorer", self.output_dir, {"model": "mockgrader/model"}, workers=1)
+
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0]["samples"], 4)
+        rescored = read_eval_log(results[0]["output_file"])
+        self.assertEqual(rescored.eval.task_id, log.eval.task_id)
+        self.assertEqual([sample.output.completion for sample in rescored.samples], [sample.output.completion for sample in log.samples])
+        # samples are logged by epoch, then by id
+        self.assertEqual([sample.scores["inspect_ai_scorers/prompt_scorer"].value for sample in rescored.samples], ["C", "I", "C", "I"])
+        self.assertEqual(rescored.results.scores[0].name, "inspect_ai_scorers/prompt_scorer")
+        self.assertEqual(rescored.results.scores[0].metrics["accuracy"].value, 0.5)
+        self.assertEqual(len(rescored.samples[0].transcript.events), len(log.samples[0].transcript.events))
+
+    def test_rescores_logs_in_worker_processes(self):
+        write_log(os.path.join(self.log_dir, "a"), ["Default output from mockllm/model"])
+        write_log(os.path.join(self.log_dir, "b"), ["Something else."])
+        results = rescore_logs(self.log_dir, "prompt_scorer", self.output_dir, {"model": "mockgrader/model"}, workers=2)
+
+        self.assertEqual([result["samples"] for result in results], [1, 1])
+        for result in results:
+            self.assertTrue(result["output_file"].startswith(self.output_dir))
+            self.assertEqual(read_eval_log(result["output_file"]).status, "success")
+
+    def test_output_dir_must_be_outside_log_dir(self):
+        with self.assertRaises(ValueError):
+            rescore_logs(self.log_dir, "prompt_scorer", os.path.join(self.log_dir, "rescored"))
+
+    def test_failed_rescore_leaves_no_output(self):
+        write_log(self.log_dir, ["Something else."])
+        configure_mock_grader(error_rate=1.0)
+        try:
+            with self.assertRaises(MockGraderError):
+                rescore_logs(self.log_dir, "prompt_scorer", self.output_dir, {"model": "mockgrader/model"}, workers=1)
+        finally:
+            reset_mock_grader()
+        self.assertEqual(os.listdir(self.output_dir), [])
+
+
+class TestLogReader(unittest.TestCase):
+    LOG = {
+        "version": 2,
+        "eval": {"model": "mockllm/model"},
+        "samples": [
+            {"id": 1, "input": 'Braces { and [ and "quotes" \\ in strings }', "scores": {}},
+            {"id": 2, "input": "A line\n  }\nthat looks like a closer."},
+        ],
+        "stats": {"started_at": "now"},
+    }
+
+    def read(self, log, indent):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "log.json")
+            with open(path, "w") as file:
+                json.dump(log, file, indent=indent)
+            with LogReader(path) as reader:
+                return list(reader.items())
+
+    def test_streams_fields_and_samples(self):
+        for indent in (2, None):
+            items = self.read(self.LOG, indent)
+            self.assertEqual([key for key, _ in items], ["version", "eval", "sample", "sample", "stats"])
+            self.assertEqual(items[1][1], {"model": "mockllm/model"})
+            self.assertEqual(items[2][1], self.LOG["samples"][0])
+            self.assertEqual(items[3][1], self.LOG["samples"][1])
+
+    def test_reads_nan_without_repeating_items(self):
+        log = json.loads(json.dumps(self.LOG))
+        log["samples"][1]["value"] = float("nan")
+        items = self.read(log, 2)
+        self.assertEqual([key for key, _ in items], ["version", "eval", "sample", "sample", "stats"])
+        self.assertEqual(items[2][1], self.LOG["samples"][0])
+        self.assertNotEqual(items[3][1]["value"], items[3][1]["value"])
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,85 @@
+import unittest
+import asyncio
+import json
+import os
+import sys
+import time
+from typing import Any
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from inspect_ai.model import ChatMessageUser, ModelOutput
+from inspect_ai.scorer import Target
+from inspect_ai.solver import TaskState
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from inspect_ai_scorers.fact_comparator import FactComparator, FactComparatorScorer
+
+FACTS = "<facts>\nThe sun is 4.6 billion years old.\nThe sun is a mid-sized star.\n</facts>"
+COMPARISON = json.dumps({
+    "facts_in_both": ["The sun is 4.6 billion years old."],
+    "facts_only_in_answer": [],
+    "facts_only_in_context": ["The sun is a mid-sized star."],
+})
+
+# per-sample scorer overhead with an instant model; generous so only real
+# regressions (e.g. rebuilding objects per sample) trip it
+MAX_OVERHEAD_SECONDS = 0.005
+
+
+class StubChatModel(BaseChatModel):
+    """A chat model that answers instantly, so only scorer overhead is timed."""
+
+    @property
+    def _llm_type(self) -> str:
+        return "stub"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        text = FACTS if "parse this text" in messages[-1].content else COMPARISON
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=text))])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        return self._generate(messages, stop, run_manager, **kwargs)
+
+
+def task_state(i):
+    state = TaskState(
+        model="mockllm/model",
+        sample_id=i,
+        epoch=1,
+        input="How old is the sun?",
+        messages=[ChatMessageUser(content="How old is the sun?")],
+    )
+    state.output = ModelOutput.from_content(model="mockllm", content=f"The sun is 4.6 billion years old. ({i})")
+    return state
+
+
+def per_sample_overhead(samples=200):
+    scorer = FactComparatorScorer(StubChatModel())
+    states = [task_state(i) for i in range(samples)]
+    target = Target("The sun is 4.6 billion years old. It's a mid-sized star.")
+
+    async def run():
+        for state in states:
+            await scorer(state, target)
+
+    asyncio.run(run())
+    start = time.perf_counter()
+    asyncio.run(run())
+    return (time.perf_counter() - start) / samples
+
+
+class TestScorerOverhead(unittest.TestCase):
+    def test_prompt_templates_are_built_once(self):
+        self.assertIs(FactComparator._parse_prompt(), FactComparator._parse_prompt())
+        self.assertIs(FactComparator._compare_prompt(), FactComparator._compare_prompt())
+        self.assertIs(FactComparator._compare_ids_prompt(), FactComparator._compare_ids_prompt())
+
+    def test_per_sample_overhead(self):
+        self.assertLess(per_sample_overhead(), MAX_OVERHEAD_SECONDS)
+
+
+if __name__ == '__main__':
+    print(f"per-sample scorer overhead: {per_sample_overhead(1000) * 1e6:.0f} us")
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
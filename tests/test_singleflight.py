@@ -0,0 +1,137 @@
+import unittest
+import asyncio
+import os
+import sys
+from inspect_ai.model import ModelOutput, get_model
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from inspect_ai_scorers._singleflight import SingleFlight, coalesced_generate, grader_flights, request_key
+
+
+class TestSingleFlight(unittest.TestCase):
+    def test_concurrent_identical_calls_share_one_result(self):
+        flights = SingleFlight()
+        started = []
+
+        async def call():
+            started.append(1)
+            await asyncio.sleep(0.01)
+            return object()
+
+        async def main():
+            return await asyncio.gather(*(flights.do("key", call) for _ in range(5)))
+
+        results = asyncio.run(main())
+        self.assertEqual(len(started), 1)
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertEqual(flights.stats(), {"calls": 1, "coalesced": 4, "in_flight": 0})
+
+    def test_finished_calls_are_not_reused(self):
+        flights = SingleFlight()
+
+        async def call():
+            return "done"
+
+        async def main():
+            await flights.do("key", call)
+            await flights.do("key", call)
+
+        asyncio.run(main())
+        self.assertEqual(flights.calls, 2)
+
+    def test_errors_reach_every_caller(self):
+        flights = SingleFlight()
+
+        async def call():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("grader down")
+
+        async def main():
+            return await asyncio.gather(*(flights.do("key", call) for _ in range(3)), return_exceptions=True)
+
+        results = asyncio.run(main())
+        self.assertTrue(all(isinstance(result, RuntimeError) for result in results))
+
+    def test_one_cancelled_caller_does_not_cancel_the_others(self):
+        flights = SingleFlight()
+
+        async def call():
+            await asyncio.sleep(0.02)
+            return "ok"
+
+        async def main():
+            first = asyncio.ensure_future(flights.do("key", call))
+            second = asyncio.ensure_future(flights.do("key", call))
+            await asyncio.sleep(0.005)
+            first.cancel()
+            return await second
+
+        self.assertEqual(asyncio.run(main()), "ok")
+
+    def test_call_is_cancelled_with_its_last_caller(self):
+        flights = SingleFlight()
+        cancelled = []
+
+        async def call():
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.append(1)
+                raise
+
+        async def main():
+            callers = [asyncio.ensure_future(flights.do("key", call)) for _ in range(2)]
+            await asyncio.sleep(0.005)
+            for caller in callers:
+                caller.cancel()
+            await asyncio.gather(*callers, return_exceptions=True)
+            await asyncio.sleep(0)
+
+        asyncio.run(main())
+        self.assertEqual(cancelled, [1])
+        self.assertEqual(flights.stats()["in_flight"], 0)
+
+    def test_request_key_covers_model_config_and_input(self):
+        base = request_key("openai/gpt-4", {"temperature": 0}, "prompt")
+        self.assertEqual(base, request_key("openai/gpt-4", {"temperature": 0}, "prompt"))
+        self.assertNotEqual(base, request_key("openai/gpt-4o", {"temperature": 0}, "prompt"))
+        self.assertNotEqual(base, request_key("openai/gpt-4", {"temperature": 1}, "prompt"))
+        self.assertNotEqual(base, request_key("openai/gpt-4", {"temperature": 0}, "other prompt"))
+
+    def test_coalesced_generate(self):
+        model = get_model("mockllm/model", custom_outputs=[ModelOutput.from_content(model="mockllm", content="PASS")])
+        coalesced = grader_flights.coalesced
+
+        async def call():
+            await asyncio.sleep(0.01)
+            return await model.generate("Grade this")
+
+        async def main():
+            return await asyncio.gather(*(coalesced_generate(model, "Grade this", None, call) for _ in range(3)))
+
+        self.assertEqual([output.completion for output in asyncio.run(main())], ["PASS"] * 3)
+        self.assertEqual(grader_flights.coalesced - coalesced, 2)
+
+    def test_comparator_keys_requests_by_the_active_model(self):
+        from langchain_core.messages import HumanMessage
+        from inspect_ai.model._model import active_model_context_var
+        from inspect_ai_scorers._langchain import InspectChatModel
+        from inspect_ai_scorers.fact_comparator import FactComparator
+
+        # eval() shares one task, and so one comparator, between the models it runs
+        comparator = FactComparator(InspectChatModel())
+        models = [get_model(f"mockllm/{name}", custom_outputs=[ModelOutput.from_content(model="mockllm", content=name)]) for name in ("a", "b")]
+
+        async def generate(model):
+            active_model_context_var.set(model)
+            return await comparator._generate([HumanMessage(content="Parse this text into facts")])
+
+        async def main():
+            return await asyncio.gather(*(generate(model) for model in models))
+
+        self.assertEqual(asyncio.run(main()), ["a", "b"])
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
@@ -0,0 +1,115 @@
+import unittest
+import asyncio
+import json
+import os
+import sys
+import tempfile
+from unittest import mock
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from inspect_ai.model import get_model
+
+from benchmarks.harness import synthetic_samples
+from benchmarks.mock_grader import reset_mock_grader
+from inspect_ai_scorers._cache import FactCache
+from inspect_ai_scorers._fact_scorer import fact_scorer
+from inspect_ai_scorers._tracing import SampleTrace, ScoreTracer, record_call, score_stage_summary, stage_span
+from inspect_ai_scorers.prompt_evaluator import prompt_scorer
+
+
+async def score_all(scorer, samples):
+    return [await scorer(state, target) for state, target in samples]
+
+
+class TestTracing(unittest.TestCase):
+    def setUp(self):
+        reset_mock_grader()
+        self.model = get_model("mockgrader/model")
+
+    def tearDown(self):
+        reset_mock_grader()
+
+    def test_fact_scorer_records_each_stage(self):
+        score = asyncio.run(score_all(fact_scorer(self.model), synthetic_samples(1)))[0]
+        stages = score.metadata["stages"]
+
+        self.assertEqual(set(stages), {"target_extraction", "answer_extraction", "compare", "parse"})
+        for name in ("target_extraction", "answer_extraction", "compare"):
+            self.assertEqual(stages[name]["calls"], 1)
+            self.assertGreater(stages[name]["input_tokens"], 0)
+            self.assertGreater(stages[name]["output_tokens"], 0)
+            self.assertGreater(stages[name]["seconds"], 0)
+        self.assertEqual(stages["parse"]["calls"], 0)
+
+    def test_cache_hits_are_counted_without_calls(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            scorer = fact_scorer(self.model, cache=FactCache(os.path.join(tmpdir, "facts.db")))
+            sample = synthetic_samples(1)
+            first, second = asyncio.run(score_all(scorer, sample + sample))
+
+        self.assertEqual(first.metadata["stages"]["target_extraction"]["cache_hits"], 0)
+        cached = second.metadata["stages"]["target_extraction"]
+        self.assertEqual((cached["calls"], cached["input_tokens"], cached["cache_hits"]), (0, 0, 1))
+
+    def test_fact_comparator_reports_bridge_usage(self):
+        from inspect_ai_scorers.fact_comparator import fact_comparator_scorer
+
+        with mock.patch.dict(os.environ, {"INSPECT_EVAL_MODEL": "mockgrader/model"}):
+            score = asyncio.run(score_all(fact_comparator_scorer(), synthetic_samples(1)))[0]
+
+        stages = score.metadata["stages"]
+        self.assertEqual(set(stages), {"context_extraction", "answer_extraction", "compare", "parse"})
+        self.assertEqual(stages["compare"]["calls"], 1)
+        self.assertGreater(stages["compare"]["input_tokens"], 0)
+
+    def test_nested_spans_and_usage_outside_a_trace(self):
+        # nothing is recorded without an active trace
+        record_call(10, 10)
+        trace = SampleTrace("case", 1)
+
+        async def run():
+            with trace.activate():
+                with stage_span("compare"):
+                    record_call(3, 2)
+                    with stage_span("parse"):
+                        pass
+                    record_call(1, 1)
+
+        asyncio.run(run())
+        self.assertEqual([span.name for span in trace.spans], ["parse", "compare"])
+        self.assertIs(trace.spans[0].parent, trace.spans[1])
+        self.assertEqual(trace.stages()["compare"]["calls"], 2)
+        self.assertEqual(trace.stages()["compare"]["input_tokens"], 4)
+        self.assertEqual(trace.stages()["parse"]["calls"], 0)
+
+    def test_tracer_summarizes_and_exports(self):
+        tracer = ScoreTracer()
+        scores = asyncio.run(score_all(prompt_scorer(self.model, tracer=tracer), synthetic_samples(3)))
+
+        summary = tracer.summary()
+        self.assertEqual(summary, score_stage_summary(scores))
+        self.assertEqual(summary["verdict"]["samples"], 3)
+        self.assertEqual(summary["verdict"]["calls"], 3)
+        self.assertLessEqual(summary["verdict"]["p50_seconds"], summary["verdict"]["p95_seconds"])
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            chrome_path = os.path.join(tmpdir, "trace.json")
+            otlp_path = os.path.join(tmpdir, "trace.otlp.json")
+            tracer.write(chrome_path)
+            tracer.write(otlp_path, format="otlp")
+            with open(chrome_path) as file:
+                events = json.load(file)["traceEvents"]
+            with open(otlp_path) as file:
+                spans = json.load(file)["resourceSpans"][0]["scopeSpans"][0]["spans"]
+
+        # a root "score" span and a "verdict" span per sample, each a begin/end pair
+        self.assertEqual(len(events), 12)
+        self.assertEqual({event["ph"] for event in events}, {"b", "e"})
+        self.assertEqual(len(spans), 6)
+        roots = {span["spanId"] for span in spans if span["name"] == "score"}
+        self.assertTrue(all(span["parentSpanId"] in roots for span in spans if span["name"] == "verdict"))
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)
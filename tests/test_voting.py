@@ -0,0 +1,111 @@
+import unittest
+import asyncio
+import os
+import sys
+import time
+from inspect_ai.model import get_model
+from inspect_ai.scorer import Score
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.harness import synthetic_samples
+from benchmarks.mock_grader import mock_grader_stats, reset_mock_grader
+from inspect_ai_scorers._voting import agreement, early_stopping_vote, grader_calls, vote_outcome
+from inspect_ai_scorers.prompt_evaluator import prompt_scorer
+
+
+def grader(name, verdict, latency=0.0):
+    return get_model(f"mockgrader/{name}", responses={"Return PASS": verdict}, latency=latency)
+
+
+class TestVoteOutcome(unittest.TestCase):
+    def test_decides_once_the_rest_cant_change_it(self):
+        self.assertIsNone(vote_outcome(1, 0, 3, 2))
+        self.assertTrue(vote_outcome(2, 0, 3, 2))
+        self.assertFalse(vote_outcome(0, 2, 3, 2))
+        # a unanimous quorum fails on the first FAIL
+        self.assertFalse(vote_outcome(4, 1, 5, 5))
+
+    def test_cancels_outstanding_calls(self):
+        cancelled = []
+
+        def call(verdict, delay):
+            async def run():
+                try:
+                    await asyncio.sleep(delay)
+                except asyncio.CancelledError:
+                    cancelled.append(verdict)
+                    raise
+                return verdict
+            return run
+
+        passed, results, outstanding = asyncio.run(early_stopping_vote(
+            [call(True, 0), call(True, 0.01), call(False, 5)], bool, quorum=2,
+        ))
+        self.assertTrue(passed)
+        self.assertEqual(results, [(0, True), (1, True)])
+        self.assertEqual(outstanding, 1)
+        self.assertEqual(cancelled, [False])
+
+
+class TestPromptScorerVoting(unittest.TestCase):
+    def setUp(self):
+        reset_mock_grader()
+
+    def tearDown(self):
+        reset_mock_grader()
+
+    def test_majority_stops_before_the_slow_grader(self):
+        state, target = synthetic_samples(1)[0]
+        scorer = prompt_scorer([grader("a", "PASS"), grader("b", "PASS"), grader("slow", "FAIL", latency=5.0)])
+
+        started = time.monotonic()
+        score = asyncio.run(scorer(state, target))
+
+        self.assertLess(time.monotonic() - started, 2.0)
+        self.assertEqual(score.value, "C")
+        self.assertEqual(score.answer, "PASS")
+        self.assertEqual([(vote["grader"], vote["verdict"]) for vote in score.metadata["votes"]], [("mockgrader/a", "PASS"), ("mockgrader/b", "PASS")])
+        self.assertEqual(score.metadata["grader_calls"], 2)
+        self.assertEqual(score.metadata["cancelled_votes"], 1)
+
+    def test_split_vote_is_recorded(self):
+        state, target = synthetic_samples(1)[0]
+        scorer = prompt_scorer([grader("a", "PASS"), grader("b", "FAIL", latency=0.01), grader("c", "FAIL", latency=0.02)])
+        score = asyncio.run(scorer(state, target))
+
+        self.assertEqual(score.value, "I")
+        self.assertEqual(score.answer, "FAIL")
+        self.assertEqual([vote["verdict"] for vote in score.metadata["votes"]], ["PASS", "FAIL", "FAIL"])
+
+    def test_repeated_votes_are_separate_requests(self):
+        state, target = synthetic_samples(1)[0]
+        score = asyncio.run(prompt_scorer("mockgrader/model", votes=3, quorum=3)(state, target))
+
+        # different seeds keep the votes from being coalesced into one call
+        self.assertEqual(score.value, "I")
+        self.assertEqual(score.metadata["grader_calls"], 3)
+        self.assertEqual(mock_grader_stats()["calls"], 3)
+
+    def test_duplicate_graders_are_separate_requests(self):
+        state, target = synthetic_samples(1)[0]
+        score = asyncio.run(prompt_scorer(["mockgrader/model", "mockgrader/model", "mockgrader/other"], quorum=3)(state, target))
+
+        self.assertEqual(score.metadata["grader_calls"], 3)
+        self.assertEqual(mock_grader_stats()["calls"], 3)
+
+    def test_quorum_must_be_reachable(self):
+        with self.assertRaises(ValueError):
+            prompt_scorer("mockgrader/model", votes=3, quorum=4)
+
+    def test_metrics(self):
+        scores = [
+            Score(value="C", metadata={"votes": [{"verdict": "PASS"}, {"verdict": "PASS"}], "grader_calls": 2}),
+            Score(value="I", metadata={"votes": [{"verdict": "PASS"}, {"verdict": "FAIL"}, {"verdict": "FAIL"}], "grader_calls": 3}),
+        ]
+        self.assertAlmostEqual(agreement()(scores), (1 + 2 / 3) / 2)
+        self.assertEqual(grader_calls()(scores), 2.5)
+
+
+if __name__ == '__main__':
+    unittest.main(argv=['first-arg-is-ignored'], exit=False)